@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, users, auth, clients, research_briefings, meeting_notes, integrations
+from app.api.v1.endpoints import health, users, auth, clients, research_briefings, meeting_notes, integrations, exports
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="/health", tags=["health"])
@@ -9,4 +9,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(clients.router, prefix="/clients", tags=["clients"])
 api_router.include_router(research_briefings.router, prefix="/briefings", tags=["briefings"])
 api_router.include_router(meeting_notes.router, prefix="/notes", tags=["notes"])
-api_router.include_router(integrations.router, prefix="/integrations", tags=["integrations"])
\ No newline at end of file
+api_router.include_router(integrations.router, prefix="/integrations", tags=["integrations"])
+api_router.include_router(exports.router, prefix="/export", tags=["export"])
\ No newline at end of file
@@ -1,36 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.core.security import create_access_token, create_refresh_token, verify_password
+from app.core.security import (
+    PasswordHashingBusyError,
+    create_access_token,
+    create_refresh_token,
+    get_current_user,
+    verify_and_update_password,
+)
 from app.db.repository import UserRepository
 from app.models.user import User
-from app.core.security import oauth2_scheme
-import jwt
-from app.core.security import SECRET_KEY, ALGORITHM
 
 router = APIRouter()
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        print(f"Token: {token}")
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        print(f"Payload: {payload}")
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except jwt.PyJWTError as e:
-        print(f"JWT Error: {e}")
-        raise credentials_exception
-    user_repo = UserRepository()
-    user = await user_repo.get_user_by_email(email)
-    if user is None:
-        raise credentials_exception
-    return user
-
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -40,12 +21,21 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     user_repo = UserRepository()
     user = await user_repo.get_user_by_email(form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+        except PasswordHashingBusyError as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored with an older bcrypt cost; replaced now that we know the password
+        await user_repo.set_password_hash(user, new_hash)
     access_token = create_access_token(data={"sub": user.email})
     refresh_token = create_refresh_token(data={"sub": user.email})
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from app.api.v1.pagination import PageParams, page_response
 from typing import List
 from app.models.client import Client, ClientCreate
-from app.db.client_repository import create_client, get_client, get_clients_for_user, add_user_to_client, update_client, delete_client
+from app.db.client_repository import create_client, get_client, get_clients_page_for_user, add_user_to_client, update_client, delete_client
 from app.core.security import get_current_user
 from app.models.user import User
 
@@ -12,8 +13,11 @@ async def create_new_client(client: ClientCreate, current_user: User = Depends(g
     return await create_client(client, str(current_user.id))
 
 @router.get("/", response_model=List[Client])
-async def read_user_clients(current_user: User = Depends(get_current_user)):
-    return await get_clients_for_user(str(current_user.id))
+async def read_user_clients(response: Response, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
+    return page_response(
+        await get_clients_page_for_user(str(current_user.id), page.cursor, page.limit, page.descending, page.include_total),
+        response,
+    )
 
 @router.get("/{client_id}", response_model=Client)
 async def read_client(client_id: str, current_user: User = Depends(get_current_user)):
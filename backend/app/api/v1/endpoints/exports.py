@@ -0,0 +1,56 @@
+import os
+import secrets
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.export import EXPORTS, EXPORT_BATCH_SIZE, iter_ndjson, parse_checkpoint
+
+router = APIRouter()
+
+EXPORT_API_TOKEN = os.getenv("EXPORT_API_TOKEN")
+
+
+def _check_export_token(token: Optional[str]):
+    if not EXPORT_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Export is disabled")
+    if not token or not secrets.compare_digest(token, EXPORT_API_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid export token")
+
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: str,
+    user_id: Optional[str] = None,
+    client_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    after: Optional[str] = Query(None, description=(
+        "Resume after this checkpoint: base64url of the JSON {\"v\": <timestamp>, \"id\": <_id>, "
+        "\"oid\": <whether _id is an ObjectId>} of the last line of a previous export"
+    )),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=5000),
+    x_export_token: Optional[str] = Header(None),
+):
+    """
+    Stream a collection ("briefings" or "notes") as newline-delimited JSON in creation order.
+    """
+    _check_export_token(x_export_token)
+    if collection not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    if after:
+        # Checked here, as an error once the stream has started could only cut it short
+        try:
+            parse_checkpoint(after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        iter_ndjson(
+            collection,
+            user_id=user_id,
+            client_name=client_name,
+            since=since,
+            after=after,
+            batch_size=batch_size,
+        ),
+        media_type="application/x-ndjson",
+    )
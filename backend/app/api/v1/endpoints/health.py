@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Header
+from app.core.metrics import check_metrics_token
 
 router = APIRouter()
 
@@ -8,4 +10,19 @@ def get_health():
     """
     Get health status.
     """
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@router.get("/caches")
+async def get_cache_stats(authorization: Optional[str] = Header(None)):
+    """
+    Get hit/miss counters for the in-process caches. Needs the METRICS_TOKEN bearer token, like /metrics.
+    """
+    check_metrics_token(authorization)
+    from app.core.principal_cache import principal_cache
+    from app.services.research_cache import get_research_cache
+
+    return {
+        "principal": principal_cache.stats(),
+        "research": await get_research_cache().stats(),
+    }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from datetime import datetime
 import logging
 from starlette.responses import RedirectResponse
@@ -90,19 +90,17 @@ async def get_google_calendar_connection_status(current_user: User = Depends(get
     if is_connected and current_user.google_calendar_credentials:
         # Try to get additional info from the credentials if available
         try:
-            from google.oauth2.credentials import Credentials
-            credentials = Credentials(**current_user.google_calendar_credentials)
+            from app.services.calendar_token_manager import calendar_token_manager
+            credentials = await calendar_token_manager.get_credentials(current_user)
             
-            # Build the calendar service to get user info
-            from googleapiclient.discovery import build
-            service = build('calendar', 'v3', credentials=credentials)
+            # Get the primary calendar to verify the connection
+            from app.services.calendar_client import get_calendar_client
+            primary_calendar_id = (
+                await get_calendar_client().get_primary_calendar_id(credentials.token) if credentials else None
+            )
             
-            # Get calendar list to verify connection and get primary calendar info
-            calendar_list = service.calendarList().list().execute()
-            primary_calendar = next((cal for cal in calendar_list.get('items', []) if cal.get('primary')), None)
-            
-            if primary_calendar:
-                connection_info["email"] = primary_calendar.get('id')  # Primary calendar ID is usually the email
+            if primary_calendar_id:
+                connection_info["email"] = primary_calendar_id  # Primary calendar ID is usually the email
                 
         except Exception as e:
             logger.warning(f"Could not fetch additional calendar info: {e}")
@@ -111,7 +109,10 @@ async def get_google_calendar_connection_status(current_user: User = Depends(get
     return connection_info
 
 @router.get("/google/upcoming-meetings")
-async def get_upcoming_meetings(current_user: User = Depends(get_current_user)):
+async def get_upcoming_meetings(
+    limit: int = Query(3, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+):
     calendar_service = GoogleCalendarService()
-    meetings = await calendar_service.get_upcoming_meetings(current_user)
+    meetings = await calendar_service.get_upcoming_meetings(current_user, limit=limit)
     return meetings
\ No newline at end of file
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from app.api.v1.pagination import PageParams, page_response
+from typing import List, Optional
+from datetime import datetime
 from app.db.meeting_note_repository import MeetingNoteRepository
 from app.schemas.meeting_note import MeetingNoteCreate, MeetingNoteUpdate, MeetingNoteInDB
 from app.models.user import User
@@ -17,9 +19,24 @@ async def create_meeting_note(
 
 @router.get("/", response_model=List[MeetingNoteInDB])
 async def get_all_meeting_notes(
+    response: Response,
+    client_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_active_user)
 ):
-    return await meeting_note_repo.get_all(current_user.id)
+    notes_page = await meeting_note_repo.get_page(
+        str(current_user.id),
+        client_name=client_name,
+        start=start,
+        end=end,
+        cursor=page.cursor,
+        limit=page.limit,
+        descending=page.descending,
+        include_total=page.include_total,
+    )
+    return page_response(notes_page, response)
 
 @router.get("/{note_id}", response_model=MeetingNoteInDB)
 async def get_meeting_note(
@@ -1,26 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from app.api.v1.pagination import PageParams, page_response
+from typing import List, Optional
 from app.models.briefing import ResearchBriefing
-from app.db.briefing_repository import get_briefings_for_user, get_briefing, get_all_briefings
+from app.db.briefing_repository import get_briefings_for_user, get_briefing, get_all_briefings, utc_day
 from app.core.security import get_current_user
 from app.models.user import User
+from app.models.briefing_job import BriefingJob
+from app.db.briefing_job_repository import get_jobs_for_user
+from app.services.briefing_jobs import BriefingJobLimitError, briefing_job_service
+from app.services.briefing_stream import stream_briefing
 from app.services.agent_service import AgentService
 
 router = APIRouter()
 
-@router.post("/update", status_code=200)
-async def update_briefings(current_user: User = Depends(get_current_user)):
-    agent_service = AgentService()
-    await agent_service.generate_briefings_for_new_clients(str(current_user.id))
-    return {"message": "Briefing generation for new clients started."}
+@router.post("/update", status_code=202, response_model=BriefingJob)
+async def update_briefings(concurrency: Optional[int] = Query(None, ge=1, le=20), current_user: User = Depends(get_current_user)):
+    """Starts a briefing job for the user's clients; poll GET /briefings/jobs/{job_id} for its progress."""
+    try:
+        return await briefing_job_service.submit(str(current_user.id), concurrency=concurrency)
+    except BriefingJobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+@router.get("/stream")
+async def stream_briefing_generation(
+    client_name: str,
+    meeting_date: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+):
+    """Generates one client's briefing, streaming its stages as Server-Sent Events (text/event-stream)."""
+    return StreamingResponse(
+        stream_briefing(AgentService(), str(current_user.id), client_name, meeting_date or utc_day()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/jobs", response_model=List[BriefingJob])
+async def list_briefing_jobs(limit: int = Query(20, ge=1, le=100), current_user: User = Depends(get_current_user)):
+    return await get_jobs_for_user(str(current_user.id), limit)
+
+async def _get_own_job(job_id: str, current_user: User) -> BriefingJob:
+    job = await briefing_job_service.get(job_id)
+    if job is None or job.user_id != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Briefing job not found")
+    return job
+
+@router.get("/jobs/{job_id}", response_model=BriefingJob)
+async def get_briefing_job(job_id: str, current_user: User = Depends(get_current_user)):
+    return await _get_own_job(job_id, current_user)
+
+@router.post("/jobs/{job_id}/cancel", response_model=BriefingJob)
+async def cancel_briefing_job(job_id: str, current_user: User = Depends(get_current_user)):
+    await _get_own_job(job_id, current_user)
+    return await briefing_job_service.cancel(job_id)
 
 @router.get("/", response_model=List[ResearchBriefing])
-async def list_briefings(current_user: User = Depends(get_current_user)):
-    return await get_briefings_for_user(str(current_user.id))
+async def list_briefings(response: Response, page: PageParams = Depends(), current_user: User = Depends(get_current_user)):
+    return page_response(
+        await get_briefings_for_user(str(current_user.id), page.cursor, page.limit, page.descending, page.include_total),
+        response,
+    )
 
 @router.get("/all", response_model=List[ResearchBriefing])
-async def list_all_briefings():
-    return await get_all_briefings()
+async def list_all_briefings(response: Response, page: PageParams = Depends()):
+    return page_response(await get_all_briefings(page.cursor, page.limit, page.descending, page.include_total), response)
 @router.get("/{briefing_id}", response_model=ResearchBriefing)
 async def get_single_briefing(briefing_id: str, current_user: User = Depends(get_current_user)):
     briefing = await get_briefing(briefing_id)
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
 from ....models.user import User, UserCreate
 from ....db.repository import UserRepository
-from ....core.security import get_current_user
+from ....core.security import PasswordHashingBusyError, get_current_user
 
 router = APIRouter()
 user_repository = UserRepository()
@@ -16,7 +16,10 @@ async def create_user(user: UserCreate):
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    return await user_repository.create_user(user)
+    try:
+        return await user_repository.create_user(user)
+    except PasswordHashingBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
 @router.get("/me", response_model=User, summary="Get current user", tags=["Users"])
 async def read_users_me(current_user: User = Depends(get_current_user)):
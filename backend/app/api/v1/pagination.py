@@ -0,0 +1,33 @@
+from typing import Optional
+from fastapi import HTTPException, Query, Response
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, Page, decode_cursor
+
+
+class PageParams:
+    """Query parameters shared by the paginated list endpoints."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        order: str = Query("desc", pattern="^(asc|desc)$", description="Sort by creation time, newest first by default"),
+        include_total: bool = Query(False, description="Also count all matching items (X-Total-Count)"),
+    ):
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        self.cursor = cursor
+        self.limit = limit
+        self.descending = order == "desc"
+        self.include_total = include_total
+
+
+def page_response(page: Page, response: Response):
+    """Sets the paging headers and returns the page's items as the response body."""
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if page.total is not None:
+        response.headers["X-Total-Count"] = str(page.total)
+    return page.items
@@ -0,0 +1,238 @@
+import os
+import time
+import secrets
+import logging
+import threading
+from typing import List, Optional, Tuple
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    make_wsgi_app,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+# When set (to the same, emptied-at-deploy directory in the API and Celery processes), every
+# process writes its metrics there and a scrape aggregates them with the multiprocess collector.
+# Must be set before the first import of prometheus_client.
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Bearer token Prometheus must send to scrape the API's /metrics; the endpoint is disabled without it
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Celery queues whose backlog is reported as celery_queue_depth
+CELERY_METRICS_QUEUES = [q for q in os.getenv("CELERY_METRICS_QUEUES", "celery").split(",") if q]
+
+# Briefing stages take from a few ms (user lookup) to a minute (LLM)
+_STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+BRIEFING_STAGE_SECONDS = Histogram(
+    "briefing_stage_seconds", "Duration of each briefing generation stage", ["stage"], buckets=_STAGE_BUCKETS
+)
+PROVIDER_CALLS = Counter("provider_calls_total", "Calls to external providers", ["provider", "operation"])
+PROVIDER_ERRORS = Counter("provider_errors_total", "Failed calls to external providers", ["provider", "operation"])
+PROVIDER_SECONDS = Histogram(
+    "provider_call_seconds", "Duration of calls to external providers", ["provider", "operation"], buckets=_STAGE_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens used by LLM calls", ["model", "kind"])
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups (and failed writes, as errors) by result", ["cache", "result"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route", "status"]
+)
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_seconds", "MongoDB command duration", ["command", "collection"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+# Scope: "<METHOD> <route template>" for API requests, "task <name>" for Celery tasks
+MONGO_SCOPE_QUERIES = Histogram(
+    "mongo_queries_per_scope", "MongoDB commands issued per request or task", ["scope"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100, 250, 1000),
+)
+MONGO_SCOPE_QUERY_SECONDS = Histogram(
+    "mongo_query_seconds_per_scope", "Total MongoDB command time per request or task", ["scope"], buckets=_STAGE_BUCKETS
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds", "bcrypt run time on the password thread pool", ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_REJECTED = Counter("password_hash_rejected_total", "Password hashes turned away by the admission limit")
+CELERY_TASK_SECONDS = Histogram(
+    "celery_task_duration_seconds", "Celery task run time", ["task", "state"], buckets=_STAGE_BUCKETS
+)
+
+
+def observe_stage(stage: str, seconds: float):
+    BRIEFING_STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def count_cache(cache: str, result: str, amount: int = 1):
+    """Records `amount` lookups of `cache` ending in `result` ("hit", "miss" or "error")."""
+    if amount:
+        CACHE_REQUESTS.labels(cache, result).inc(amount)
+
+
+class ProviderCall:
+    """
+    Times one provider call and counts it, and its failure if it raises:
+
+        with ProviderCall("openai", "complete"):
+            ...
+    """
+
+    def __init__(self, provider: str, operation: str):
+        self.provider = provider
+        self.operation = operation
+
+    def __enter__(self):
+        PROVIDER_CALLS.labels(self.provider, self.operation).inc()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        PROVIDER_SECONDS.labels(self.provider, self.operation).observe(time.perf_counter() - self.started)
+        if exc_type is not None and not issubclass(exc_type, GeneratorExit):
+            PROVIDER_ERRORS.labels(self.provider, self.operation).inc()
+        return False
+
+
+def count_provider_error(provider: str, operation: str):
+    """For failures reported without raising out of a ProviderCall block."""
+    PROVIDER_ERRORS.labels(provider, operation).inc()
+
+
+def count_tokens(model: str, usage) -> None:
+    """Adds an OpenAI usage object's prompt and completion tokens."""
+    if usage is None:
+        return
+    LLM_TOKENS.labels(model, "prompt").inc(usage.prompt_tokens or 0)
+    LLM_TOKENS.labels(model, "completion").inc(usage.completion_tokens or 0)
+
+
+async def metrics_middleware(request: Request, call_next):
+    """
+    Observes each request's latency labelled by its route template (e.g. /api/v1/notes/{note_id}),
+    so ids do not explode the label set. Streaming responses are timed until their headers are sent.
+    """
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status)
+        ).observe(time.perf_counter() - started)
+
+
+class QueueDepthCollector:
+    """Reports the length of the Celery queues in Redis when scraped."""
+
+    def __init__(self, queues: List[str], redis_url: str = REDIS_URL):
+        self.queues = queues
+        self.redis_url = redis_url
+        self._redis = None
+
+    @staticmethod
+    def _family() -> GaugeMetricFamily:
+        return GaugeMetricFamily("celery_queue_depth", "Messages waiting in each Celery queue", labels=["queue"])
+
+    def describe(self):
+        # Lets the registry learn the metric name without reading Redis at registration
+        yield self._family()
+
+    def collect(self):
+        gauge = self._family()
+        try:
+            if self._redis is None:
+                import redis
+
+                self._redis = redis.from_url(self.redis_url, socket_timeout=2)
+            for queue in self.queues:
+                gauge.add_metric([queue], self._redis.llen(queue))
+        except Exception as e:
+            logger.warning(f"Could not read the Celery queue depth: {e}")
+        yield gauge
+
+
+_queue_depth_collector = QueueDepthCollector(CELERY_METRICS_QUEUES)
+if not PROMETHEUS_MULTIPROC_DIR:
+    REGISTRY.register(_queue_depth_collector)
+
+
+def build_registry() -> CollectorRegistry:
+    """The registry a scrape reads: this process's metrics, or in multiprocess mode those of every process."""
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_queue_depth_collector)
+    return registry
+
+
+def _metrics_token_error(authorization: Optional[str]) -> Optional[Tuple[int, str]]:
+    """(status, detail) when `authorization` may not read the metrics, else None."""
+    if not METRICS_TOKEN:
+        return 403, "Metrics are disabled"
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, METRICS_TOKEN):
+        return 401, "Invalid metrics token"
+    return None
+
+
+def check_metrics_token(authorization: Optional[str]):
+    error = _metrics_token_error(authorization)
+    if error is not None:
+        status, detail = error
+        headers = {"WWW-Authenticate": "Bearer"} if status == 401 else None
+        raise HTTPException(status_code=status, detail=detail, headers=headers)
+
+
+def render_metrics() -> Response:
+    """The Prometheus text exposition. Blocking (file and Redis reads), so run it in a thread pool."""
+    return Response(generate_latest(build_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass  # one line per scrape is noise
+
+
+def serve_metrics(port: int, addr: str = "0.0.0.0"):
+    """
+    Serves a process's metrics (e.g. a Celery worker's) on their own port, in a daemon thread,
+    behind the same METRICS_TOKEN bearer check as the API's /metrics.
+    """
+    exposition = make_wsgi_app(build_registry())
+
+    def app(environ, start_response):
+        error = _metrics_token_error(environ.get("HTTP_AUTHORIZATION"))
+        if error is None:
+            return exposition(environ, start_response)
+        status, detail = error
+        reason = "Unauthorized" if status == 401 else "Forbidden"
+        headers = [("Content-Type", "text/plain")]
+        if status == 401:
+            headers.append(("WWW-Authenticate", "Bearer"))
+        start_response(f"{status} {reason}", headers)
+        return [detail.encode()]
+
+    server = make_server(addr, port, app, handler_class=_QuietHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def mark_process_dead(pid: int):
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
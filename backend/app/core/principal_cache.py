@@ -0,0 +1,64 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.models.user import User
+from app.core.metrics import count_cache
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+
+class PrincipalCache:
+    """
+    Short-lived LRU cache of authenticated users keyed by token subject (the user's email).
+    Writes to a user must call invalidate() so the next request reloads it; other processes
+    see the change once their entry expires.
+
+    Every get() returns a private copy of the cached user, so a request that changes its user
+    (e.g. before saving it) never leaks the change into concurrent or later requests.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, subject: str) -> Optional[User]:
+        entry = self._entries.get(subject)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(subject, None)
+            self.misses += 1
+            count_cache("principal", "miss")
+            return None
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        count_cache("principal", "hit")
+        return entry[1].model_copy(deep=True)
+
+    def set(self, subject: str, user: User):
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, user.model_copy(deep=True))
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str):
+        self.invalidations += 1
+        self._entries.pop(subject, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
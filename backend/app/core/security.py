@@ -1,8 +1,11 @@
 import os
+import time
+import asyncio
 import secrets
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from dotenv import load_dotenv
 from jose import JWTError, jwt, ExpiredSignatureError
@@ -10,6 +13,8 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.models.user import User
+from app.core.principal_cache import principal_cache
+from app.core.metrics import PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS
 
 load_dotenv()
 
@@ -18,15 +23,79 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost of new hashes; weaker stored hashes are upgraded on the user's next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads running bcrypt, which releases the GIL, so this is how many hashes run in parallel
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash operations admitted at once (running or waiting for a thread)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+# How long a request waits for admission before being turned away
+PASSWORD_HASH_ADMISSION_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_ADMISSION_TIMEOUT_SECONDS", "5"))
 
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=BCRYPT_ROUNDS, bcrypt__min_rounds=BCRYPT_ROUNDS
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHashingBusyError(Exception):
+    """Too many password hashes are already running or waiting; the caller should retry later."""
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool, so a burst of logins costs threads rather than
+    the event loop every other request is served from. At most `max_pending` operations are
+    admitted at once; beyond that callers wait up to `admission_timeout` seconds and then get
+    PasswordHashingBusyError, which keeps a login storm from queueing without bound.
+    """
+
+    def __init__(self, context: CryptContext, workers: int, max_pending: int, admission_timeout: float):
+        self.context = context
+        self.admission_timeout = admission_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._admission = asyncio.Semaphore(max_pending)
+
+    async def _run(self, operation: str, fn, *args):
+        try:
+            await asyncio.wait_for(self._admission.acquire(), self.admission_timeout)
+        except asyncio.TimeoutError:
+            PASSWORD_HASH_REJECTED.inc()
+            raise PasswordHashingBusyError("Too many sign-ins at the moment, please try again shortly.")
+        try:
+            started = time.perf_counter()
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            PASSWORD_HASH_SECONDS.labels(operation).observe(time.perf_counter() - started)
+            return result
+        finally:
+            self._admission.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Whether the password matches and, if the stored hash is outdated, its replacement."""
+        return await self._run("verify", self.context.verify_and_update, password, hashed_password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(
+    pwd_context, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_ADMISSION_TIMEOUT_SECONDS
+)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    valid, _ = await password_hasher.verify_and_update(plain_password, hashed_password)
+    return valid
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
+
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -121,33 +190,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         
         logger.debug(f"Token decoded successfully. Email: {email}")
         user_repo = UserRepository()
-        user = await user_repo.get_user_by_email(email)
-        
+        user = principal_cache.get(email)
         if user is None:
-            logger.warning(f"User not found for email: {email}")
-            raise credentials_exception
-        
-        logger.debug(f"User found: {user.email}")
-        
-        # If the user has Google Calendar credentials, check if they need to be refreshed
-        if user.google_calendar_credentials:
-            from google.oauth2.credentials import Credentials
-            credentials = Credentials(**user.google_calendar_credentials)
-            if credentials.expired and credentials.refresh_token:
-                logger.info("Google Calendar credentials expired. Refreshing...")
-                from google.auth.transport.requests import Request
-                credentials.refresh(Request())
-                user.google_calendar_credentials = {
-                    'token': credentials.token,
-                    'refresh_token': credentials.refresh_token,
-                    'token_uri': credentials.token_uri,
-                    'client_id': credentials.client_id,
-                    'client_secret': credentials.client_secret,
-                    'scopes': credentials.scopes
-                }
-                await user_repo.update_user(user)
-                logger.info("Google Calendar credentials refreshed and updated in DB.")
+            user = await user_repo.get_user_by_email(email)
+
+            if user is None:
+                logger.warning(f"User not found for email: {email}")
+                raise credentials_exception
 
+            principal_cache.set(email, user)
+
+        logger.debug(f"User found: {user.email}")
+        # Google Calendar tokens are kept fresh by CalendarTokenManager, not on the request path
         return user
     except HTTPException as e:
         logger.error(f"HTTPException in get_current_user: {e.detail}")
@@ -0,0 +1,63 @@
+from typing import List, Optional
+from datetime import datetime
+from bson import ObjectId
+from app.models.briefing_job import ACTIVE_JOB_STATUSES, BriefingJob
+
+async def create_job(job: BriefingJob) -> BriefingJob:
+    await job.insert()
+    return job
+
+async def get_job(job_id: str) -> Optional[BriefingJob]:
+    try:
+        return await BriefingJob.get(ObjectId(job_id))
+    except Exception:
+        return None
+
+async def get_jobs_for_user(user_id: str, limit: int = 20) -> List[BriefingJob]:
+    return await BriefingJob.find(BriefingJob.user_id == user_id).sort("-created_at").limit(limit).to_list()
+
+async def count_active_jobs(user_id: str, heartbeat_after: datetime) -> int:
+    """
+    Jobs of the user that are queued, or running and have sent a heartbeat since `heartbeat_after`.
+    A queued job has no runner to send one, however long it waits in a backed-up queue.
+    """
+    return await BriefingJob.find({
+        "user_id": user_id,
+        "$or": [
+            {"status": "queued"},
+            {"status": "running", "updated_at": {"$gte": heartbeat_after}},
+        ],
+    }).count()
+
+async def update_job(job: BriefingJob, **fields) -> BriefingJob:
+    """Sets the given fields and bumps the job's heartbeat."""
+    fields["updated_at"] = datetime.utcnow()
+    await job.set(fields)
+    return job
+
+async def request_cancel(job_id: str) -> Optional[BriefingJob]:
+    """Flags an active job for cancellation; the runner stops starting new clients once it sees the flag."""
+    await BriefingJob.find_one(
+        {"_id": ObjectId(job_id), "status": {"$in": ACTIVE_JOB_STATUSES}}
+    ).update({"$set": {"cancel_requested": True}})
+    return await get_job(job_id)
+
+async def is_cancel_requested(job_id: str) -> bool:
+    job = await BriefingJob.find_one({"_id": ObjectId(job_id), "cancel_requested": True})
+    return job is not None
+
+async def cancel_queued_job(job_id: str) -> bool:
+    """Cancels the job if no runner has picked it up yet. Returns whether it did."""
+    now = datetime.utcnow()
+    result = await BriefingJob.find_one({"_id": ObjectId(job_id), "status": "queued"}).update(
+        {"$set": {"status": "cancelled", "cancel_requested": True, "finished_at": now, "updated_at": now}}
+    )
+    return bool(result and result.modified_count)
+
+async def claim_queued_job(job_id: str) -> bool:
+    """Moves the job from queued to running, so it is run once even if its task is delivered twice."""
+    now = datetime.utcnow()
+    result = await BriefingJob.find_one({"_id": ObjectId(job_id), "status": "queued"}).update(
+        {"$set": {"status": "running", "started_at": now, "updated_at": now}}
+    )
+    return bool(result and result.modified_count)
@@ -1,22 +1,47 @@
-from app.models.briefing import ResearchBriefing, ResearchBriefingCreate
-from typing import List, Optional
+from app.models.briefing import BriefingClaim, ResearchBriefing, ResearchBriefingCreate
+from typing import List, Optional, Union
+from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+import uuid
+from app.db.pagination import DEFAULT_PAGE_SIZE, Page, paginate
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+def normalize_meeting_date(meeting_date: Union[datetime, str]) -> datetime:
+    """
+    The meeting date as briefings are keyed by it: naive UTC to the minute, so the scheduler,
+    the API and scripts name the same meeting the same way.
+    """
+    if isinstance(meeting_date, str):
+        meeting_date = datetime.fromisoformat(meeting_date.replace("Z", "+00:00"))
+    if meeting_date.tzinfo is not None:
+        meeting_date = meeting_date.replace(tzinfo=None) - meeting_date.utcoffset()
+    return meeting_date.replace(second=0, microsecond=0)
+
+def utc_day(now: Optional[datetime] = None) -> datetime:
+    """
+    The meeting date of a briefing that is not tied to a calendar event: the UTC day, so runs
+    started minutes apart on the same day claim and store the same briefing.
+    """
+    return (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+
 async def create_briefing(briefing: ResearchBriefingCreate) -> ResearchBriefing:
+    """Inserts the briefing; raises DuplicateKeyError if the meeting already has one."""
     logger.info(f"Creating briefing for client {briefing.client_name}")
     briefing_data = {
         "user_id": briefing.user_id,
         "client_name": briefing.client_name,
-        "meeting_date": briefing.meeting_date,
+        "meeting_date": normalize_meeting_date(briefing.meeting_date),
         "summary": briefing.summary,
         "next_meeting_date": briefing.next_meeting_date,
         "gaps": briefing.gaps,
         "external_research": briefing.external_research,
         "suggested_questions": briefing.suggested_questions,
+        "degraded_stages": briefing.degraded_stages,
+        "fingerprint": briefing.fingerprint,
     }
     new_briefing = ResearchBriefing(**briefing_data)
     await new_briefing.insert()
@@ -29,9 +54,14 @@ async def get_briefing(briefing_id: str) -> Optional[ResearchBriefing]:
     except:
         return None
 
-async def get_briefings_for_user(user_id: str) -> List[ResearchBriefing]:
-    from beanie.operators import In
-    return await ResearchBriefing.find(ResearchBriefing.user_id == user_id).to_list()
+async def get_briefings_for_user(
+    user_id: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+    include_total: bool = False,
+) -> Page:
+    return await paginate(ResearchBriefing, {"user_id": user_id}, "created_at", cursor, limit, descending, include_total)
 
 async def get_briefings_for_client(client_name: str, user_id: str, hours: int = 24) -> List[ResearchBriefing]:
     from datetime import datetime, timedelta
@@ -43,12 +73,78 @@ async def get_briefings_for_client(client_name: str, user_id: str, hours: int =
         ResearchBriefing.created_at >= time_threshold
     ).to_list()
 
-async def get_briefing_for_meeting(user_id: str, client_name: str, meeting_date: str) -> Optional[ResearchBriefing]:
+async def get_recently_briefed_client_names(user_id: str, hours: int = 24) -> List[str]:
+    """Names of the user's clients that already have a briefing from the last `hours` hours."""
+    from datetime import datetime, timedelta
+
+    time_threshold = datetime.utcnow() - timedelta(hours=hours)
+    return await ResearchBriefing.distinct(
+        "client_name",
+        {"user_id": user_id, "created_at": {"$gte": time_threshold}},
+    )
+
+async def get_briefing_for_meeting(user_id: str, client_name: str, meeting_date: datetime) -> Optional[ResearchBriefing]:
     return await ResearchBriefing.find_one(
         ResearchBriefing.user_id == user_id,
         ResearchBriefing.client_name == client_name,
-        ResearchBriefing.meeting_date == meeting_date
+        ResearchBriefing.meeting_date == normalize_meeting_date(meeting_date)
     )
 
-async def get_all_briefings() -> List[ResearchBriefing]:
-    return await ResearchBriefing.find_all().to_list()
\ No newline at end of file
+async def claim_briefing(user_id: str, client_name: str, meeting_date: datetime, ttl_seconds: float) -> Optional[str]:
+    """
+    Atomically claims the generation of a meeting's briefing. Returns the claim's owner token, or
+    None while another unexpired claim holds it. An expired claim is taken over.
+    """
+    meeting_date = normalize_meeting_date(meeting_date)
+    owner = uuid.uuid4().hex
+    now = datetime.utcnow()
+    key = {"user_id": user_id, "client_name": client_name, "meeting_date": meeting_date}
+    try:
+        await BriefingClaim(**key, owner=owner, expires_at=now + timedelta(seconds=ttl_seconds)).insert()
+        return owner
+    except DuplicateKeyError:
+        pass
+    # MongoDB's TTL monitor only runs once a minute, so expired claims are also taken over here
+    taken_over = await BriefingClaim.find_one({**key, "expires_at": {"$lte": now}}).update(
+        {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds), "created_at": now}}
+    )
+    return owner if taken_over and taken_over.modified_count else None
+
+async def release_briefing_claim(user_id: str, client_name: str, meeting_date: datetime, owner: str):
+    await BriefingClaim.find_one({
+        "user_id": user_id,
+        "client_name": client_name,
+        "meeting_date": normalize_meeting_date(meeting_date),
+        "owner": owner,
+    }).delete()
+
+async def delete_duplicate_briefings() -> int:
+    """
+    Keeps only the newest briefing of each (user_id, client_name, meeting_date), so the unique
+    index can be built over briefings stored before it existed. Returns how many were deleted.
+    """
+    duplicates = await ResearchBriefing.aggregate([
+        {"$sort": {"created_at": -1}},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "client_name": "$client_name", "meeting_date": "$meeting_date"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1},
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]).to_list()
+    stale_ids = [briefing_id for group in duplicates for briefing_id in group["ids"][1:]]
+    if stale_ids:
+        await ResearchBriefing.find({"_id": {"$in": stale_ids}}).delete()
+    return len(stale_ids)
+
+async def get_briefing_by_fingerprint(user_id: str, client_name: str, fingerprint: str) -> Optional[ResearchBriefing]:
+    """A briefing of this user and client generated from the same prompt inputs; never another user's."""
+    return await ResearchBriefing.find_one({"user_id": user_id, "client_name": client_name, "fingerprint": fingerprint})
+
+async def get_all_briefings(
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+    include_total: bool = False,
+) -> Page:
+    return await paginate(ResearchBriefing, {}, "created_at", cursor, limit, descending, include_total)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from beanie import UpdateResponse
+from pymongo.errors import BulkWriteError
+from app.models.bulk_run import BulkRun, BulkRunItem
+
+async def get_run(run_id: str) -> Optional[BulkRun]:
+    return await BulkRun.find_one(BulkRun.run_id == run_id)
+
+async def create_run(run: BulkRun) -> BulkRun:
+    await run.insert()
+    return run
+
+async def update_run(run: BulkRun, **fields) -> BulkRun:
+    fields["updated_at"] = datetime.utcnow()
+    await run.set(fields)
+    return run
+
+async def add_items(items: List[BulkRunItem]) -> int:
+    """Inserts planned items, skipping the ones a previous planning pass already stored. Returns how many were new."""
+    if not items:
+        return 0
+    try:
+        result = await BulkRunItem.insert_many(items, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        return e.details.get("nInserted", 0)
+
+async def claim_next_item(run_id: str) -> Optional[BulkRunItem]:
+    """Atomically moves the run's next pending item to running and returns it."""
+    return await BulkRunItem.find_one({"run_id": run_id, "status": "pending"}).update(
+        {"$set": {"status": "running", "updated_at": datetime.utcnow()}, "$inc": {"attempts": 1}},
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+
+async def finish_item(item: BulkRunItem, **fields) -> BulkRunItem:
+    fields["updated_at"] = datetime.utcnow()
+    await item.set(fields)
+    return item
+
+async def reset_items(run_id: str, statuses: List[str]) -> int:
+    """Returns items in the given states to pending, e.g. those left running by an interrupted run."""
+    result = await BulkRunItem.find({"run_id": run_id, "status": {"$in": statuses}}).update(
+        {"$set": {"status": "pending", "updated_at": datetime.utcnow()}}
+    )
+    return result.modified_count if result else 0
+
+async def count_items_by_status(run_id: str) -> Dict[str, int]:
+    counts = await BulkRunItem.aggregate([
+        {"$match": {"run_id": run_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]).to_list()
+    return {row["_id"]: row["count"] for row in counts}
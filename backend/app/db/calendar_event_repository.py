@@ -0,0 +1,92 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+from pymongo import DeleteOne, UpdateOne
+from app.models.calendar_event import CalendarEvent, CalendarSyncState
+
+def parse_event_start(start: dict) -> Optional[datetime]:
+    """The start of a Google Calendar event as naive UTC; all-day events start at midnight UTC."""
+    value = start.get("dateTime") or start.get("date")
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+    return parsed
+
+async def get_sync_state(user_id: str) -> Optional[CalendarSyncState]:
+    return await CalendarSyncState.find_one(CalendarSyncState.user_id == user_id)
+
+async def get_sync_states(user_ids: List[str]) -> List[CalendarSyncState]:
+    return await CalendarSyncState.find({"user_id": {"$in": user_ids}}).to_list()
+
+async def save_sync_state(state: CalendarSyncState) -> CalendarSyncState:
+    await CalendarSyncState.find_one(CalendarSyncState.user_id == state.user_id).upsert(
+        {"$set": state.model_dump(exclude={"id", "revision_id"})},
+        on_insert=state,
+    )
+    return state
+
+async def apply_event_changes(user_id: str, items: List[dict], window_start: datetime, window_end: datetime) -> int:
+    """
+    Upserts changed events and deletes cancelled ones, in one bulk write. Events starting outside
+    the sync window are removed, so the store only holds what the window covers.
+    """
+    operations = []
+    now = datetime.utcnow()
+    for item in items:
+        event_id = item.get("id")
+        if not event_id:
+            continue
+        key = {"user_id": user_id, "event_id": event_id}
+        start_time = parse_event_start(item.get("start") or {})
+        if item.get("status") == "cancelled" or start_time is None or not window_start <= start_time < window_end:
+            operations.append(DeleteOne(key))
+            continue
+        operations.append(UpdateOne(key, {"$set": {
+            "summary": item.get("summary"),
+            "start": item["start"],
+            "end": item.get("end"),
+            "start_time": start_time,
+            "status": item.get("status"),
+            "html_link": item.get("htmlLink"),
+            "location": item.get("location"),
+            "description": item.get("description"),
+            "attendees": item.get("attendees", []),
+            "updated": item.get("updated"),
+            "synced_at": now,
+        }}, upsert=True))
+    if operations:
+        await CalendarEvent.get_pymongo_collection().bulk_write(operations, ordered=False)
+    return len(operations)
+
+async def delete_events(user_id: str, starting_before: Optional[datetime] = None, synced_before: Optional[datetime] = None):
+    """Deletes a user's stored events, or only those that started, or were last synced, before the given times."""
+    query = {"user_id": user_id}
+    if starting_before is not None:
+        query["start_time"] = {"$lt": starting_before}
+    if synced_before is not None:
+        query["synced_at"] = {"$lt": synced_before}
+    await CalendarEvent.find(query).delete()
+
+async def get_upcoming_events(
+    user_id: str, start: datetime, end: Optional[datetime] = None, limit: Optional[int] = None
+) -> List[CalendarEvent]:
+    query = {"user_id": user_id, "start_time": {"$gte": start}}
+    if end is not None:
+        query["start_time"]["$lt"] = end
+    return await CalendarEvent.find(query).sort("+start_time").limit(limit or 0).to_list()
+
+async def get_upcoming_events_for_users(user_ids: List[str], start: datetime, end: datetime) -> Dict[str, List[CalendarEvent]]:
+    """Events of several users starting in [start, end), in one query, grouped by user id."""
+    events = await CalendarEvent.find(
+        {"user_id": {"$in": user_ids}, "start_time": {"$gte": start, "$lt": end}}
+    ).sort("+start_time").to_list()
+    grouped: Dict[str, List[CalendarEvent]] = {}
+    for event in events:
+        grouped.setdefault(event.user_id, []).append(event)
+    return grouped
+
+async def reset_calendar_store(user_id: str):
+    """Forgets a user's synced events and sync token, e.g. after they connect a different calendar."""
+    await CalendarEvent.find({"user_id": user_id}).delete()
+    await CalendarSyncState.find(CalendarSyncState.user_id == user_id).delete()
@@ -1,7 +1,10 @@
 from app.models.client import Client, ClientCreate
 from app.models.meeting_note import MeetingNote
+from app.db.meeting_note_repository import MeetingNoteRepository
+from app.schemas.meeting_note import MeetingNoteContent
 from typing import List, Optional
 from bson import ObjectId
+from app.db.pagination import DEFAULT_PAGE_SIZE, Page, paginate
 from datetime import datetime
 
 async def create_client(client: ClientCreate, user_id: str) -> Client:
@@ -31,12 +34,10 @@ async def get_client(client_id: str) -> Optional[Client]:
         client = await Client.get(ObjectId(client_id))
         if client:
             # Find the most recent meeting note for this client
-            latest_note = await MeetingNote.find(
-                MeetingNote.client_name == client.name
-            ).sort(-MeetingNote.meeting_date).limit(1).first_or_none()
+            latest_notes = await MeetingNoteRepository().get_latest(client.name, projection_model=MeetingNoteContent)
 
-            if latest_note:
-                client.meetingNotes = latest_note.content
+            if latest_notes:
+                client.meetingNotes = latest_notes[0].content
         return client
     except Exception as e:
         print(f"Error fetching client or notes: {e}")
@@ -47,6 +48,16 @@ async def get_clients_for_user(user_id: str) -> List[Client]:
     from beanie.operators import In
     return await Client.find(In(Client.members, [user_id])).to_list()
 
+async def get_clients_page_for_user(
+    user_id: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+    include_total: bool = False,
+) -> Page:
+    """Get one page of the clients where the user is a member"""
+    return await paginate(Client, {"members": user_id}, "created_at", cursor, limit, descending, include_total)
+
 async def add_user_to_client(client_id: str, user_id: str) -> bool:
     """Add a user to a client"""
     try:
@@ -1,36 +1,160 @@
 import os
+import sys
+import asyncio
+import logging
+from typing import List
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from beanie import init_beanie
+from pymongo.errors import OperationFailure
 from app.models.user import User
 from app.models.meeting_note import MeetingNote
 from app.models.client import Client
-from app.models.briefing import ResearchBriefing
+from app.models.briefing import BriefingClaim, ResearchBriefing
+from app.models.briefing_job import BriefingJob
+from app.models.bulk_run import BulkRun, BulkRunItem
+from app.models.note_summary import NoteChunkSummary
+from app.models.calendar_event import CalendarEvent, CalendarSyncState
+from app.db.monitoring import command_monitor
 from sqlalchemy.ext.declarative import declarative_base
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Atlas needs TLS; a local mongod (e.g. for the benchmarks) usually has none
+MONGO_TLS = os.getenv("MONGO_TLS", "true").lower() == "true"
+# Times every command for slow-query logs and per-request query counts (see app/db/monitoring.py)
+MONGO_COMMAND_MONITORING = os.getenv("MONGO_COMMAND_MONITORING", "true").lower() == "true"
 
 # Configure MongoDB client with SSL settings to handle certificate issues
 client = AsyncIOMotorClient(
     DATABASE_URL,
-    tls=True,
+    tls=MONGO_TLS,
     tlsAllowInvalidCertificates=True,
     tlsAllowInvalidHostnames=True,
-    serverSelectionTimeoutMS=5000
+    serverSelectionTimeoutMS=5000,
+    event_listeners=[command_monitor] if MONGO_COMMAND_MONITORING else [],
 )
 db = client.get_database(os.getenv("MONGO_DATABASE"))
 
 Base = declarative_base()
 
+DOCUMENT_MODELS = [
+    User, MeetingNote, Client, ResearchBriefing, BriefingClaim, BriefingJob, NoteChunkSummary, CalendarEvent,
+    CalendarSyncState, BulkRun, BulkRunItem,
+]
+
 async def connect_to_mongo():
     try:
-        await init_beanie(database=db, document_models=[User, MeetingNote, Client, ResearchBriefing])
+        # Indexes are managed by ensure_indexes so one failing index build cannot block startup
+        await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
         print("Successfully connected to MongoDB Atlas and initialized Beanie!")
+        await ensure_indexes()
     except Exception as e:
         print(f"Error connecting to MongoDB Atlas: {e}")
 
 async def close_mongo_connection():
     client.close()
-    print("MongoDB connection closed.")
\ No newline at end of file
+    print("MongoDB connection closed.")
+
+def _index_key(spec) -> tuple:
+    return tuple((field, direction) for field, direction in spec)
+
+async def check_indexes() -> List[dict]:
+    """
+    Compares the indexes declared in each model's Settings.indexes with the ones in the database.
+    Returns one report per collection listing missing, extra and conflicting (same keys,
+    different options; as (existing name, declared index) pairs) indexes.
+    """
+    reports = []
+    for model in DOCUMENT_MODELS:
+        settings = model.get_settings()
+        collection = db[settings.name]
+        declared = {_index_key(index.document["key"].items()): index for index in settings.indexes or []}
+        existing = {
+            _index_key(info["key"]): (name, info)
+            for name, info in (await collection.index_information()).items()
+            if name != "_id_"
+        }
+
+        missing, conflicting = [], []
+        for key, index in declared.items():
+            if key not in existing:
+                missing.append(index)
+            elif bool(index.document.get("unique")) != bool(existing[key][1].get("unique")):
+                conflicting.append((existing[key][0], index))
+        extra = [name for key, (name, _) in existing.items() if key not in declared]
+
+        reports.append({
+            "collection": settings.name,
+            "missing": missing,
+            "extra": extra,
+            "conflicting": conflicting,
+        })
+    return reports
+
+async def ensure_indexes(create: bool = True, rebuild: bool = False) -> List[dict]:
+    """
+    Creates the declared indexes that are missing (when `create` is set) and logs any drift.
+    Each index is built separately, so e.g. duplicate emails only fail the unique email index.
+    With `rebuild`, conflicting indexes are dropped and built again as declared.
+    """
+    reports = await check_indexes()
+    for report in reports:
+        collection = db[report["collection"]]
+        still_conflicting = []
+        for name, index in report["conflicting"]:
+            if not rebuild:
+                still_conflicting.append(name)
+                continue
+            await collection.drop_index(name)
+            report["missing"].append(index)
+        report["conflicting"] = still_conflicting
+
+        still_missing = []
+        for index in report["missing"]:
+            if not create:
+                still_missing.append(index.document["name"])
+                continue
+            try:
+                await collection.create_indexes([index])
+                logger.info(f"Created index {index.document['name']} on {report['collection']}.")
+            except OperationFailure as e:
+                logger.error(f"Could not create index {index.document['name']} on {report['collection']}: {e}")
+                still_missing.append(index.document["name"])
+        report["missing"] = still_missing
+
+        if report["missing"]:
+            logger.warning(f"Missing indexes on {report['collection']}: {', '.join(report['missing'])}")
+        if report["extra"]:
+            logger.warning(f"Undeclared indexes on {report['collection']}: {', '.join(report['extra'])}")
+        if report["conflicting"]:
+            logger.warning(f"Indexes with different options on {report['collection']}: {', '.join(report['conflicting'])}")
+    return reports
+
+async def _index_cli(create: bool, rebuild: bool, dedupe_briefings: bool) -> int:
+    # check_indexes reads each model's settings, which only exist once Beanie is initialized
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+    if dedupe_briefings:
+        from app.db.briefing_repository import delete_duplicate_briefings
+
+        print(f"Deleted {await delete_duplicate_briefings()} duplicate briefing(s).")
+    reports = await ensure_indexes(create=create or rebuild, rebuild=rebuild)
+    drift = False
+    for report in reports:
+        problems = {k: report[k] for k in ("missing", "extra", "conflicting") if report[k]}
+        print(f"{report['collection']}: {problems or 'ok'}")
+        drift = drift or bool(report["missing"] or report["conflicting"])
+    client.close()
+    return 1 if drift else 0
+
+if __name__ == "__main__":
+    # python -m app.db.database [--create] [--rebuild] [--dedupe-briefings]
+    # Reports index drift, creating missing indexes with --create and also rebuilding conflicting
+    # ones with --rebuild. --dedupe-briefings first removes the duplicate briefings that would stop
+    # the unique meeting index from building. Exits 1 while drift remains.
+    logging.basicConfig(level=logging.INFO)
+    args = sys.argv[1:]
+    sys.exit(asyncio.run(_index_cli("--create" in args, "--rebuild" in args, "--dedupe-briefings" in args)))
@@ -1,6 +1,9 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Type
+from pydantic import BaseModel
 from beanie.odm.operators.update.general import Set
 from app.models.meeting_note import MeetingNote
+from app.db.pagination import DEFAULT_PAGE_SIZE, Page, paginate
 from app.schemas.meeting_note import MeetingNoteCreate, MeetingNoteUpdate
 
 class MeetingNoteRepository:
@@ -15,10 +18,84 @@ class MeetingNoteRepository:
     async def get_all(self, user_id: str) -> List[MeetingNote]:
         return await MeetingNote.find(MeetingNote.user_id == user_id).to_list()
 
+    async def get_for_client(
+        self, user_id: str, client_name: str, projection_model: Optional[Type[BaseModel]] = None
+    ) -> List[MeetingNote]:
+        """All of the user's notes for one client, oldest meeting first."""
+        return await self.get_in_range(user_id, client_name=client_name, projection_model=projection_model)
+
+    async def get_in_range(
+        self,
+        user_id: str,
+        client_name: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        projection_model: Optional[Type[BaseModel]] = None,
+    ) -> List[MeetingNote]:
+        """The user's notes, optionally for one client and with meeting_date in [start, end), oldest first."""
+        query = MeetingNote.find(self._filter(user_id, client_name, start, end)).sort(+MeetingNote.meeting_date)
+        if projection_model:
+            query = query.project(projection_model)
+        return await query.to_list()
+
+    async def get_page(
+        self,
+        user_id: str,
+        client_name: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        descending: bool = True,
+        include_total: bool = False,
+    ) -> Page:
+        """One page of the user's notes by creation time, with the same filters as get_in_range."""
+        filters = self._filter(user_id, client_name, start, end)
+        return await paginate(MeetingNote, filters, "createdAt", cursor, limit, descending, include_total)
+
+    async def get_latest(
+        self,
+        client_name: str,
+        user_id: Optional[str] = None,
+        limit: int = 1,
+        projection_model: Optional[Type[BaseModel]] = None,
+    ) -> List[MeetingNote]:
+        """The `limit` most recent notes for a client, newest first, optionally only the user's own."""
+        filters = {"client_name": client_name}
+        if user_id is not None:
+            filters["user_id"] = user_id
+        query = MeetingNote.find(filters).sort(-MeetingNote.meeting_date).limit(limit)
+        if projection_model:
+            query = query.project(projection_model)
+        return await query.to_list()
+
+    async def exists_for_client(self, user_id: str, client_name: str) -> bool:
+        return await MeetingNote.find(self._filter(user_id, client_name)).limit(1).count() > 0
+
+    async def get_client_names_with_notes(self, user_id: str) -> List[str]:
+        """Names of the clients the user has written at least one note for."""
+        return await MeetingNote.distinct("client_name", {"user_id": user_id})
+
+    @staticmethod
+    def _filter(
+        user_id: str, client_name: Optional[str] = None, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> dict:
+        filters = {"user_id": user_id}
+        if client_name is not None:
+            filters["client_name"] = client_name
+        if start is not None or end is not None:
+            filters["meeting_date"] = {}
+            if start is not None:
+                filters["meeting_date"]["$gte"] = start
+            if end is not None:
+                filters["meeting_date"]["$lt"] = end
+        return filters
+
     async def update(self, note_id: str, note_in: MeetingNoteUpdate) -> Optional[MeetingNote]:
         note = await self.get(note_id)
         if note:
             update_data = note_in.dict(exclude_unset=True)
+            update_data["updatedAt"] = datetime.utcnow()
             await note.update(Set(update_data))
             return await self.get(note_id)
         return None
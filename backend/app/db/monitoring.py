@@ -0,0 +1,164 @@
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.requests import Request
+
+from app.core.metrics import MONGO_COMMAND_SECONDS, MONGO_SCOPE_QUERIES, MONGO_SCOPE_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Commands slower than this are logged with their filter shape
+MONGO_SLOW_QUERY_MS = float(os.getenv("MONGO_SLOW_QUERY_MS", "100"))
+# Adds X-Mongo-Query-Count and X-Mongo-Query-Time-Ms to every API response
+MONGO_QUERY_DEBUG_HEADERS = os.getenv("MONGO_QUERY_DEBUG_HEADERS", "false").lower() == "true"
+
+# Connection handshakes, auth and heartbeats; not queries made by the app
+_IGNORED_COMMANDS = {
+    "hello", "ismaster", "isMaster", "ping", "buildinfo", "buildInfo", "saslStart", "saslContinue",
+    "endSessions", "getnonce", "authenticate",
+}
+# Where each command keeps its filter
+_FILTER_FIELDS = {"find": "filter", "count": "query", "distinct": "query", "findAndModify": "query"}
+
+
+class QueryStats:
+    """Query count and time of one HTTP request or Celery task. Updated from Motor's executor threads."""
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self.count = 0
+        self.total_ms = 0.0
+        self.by_collection: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, collection: str, duration_ms: float):
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.by_collection[collection] = self.by_collection.get(collection, 0) + 1
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("mongo_query_stats", default=None)
+
+
+@contextmanager
+def track_queries(stats: QueryStats) -> Iterator[QueryStats]:
+    """Attributes the commands issued in this context (and the tasks it starts) to `stats`."""
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+async def with_query_stats(awaitable, stats: QueryStats):
+    with track_queries(stats):
+        return await awaitable
+
+
+def record_scope(stats: QueryStats):
+    MONGO_SCOPE_QUERIES.labels(stats.scope).observe(stats.count)
+    MONGO_SCOPE_QUERY_SECONDS.labels(stats.scope).observe(stats.total_ms / 1000)
+
+
+def _shape(value: Any) -> Any:
+    """The structure of a filter without its values: {"user_id": "?", "meeting_date": {"$gte": "?"}}."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_shape(value[0])] if value else []
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> Tuple[str, Dict[str, Any]]:
+    """The collection a command runs on and the shape of what it selects, for grouping and logging."""
+    collection = command.get(command_name)
+    collection = collection if isinstance(collection, str) else "-"
+    shape: Dict[str, Any] = {}
+    if command_name in _FILTER_FIELDS:
+        shape["filter"] = _shape(command.get(_FILTER_FIELDS[command_name], {}))
+    elif command_name == "update" and command.get("updates"):
+        update = command["updates"][0]
+        shape["filter"] = _shape(update.get("q", {}))
+        shape["update"] = sorted(update["u"]) if isinstance(update.get("u"), dict) else "pipeline"
+        shape["batch"] = len(command["updates"])
+    elif command_name == "delete" and command.get("deletes"):
+        shape["filter"] = _shape(command["deletes"][0].get("q", {}))
+        shape["batch"] = len(command["deletes"])
+    elif command_name == "insert":
+        shape["batch"] = len(command.get("documents", []))
+    elif command_name == "aggregate":
+        pipeline = command.get("pipeline", [])
+        shape["pipeline"] = [next(iter(stage), "?") for stage in pipeline]
+        match = next((stage["$match"] for stage in pipeline if "$match" in stage), None)
+        if match is not None:
+            shape["filter"] = _shape(match)
+    if isinstance(command.get("sort"), dict):
+        shape["sort"] = dict(command["sort"])
+    return collection, shape
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Times every MongoDB command the app sends. Each one is observed in mongo_command_seconds by
+    command and collection, counted towards the QueryStats of the request or task that issued it,
+    and logged with its filter shape when slower than `slow_query_ms`.
+
+    Listener callbacks run on the thread that executes the command; Motor runs it with a copy of
+    the calling context, so the active QueryStats is visible here.
+    """
+
+    def __init__(self, slow_query_ms: float = MONGO_SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._pending: Dict[tuple, tuple] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        collection, shape = command_shape(event.command_name, event.command)
+        self._pending[(event.request_id, event.connection_id)] = (collection, shape, _current_stats.get())
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        pending = self._pending.pop((event.request_id, event.connection_id), None)
+        if pending is None:
+            return
+        collection, shape, stats = pending
+        duration_ms = event.duration_micros / 1000
+        MONGO_COMMAND_SECONDS.labels(event.command_name, collection).observe(duration_ms / 1000)
+        if stats is not None:
+            stats.add(collection, duration_ms)
+        if duration_ms >= self.slow_query_ms:
+            logger.warning(
+                f"Slow MongoDB {event.command_name} on {collection}: {duration_ms:.0f} ms"
+                f"{' (failed)' if failed else ''}, shape {json.dumps(shape, default=str)}"
+                f"{f', from {stats.scope}' if stats is not None else ''}"
+            )
+
+
+command_monitor = CommandMonitor()
+
+
+async def query_stats_middleware(request: Request, call_next):
+    """Counts the request's MongoDB commands per route, optionally reporting them in debug headers."""
+    stats = QueryStats(f"{request.method} {request.url.path}")
+    with track_queries(stats):
+        response = await call_next(request)
+    route = request.scope.get("route")
+    stats.scope = f"{request.method} {getattr(route, 'path', 'unmatched')}"
+    record_scope(stats)
+    if MONGO_QUERY_DEBUG_HEADERS:
+        response.headers["X-Mongo-Query-Count"] = str(stats.count)
+        response.headers["X-Mongo-Query-Time-Ms"] = f"{stats.total_ms:.1f}"
+    return response
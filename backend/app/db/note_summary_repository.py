@@ -0,0 +1,19 @@
+from typing import Dict, List
+from pymongo.errors import DuplicateKeyError
+from app.models.note_summary import NoteChunkSummary
+from beanie.operators import In
+
+async def get_chunk_summaries(keys: List[str]) -> Dict[str, str]:
+    """Returns the stored summaries for the given chunk keys, in one query."""
+    if not keys:
+        return {}
+    summaries = await NoteChunkSummary.find(In(NoteChunkSummary.key, keys)).to_list()
+    return {summary.key: summary.summary for summary in summaries}
+
+async def save_chunk_summary(summary: NoteChunkSummary) -> NoteChunkSummary:
+    try:
+        await summary.insert()
+    except DuplicateKeyError:
+        # Another briefing summarized the same chunk concurrently; its summary is equivalent
+        pass
+    return summary
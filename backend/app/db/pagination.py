@@ -0,0 +1,72 @@
+import json
+import base64
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Type
+from bson import ObjectId
+from beanie import Document
+from pymongo import ASCENDING, DESCENDING
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class Page(NamedTuple):
+    items: List[Document]
+    next_cursor: Optional[str]
+    total: Optional[int]
+
+
+def encode_cursor(sort_value: datetime, doc_id) -> str:
+    """Opaque cursor pointing just past the document with this sort value and id."""
+    payload = {
+        "v": sort_value.isoformat(),
+        "id": str(doc_id),
+        "oid": isinstance(doc_id, ObjectId),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """Returns (sort value, id) from a cursor, raising ValueError if it is malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        doc_id = ObjectId(payload["id"]) if payload["oid"] else payload["id"]
+        return datetime.fromisoformat(payload["v"]), doc_id
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def paginate(
+    model: Type[Document],
+    filters: dict,
+    sort_field: str,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    descending: bool = True,
+    include_total: bool = False,
+) -> Page:
+    """
+    Keyset pagination over (sort_field, _id). Each page is a range scan starting right after the
+    cursor, so with an index on the filter fields followed by (sort_field, _id) a page costs
+    O(limit) however deep it is.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    direction = DESCENDING if descending else ASCENDING
+    query = filters
+    if cursor:
+        sort_value, doc_id = decode_cursor(cursor)
+        op = "$lt" if descending else "$gt"
+        query = {"$and": [filters, {"$or": [
+            {sort_field: {op: sort_value}},
+            {sort_field: sort_value, "_id": {op: doc_id}},
+        ]}]}
+
+    items = await model.find(query).sort([(sort_field, direction), ("_id", direction)]).limit(limit + 1).to_list()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_field), last.id)
+
+    total = await model.find(filters).count() if include_total else None
+    return Page(items=items, next_cursor=next_cursor, total=total)
@@ -1,6 +1,8 @@
 from ..models.user import User, UserCreate
 from ..core.security import get_password_hash
-from typing import Optional
+from ..core.principal_cache import principal_cache
+from typing import List, Optional
+from datetime import datetime
 from bson import ObjectId
 
 class UserRepository:
@@ -14,7 +16,7 @@ class UserRepository:
             return None
 
     async def create_user(self, user: UserCreate) -> User:
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await get_password_hash(user.password)
         user_doc = User(
             email=user.email,
             name=user.name,
@@ -25,4 +27,80 @@ class UserRepository:
 
     async def update_user(self, user: User) -> User:
         await user.save()
+        principal_cache.invalidate(user.email)
+        return user
+
+    async def replace_calendar_credentials(self, user: User, previous_token: Optional[str], credentials: dict) -> User:
+        """
+        Stores refreshed Google Calendar credentials unless the stored token has changed since
+        `previous_token` was read, i.e. another process already persisted a refresh.
+        """
+        await User.find_one(
+            {"_id": user.id, "google_calendar_credentials.token": previous_token}
+        ).update({"$set": {
+            "google_calendar_credentials": credentials,
+            "calendar_refresh_failures": 0,
+            "calendar_refresh_retry_at": None,
+        }})
+        user.google_calendar_credentials = credentials
+        user.calendar_refresh_failures = 0
+        user.calendar_refresh_retry_at = None
+        principal_cache.invalidate(user.email)
+        return user
+
+    async def record_calendar_refresh_failure(self, user: User, retry_at: datetime) -> User:
+        """Counts a failed token refresh and keeps the sweep away from the user until `retry_at`."""
+        await User.find_one({"_id": user.id}).update({
+            "$inc": {"calendar_refresh_failures": 1},
+            "$set": {"calendar_refresh_retry_at": retry_at},
+        })
+        user.calendar_refresh_failures += 1
+        user.calendar_refresh_retry_at = retry_at
+        principal_cache.invalidate(user.email)
+        return user
+
+    async def clear_calendar_credentials(self, user: User) -> User:
+        """Disconnects the user's calendar, e.g. once Google has revoked its refresh token."""
+        await User.find_one({"_id": user.id}).update({"$set": {
+            "google_calendar_credentials": None,
+            "calendar_refresh_failures": 0,
+            "calendar_refresh_retry_at": None,
+        }})
+        user.google_calendar_credentials = None
+        user.calendar_refresh_failures = 0
+        user.calendar_refresh_retry_at = None
+        principal_cache.invalidate(user.email)
+        return user
+
+    async def get_calendar_user_ids(self) -> List[str]:
+        """Ids of the active users who have connected a Google Calendar."""
+        ids = await User.distinct("_id", {"google_calendar_credentials": {"$ne": None}, "is_active": True})
+        return [str(user_id) for user_id in ids]
+
+    async def get_active_user_ids(self, emails: Optional[List[str]] = None) -> List[str]:
+        """Ids of the active users, or of those among them with the given emails."""
+        query = {"is_active": True}
+        if emails:
+            query["email"] = {"$in": emails}
+        return [str(user_id) for user_id in await User.distinct("_id", query)]
+
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[User]:
+        return await User.find({"_id": {"$in": [ObjectId(user_id) for user_id in user_ids]}}).to_list()
+
+    async def get_users_with_expiring_calendar_tokens(self, before: datetime, limit: int) -> List[User]:
+        """
+        Users whose calendar token expires before `before`, or whose expiry is unknown, soonest
+        expiry first. Users backing off after a failed refresh are left out until their retry time.
+        """
+        return await User.find({
+            "$or": [
+                {"google_calendar_credentials.expiry": {"$lt": before}},
+                {"google_calendar_credentials.expiry": None, "google_calendar_credentials.refresh_token": {"$ne": None}},
+            ],
+            "calendar_refresh_retry_at": {"$not": {"$gt": datetime.utcnow()}},
+        }).sort([("google_calendar_credentials.expiry", 1)]).limit(limit).to_list()
+
+    async def set_password_hash(self, user: User, hashed_password: str) -> User:
+        await user.set({User.hashed_password: hashed_password})
+        principal_cache.invalidate(user.email)
         return user
\ No newline at end of file
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from beanie import Document
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class ResearchBriefing(Document):
     user_id: str
@@ -12,10 +13,39 @@ class ResearchBriefing(Document):
     gaps: List[str]
     external_research: List[dict]
     suggested_questions: List[str]
+    degraded_stages: List[str] = Field(default_factory=list)
+    fingerprint: Optional[str] = None  # hash of the prompt inputs the LLM output was generated from
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "research_briefings"
+        indexes = [
+            # One briefing per meeting (get_briefing_for_meeting); meeting_date is normalized, see normalize_meeting_date
+            IndexModel([("user_id", ASCENDING), ("client_name", ASCENDING), ("meeting_date", ASCENDING)], unique=True),
+            # Recent briefings of a client (get_briefings_for_client, get_recently_briefed_client_names)
+            IndexModel([("user_id", ASCENDING), ("client_name", ASCENDING), ("created_at", DESCENDING)]),
+            # Reuse of a user's stored LLM output for the same client (get_briefing_by_fingerprint)
+            IndexModel([("user_id", ASCENDING), ("client_name", ASCENDING), ("fingerprint", ASCENDING)]),
+            # Cursor pagination (GET /briefings/ and /briefings/all)
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
+
+class BriefingClaim(Document):
+    """Marks a briefing as being generated, so concurrent requests for the same meeting wait for it."""
+    user_id: str
+    client_name: str
+    meeting_date: datetime
+    owner: str
+    expires_at: datetime  # the claim is abandoned, e.g. by a crashed worker, after this
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "briefing_claims"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("client_name", ASCENDING), ("meeting_date", ASCENDING)], unique=True),
+            IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        ]
 
 class ResearchBriefingCreate(BaseModel):
     user_id: str
@@ -26,3 +56,5 @@ class ResearchBriefingCreate(BaseModel):
     gaps: List[str]
     external_research: List[dict]
     suggested_questions: List[str]
+    degraded_stages: List[str] = Field(default_factory=list)
+    fingerprint: Optional[str] = None
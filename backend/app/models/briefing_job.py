@@ -0,0 +1,36 @@
+from pydantic import Field
+from typing import List, Optional
+from datetime import datetime
+from beanie import Document
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.schemas.briefing import BriefingResult
+
+ACTIVE_JOB_STATUSES = ["queued", "running"]
+
+class BriefingJob(Document):
+    """A background run of generate_briefings_for_new_clients for one user."""
+    user_id: str
+    status: str = "queued"  # "queued", "running", "succeeded", "failed" or "cancelled"
+    backend: str  # "celery" or "local", where the job runs
+    concurrency: Optional[int] = None
+    task_id: Optional[str] = None  # Celery task id, for revoking queued jobs
+    clients: List[BriefingResult] = Field(default_factory=list)
+    generated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)  # heartbeat while the job runs
+
+    class Settings:
+        name = "briefing_jobs"
+        indexes = [
+            # Active jobs of a user (the per-user cap) and a user's recent jobs
+            IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        ]
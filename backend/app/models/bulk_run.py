@@ -0,0 +1,44 @@
+from pydantic import Field
+from typing import Dict, List, Optional
+from datetime import datetime
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+class BulkRun(Document):
+    """A bulk briefing run over many users; its items are the checkpoint a resumed run continues from."""
+    run_id: str
+    status: str = "planning"  # "planning", "running", "finished" or "interrupted"
+    meeting_date: datetime  # every briefing of the run is keyed by this date
+    user_ids: List[str] = Field(default_factory=list)  # empty: every active user
+    client_names: List[str] = Field(default_factory=list)  # empty: every client
+    skip_recent_hours: int = 0
+    planned: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "bulk_runs"
+        indexes = [
+            IndexModel([("run_id", ASCENDING)], unique=True),
+        ]
+
+class BulkRunItem(Document):
+    run_id: str
+    user_id: str
+    client_name: str
+    status: str = "pending"  # "pending", "running", "generated", "skipped" or "failed"
+    reason: Optional[str] = None
+    briefing_id: Optional[str] = None
+    attempts: int = 0
+    duration_ms: float = 0.0
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "bulk_run_items"
+        indexes = [
+            IndexModel([("run_id", ASCENDING), ("user_id", ASCENDING), ("client_name", ASCENDING)], unique=True),
+            # Next pending item of a run
+            IndexModel([("run_id", ASCENDING), ("status", ASCENDING)]),
+        ]
@@ -0,0 +1,60 @@
+from pydantic import Field
+from typing import Optional, List
+from datetime import datetime
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+class CalendarEvent(Document):
+    """A user's upcoming Google Calendar event, kept current by the incremental calendar sync."""
+    user_id: str
+    event_id: str
+    summary: Optional[str] = None
+    start: dict  # as Google returns it: {"dateTime": ...} or, for all-day events, {"date": ...}
+    end: Optional[dict] = None
+    start_time: datetime  # start as naive UTC, for range queries
+    status: Optional[str] = None
+    html_link: Optional[str] = None
+    location: Optional[str] = None
+    description: Optional[str] = None
+    attendees: List[dict] = Field(default_factory=list)
+    updated: Optional[str] = None
+    synced_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "calendar_events"
+        indexes = [
+            IndexModel([("user_id", ASCENDING), ("event_id", ASCENDING)], unique=True),
+            # Upcoming meetings of a user (get_upcoming_events)
+            IndexModel([("user_id", ASCENDING), ("start_time", ASCENDING)]),
+        ]
+
+    def to_event(self) -> dict:
+        """The event in the shape of a Google Calendar API event resource."""
+        event = {
+            "id": self.event_id,
+            "status": self.status,
+            "summary": self.summary,
+            "start": self.start,
+            "end": self.end,
+            "htmlLink": self.html_link,
+            "location": self.location,
+            "description": self.description,
+            "attendees": self.attendees,
+            "updated": self.updated,
+        }
+        return {key: value for key, value in event.items() if value is not None}
+
+class CalendarSyncState(Document):
+    """Where a user's incremental calendar sync left off."""
+    user_id: str
+    sync_token: Optional[str] = None
+    window_start: datetime  # the events synced start on or after this time
+    window_end: datetime  # ... and before this one
+    last_synced_at: datetime = Field(default_factory=datetime.utcnow)
+    last_full_sync_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "calendar_sync_states"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], unique=True),
+        ]
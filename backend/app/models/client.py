@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from beanie import Document
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class Client(Document):
     name: str
@@ -13,6 +14,10 @@ class Client(Document):
 
     class Settings:
         name = "clients"
+        indexes = [
+            # Membership lookups and cursor pagination (GET /clients/)
+            IndexModel([("members", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
 
 class ClientCreate(BaseModel):
     name: str
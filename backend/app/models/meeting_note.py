@@ -1,12 +1,13 @@
 import uuid
-from beanie import Document, Indexed
+from beanie import Document
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pydantic import Field
 from typing import Optional
 from datetime import datetime
 
 class MeetingNote(Document):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), alias="_id")
-    user_id: Indexed(str)
+    user_id: str
     client_name: str
     meeting_date: datetime
     content: str
@@ -15,3 +16,13 @@ class MeetingNote(Document):
 
     class Settings:
         name = "meeting_notes"
+        indexes = [
+            # Notes of one user and client by meeting date; its prefix also serves per-user queries
+            IndexModel([("user_id", ASCENDING), ("client_name", ASCENDING), ("meeting_date", ASCENDING)]),
+            # Latest note of a client across its members (get_client)
+            IndexModel([("client_name", ASCENDING), ("meeting_date", DESCENDING)]),
+            # Cursor pagination (GET /notes/)
+            IndexModel([("user_id", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+            # Full exports in (createdAt, _id) order
+            IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)]),
+        ]
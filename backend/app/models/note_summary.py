@@ -0,0 +1,21 @@
+from pydantic import Field
+from typing import List
+from datetime import datetime
+from beanie import Document
+from pymongo import ASCENDING, IndexModel
+
+class NoteChunkSummary(Document):
+    key: str  # hash of the covered notes (or child summaries), level and model
+    user_id: str
+    client_name: str
+    level: int  # 0 summarizes notes, higher levels summarize the summaries below them
+    note_ids: List[str]
+    summary: str
+    model: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "note_chunk_summaries"
+        indexes = [
+            IndexModel([("key", ASCENDING)], unique=True),
+        ]
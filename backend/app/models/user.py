@@ -2,6 +2,7 @@ from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 from beanie import Document
+from pymongo import ASCENDING, IndexModel
 
 class User(Document):
     email: EmailStr
@@ -9,10 +10,18 @@ class User(Document):
     hashed_password: str
     is_active: bool = True
     google_calendar_credentials: Optional[dict] = None
+    # Failed background refreshes of the calendar token in a row, and when the sweep may retry
+    calendar_refresh_failures: int = 0
+    calendar_refresh_retry_at: Optional[datetime] = None
     createdAt: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+            # Calendar token sweep, soonest expiry first
+            IndexModel([("google_calendar_credentials.expiry", ASCENDING)]),
+        ]
 
 class UserCreate(BaseModel):
     email: EmailStr
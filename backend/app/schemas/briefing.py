@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional, List
+
+class BriefingResult(BaseModel):
+    client_name: str
+    status: str  # "generated", "skipped", "failed" or "cancelled"; "pending" or "running" while a job is in progress
+    reason: Optional[str] = None
+    briefing_id: Optional[str] = None
+    duration_ms: float = 0.0
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+
+class BriefingRunSummary(BaseModel):
+    user_id: str
+    generated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    duration_ms: float = 0.0
+    results: List[BriefingResult] = Field(default_factory=list)
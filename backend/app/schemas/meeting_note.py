@@ -24,3 +24,14 @@ class MeetingNoteInDB(MeetingNoteBase):
     class Config:
         orm_mode = True
         allow_population_by_field_name = True
+
+class MeetingNoteContent(BaseModel):
+    """Projection with only the fields briefing generation reads."""
+    id: str = Field(alias="_id")
+    meeting_date: datetime
+    content: str
+    createdAt: datetime
+    updatedAt: datetime
+
+    class Config:
+        allow_population_by_field_name = True
@@ -1,17 +1,53 @@
 import os
+import time
+import asyncio
 import logging
 from datetime import datetime
-from openai import OpenAI
-from tavily import TavilyClient
+from typing import Awaitable, Callable, Dict, List, Optional
 from app.db.meeting_note_repository import MeetingNoteRepository
-from app.db.briefing_repository import create_briefing
-from app.models.briefing import ResearchBriefingCreate
+from app.db.briefing_repository import (
+    claim_briefing,
+    create_briefing,
+    get_briefing_by_fingerprint,
+    get_briefing_for_meeting,
+    normalize_meeting_date,
+    release_briefing_claim,
+    utc_day,
+)
+from pymongo.errors import DuplicateKeyError
+from app.models.briefing import ResearchBriefing, ResearchBriefingCreate
+from app.schemas.meeting_note import MeetingNoteContent
+from app.schemas.briefing import BriefingResult, BriefingRunSummary
+from app.services.providers import CompletionProvider, SearchProvider, get_completion_provider, get_search_provider
+from app.services.research_cache import ResearchCache, get_research_cache
+from app.services.summarization import CHUNK_SUMMARY_VERSION, HierarchicalSummarizer
+from app.services.prompt_builder import (
+    MIN_SECTION_TOKENS,
+    PROMPT_TEMPLATE_VERSION,
+    RELEVANCE_WEIGHT,
+    BriefingPromptBuilder,
+    PromptSection,
+)
+from app.services.briefing_stream import BriefingStreamParser, Emit
+from app.core.metrics import count_cache, observe_stage
+import hashlib
 import json
 import re
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of briefings generated at the same time for one user
+BRIEFING_CONCURRENCY = int(os.getenv("BRIEFING_CONCURRENCY", "5"))
+# A generation claim lapses after this long, so a crashed worker does not block its meeting for good
+BRIEFING_CLAIM_TTL_SECONDS = int(os.getenv("BRIEFING_CLAIM_TTL_SECONDS", "600"))
+# How long a request waits for another request's generation of the same briefing
+BRIEFING_CLAIM_WAIT_SECONDS = float(os.getenv("BRIEFING_CLAIM_WAIT_SECONDS", "300"))
+BRIEFING_CLAIM_POLL_SECONDS = 2.0
+
+class BriefingInProgressError(Exception):
+    """Another request is still generating the briefing for this meeting."""
+
 def _extract_next_meeting_date_from_notes(notes: list[str]) -> str:
     """
     Extracts the next meeting date from a list of notes.
@@ -24,85 +60,322 @@ def _extract_next_meeting_date_from_notes(notes: list[str]) -> str:
             return match.group(0)
     return "Not scheduled"
 
+def _briefing_fingerprint(
+    notes: List[MeetingNoteContent],
+    client_name: str,
+    next_meeting_date: str,
+    model: str,
+    focus_terms: List[str],
+    prompt_budget: int,
+    chunk_size: int,
+) -> str:
+    """
+    Hashes every input of the briefing prompt, so equal fingerprints mean an identical LLM request:
+    the notes, how they are condensed into chunk summaries, and how those sections are ranked and
+    fitted into the prompt's token budget.
+    """
+    payload = {
+        "notes": sorted((str(note.id), note.updatedAt.isoformat()) for note in notes),
+        "client_name": client_name.strip(),
+        "next_meeting_date": next_meeting_date,
+        "template_version": PROMPT_TEMPLATE_VERSION,
+        "model": model,
+        "summaries": {"version": CHUNK_SUMMARY_VERSION, "chunk_size": chunk_size},
+        "sections": {
+            "budget": prompt_budget,
+            "min_section_tokens": MIN_SECTION_TOKENS,
+            "relevance_weight": RELEVANCE_WEIGHT,
+            "focus_terms": focus_terms,
+        },
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def _record_stage(name: str, started: float, timings: Optional[Dict[str, float]]):
+    """Records a stage's duration in `timings` (ms) and in the briefing_stage_seconds histogram."""
+    seconds = time.perf_counter() - started
+    if timings is not None:
+        timings[name] = seconds * 1000
+    observe_stage(name, seconds)
+
+async def _run_stage(name: str, awaitable: Awaitable, timings: Dict[str, float]):
+    """Awaits one briefing stage and records its duration."""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        _record_stage(name, started, timings)
+
+async def _optional_stage(name: str, awaitable: Awaitable, default, degraded_stages: List[str]):
+    """Awaits a stage the briefing can do without, falling back to `default` if it fails."""
+    try:
+        return await awaitable
+    except Exception as e:
+        logger.warning(f"Briefing stage '{name}' failed, continuing without it: {e}")
+        degraded_stages.append(name)
+        return default
+
 class AgentService:
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    def __init__(
+        self,
+        completion_provider: Optional[CompletionProvider] = None,
+        search_provider: Optional[SearchProvider] = None,
+        research_cache: Optional[ResearchCache] = None,
+        calendar_service=None,
+    ):
+        # Providers and caches are shared per process, so building an AgentService per request is cheap
+        self.completion_provider = completion_provider or get_completion_provider()
+        self.search_provider = search_provider or get_search_provider()
+        self.research_cache = research_cache or get_research_cache()
+        # Anything with GoogleCalendarService.get_upcoming_meetings; None builds one per briefing
+        self.calendar_service = calendar_service
+        self.summarizer = HierarchicalSummarizer(self.completion_provider)
+
+    async def generate_briefings_for_new_clients(
+        self,
+        user_id: str,
+        concurrency: Optional[int] = None,
+        on_progress: Optional[Callable[[BriefingResult], Awaitable[None]]] = None,
+        should_cancel: Optional[Callable[[], Awaitable[bool]]] = None,
+    ) -> BriefingRunSummary:
+        """
+        Generates briefings for every client of the user that has notes and no briefing in the last 24 hours.
+        Which clients have notes and recent briefings is checked once for the user, then the eligible
+        clients are generated concurrently with at most `concurrency` generations in flight, each
+        loading only its own client's notes.
 
-    async def generate_briefings_for_new_clients(self, user_id: str):
+        `on_progress` receives every client as "pending" up front, then as "running" and with its
+        final result. `should_cancel` is checked before each client starts; once it returns True
+        the clients not yet started end up "cancelled".
+        """
         from app.db.client_repository import get_clients_for_user
-        from app.db.briefing_repository import get_briefings_for_client
+        from app.db.briefing_repository import get_recently_briefed_client_names
 
+        started = time.perf_counter()
         clients = await get_clients_for_user(user_id)
+        clients_with_notes = set(await MeetingNoteRepository().get_client_names_with_notes(user_id))
+        recently_briefed = set(await get_recently_briefed_client_names(user_id, hours=24))
+
+        semaphore = asyncio.Semaphore(concurrency or BRIEFING_CONCURRENCY)
+
+        async def report(result: BriefingResult) -> BriefingResult:
+            if on_progress is not None:
+                await on_progress(result)
+            return result
+
+        async def run(client_name: str) -> BriefingResult:
+            return await report(await generate(client_name))
+
+        async def generate(client_name: str) -> BriefingResult:
+            if client_name not in clients_with_notes:
+                return BriefingResult(client_name=client_name, status="skipped", reason="no meeting notes")
+            if client_name in recently_briefed:
+                return BriefingResult(client_name=client_name, status="skipped", reason="briefed in the last 24 hours")
+
+            async with semaphore:
+                if should_cancel is not None and await should_cancel():
+                    return BriefingResult(client_name=client_name, status="cancelled")
+                await report(BriefingResult(client_name=client_name, status="running"))
+                client_started = time.perf_counter()
+                timings = {}
+                try:
+                    briefing = await self._generate_briefing(user_id, client_name, utc_day(), timings=timings)
+                except Exception as e:
+                    logger.error(f"Briefing generation failed for client {client_name}: {e}", exc_info=True)
+                    return BriefingResult(
+                        client_name=client_name,
+                        status="failed",
+                        reason=str(e),
+                        duration_ms=(time.perf_counter() - client_started) * 1000,
+                        stage_timings=timings,
+                    )
+                duration_ms = (time.perf_counter() - client_started) * 1000
+
+            if briefing is None:
+                return BriefingResult(
+                    client_name=client_name, status="skipped", reason="nothing to brief", duration_ms=duration_ms, stage_timings=timings
+                )
+            return BriefingResult(
+                client_name=client_name,
+                status="generated",
+                briefing_id=str(briefing.id),
+                duration_ms=duration_ms,
+                stage_timings=timings,
+            )
+
         for client in clients:
-            # Check if the client has meeting notes
-            notes = await MeetingNoteRepository().get_all(user_id)
-            client_notes = [note for note in notes if note.client_name == client.name]
+            await report(BriefingResult(client_name=client.name, status="pending"))
+        results = await asyncio.gather(*(run(client.name) for client in clients))
+
+        summary = BriefingRunSummary(user_id=user_id, results=results)
+        for result in results:
+            setattr(summary, result.status, getattr(summary, result.status) + 1)
+        summary.duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Briefing run for user {user_id}: {summary.generated} generated, {summary.skipped} skipped, "
+            f"{summary.failed} failed in {summary.duration_ms:.0f} ms"
+        )
+        return summary
+
+    async def generate_briefing(self, user_id: str, client_name: str, meeting_date: datetime) -> Optional[ResearchBriefing]:
+        try:
+            return await self._generate_briefing(user_id, client_name, meeting_date)
+        except Exception as e:
+            logger.error(f"An error occurred during briefing generation: {e}", exc_info=True)
+            return None
 
-            if not client_notes:
-                continue
+    async def _generate_briefing(
+        self,
+        user_id: str,
+        client_name: str,
+        meeting_date: datetime,
+        notes: Optional[List[MeetingNoteContent]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        emit: Optional[Emit] = None,
+    ) -> Optional[ResearchBriefing]:
+        """
+        Returns the briefing of the meeting (user, client, meeting date), generating it at most once.
 
-            # Check if a briefing has been generated in the last 24 hours
-            recent_briefings = await get_briefings_for_client(client.name, user_id, hours=24)
-            if recent_briefings:
-                continue
+        The first request claims the meeting with an atomic insert into briefing_claims and
+        generates the briefing; concurrent requests for the same meeting poll until that briefing
+        is stored, then return it, instead of making their own LLM call. If the owner fails, its
+        claim is released (or lapses) and the next waiter generates instead. Raises
+        BriefingInProgressError after BRIEFING_CLAIM_WAIT_SECONDS of waiting.
+        """
+        client_name = client_name.strip()
+        meeting_date = normalize_meeting_date(meeting_date)
+        deadline = time.monotonic() + BRIEFING_CLAIM_WAIT_SECONDS
+        while True:
+            existing = await get_briefing_for_meeting(user_id, client_name, meeting_date)
+            if existing:
+                logger.info(f"Briefing {existing.id} already exists for {client_name} on {meeting_date}.")
+                return existing
+            owner = await claim_briefing(user_id, client_name, meeting_date, BRIEFING_CLAIM_TTL_SECONDS)
+            if owner:
+                try:
+                    return await self._build_briefing(user_id, client_name, meeting_date, notes, timings, emit)
+                finally:
+                    await release_briefing_claim(user_id, client_name, meeting_date, owner)
+            if time.monotonic() >= deadline:
+                raise BriefingInProgressError(f"The briefing for {client_name} on {meeting_date} is still being generated.")
+            await asyncio.sleep(BRIEFING_CLAIM_POLL_SECONDS)
 
-            await self.generate_briefing(user_id, client.name, datetime.utcnow())
+    async def _build_briefing(
+        self,
+        user_id: str,
+        client_name: str,
+        meeting_date: datetime,
+        notes: Optional[List[MeetingNoteContent]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        emit: Optional[Emit] = None,
+    ) -> Optional[ResearchBriefing]:
+        """
+        Generates and stores a briefing, raising on failure. `notes` may hold the client's notes
+        when the caller has already loaded them. Returns None when there is nothing to brief.
+        When `emit` is given, the LLM response is streamed and each stage's output is passed to
+        it as (event, data) as soon as it is ready (see BriefingStreamParser for the LLM fields).
 
-    async def generate_briefing(self, user_id: str, client_name: str, meeting_date: datetime):
+        The briefing is built from stages: user, notes and search start together, calendar waits
+        for the user, the LLM waits for notes and calendar, and persist waits for everything.
+        Calendar and search are optional; when they fail the briefing is stored without them and
+        the stage is listed in `degraded_stages`. Stage durations in ms are written to `timings`.
+
+        When a stored briefing has the same prompt fingerprint, its LLM output is reused and only
+        the volatile parts (external research, meeting date) are refreshed. Long note histories are
+        condensed into cached chunk summaries before the final prompt (see HierarchicalSummarizer).
+        """
         from app.services.calendar_service import GoogleCalendarService
         from app.db.repository import UserRepository
 
         logger.info(f"Starting briefing generation for user {user_id} and client {client_name}")
+        timings = {} if timings is None else timings
+        degraded_stages = []
+
+        async def send(event: str, data: dict):
+            if emit is not None:
+                await emit(event, data)
+
+        async def load_notes():
+            if notes is not None:
+                return notes
+            logger.info("Fetching notes from repository.")
+            return await MeetingNoteRepository().get_for_client(user_id, client_name, projection_model=MeetingNoteContent)
+
+        async def load_calendar():
+            user = await user_task
+            if not user:
+                return []
+            calendar_service = self.calendar_service or GoogleCalendarService()
+            return await _run_stage("calendar", calendar_service.get_upcoming_meetings(user), timings)
+
+        user_task = asyncio.create_task(_run_stage("user", UserRepository().get_user_by_id(user_id), timings))
+        notes_task = asyncio.create_task(_run_stage("notes", load_notes(), timings))
+        search_task = asyncio.create_task(_run_stage("search", self._research(client_name), timings))
+        calendar_task = asyncio.create_task(load_calendar())
+        tasks = [user_task, notes_task, search_task, calendar_task]
+
+        async def send_research():
+            # Sent as soon as the search is back, which is usually well before the LLM is done
+            await asyncio.wait([search_task])
+            if not search_task.cancelled() and search_task.exception() is None:
+                await send("research", {"external_research": search_task.result()["results"]})
+
+        if emit is not None:
+            tasks.append(asyncio.create_task(send_research()))
+
         try:
-            user_repo = UserRepository()
-            user = await user_repo.get_user_by_id(user_id)
+            user = await user_task
             if not user:
                 logger.error(f"User with id {user_id} not found.")
-                return
+                return None
 
-            calendar_service = GoogleCalendarService()
-            upcoming_meetings = await calendar_service.get_upcoming_meetings(user)
+            client_notes = await notes_task
+            note_contents = [note.content for note in client_notes]
+            logger.info(f"Found {len(note_contents)} notes for the client.")
+            if not note_contents:
+                logger.info("No notes found for this client. Skipping briefing generation.")
+                return None
+            await send("notes", {"count": len(client_notes)})
+
+            upcoming_meetings = await _optional_stage("calendar", calendar_task, [], degraded_stages)
             next_meeting = next((m for m in upcoming_meetings if client_name.lower() in m.get('summary', '').lower()), None)
-            next_meeting_date = next_meeting['start']['dateTime'] if next_meeting else _extract_next_meeting_date_from_notes(notes)
-            logger.info("Fetching notes from repository.")
-            notes = await MeetingNoteRepository().get_all(user_id)
-            notes = [note.content for note in notes if note.client_name == client_name]
-            logger.info(f"Found {len(notes)} notes for the client.")
+            # All-day events only have a start date
+            next_meeting_date = (
+                next_meeting['start'].get('dateTime') or next_meeting['start'].get('date')
+            ) if next_meeting else _extract_next_meeting_date_from_notes(note_contents)
+            await send("calendar", {"next_meeting_date": next_meeting_date, "source": "calendar" if next_meeting else "notes"})
 
-            if not notes:
-                logger.info("No notes found for this client. Skipping briefing generation.")
-                return
-
-            prompt = f"""
-            You are an AI assistant for a consultant. Your task is to generate a research briefing for an upcoming meeting.
-            The next meeting with {client_name} is scheduled for {next_meeting_date}.
-            Here are the notes from previous meetings with this client:
-            ---
-            {" ".join(notes)}
-            ---
-            Based on these notes, please provide the following:
-            1. A summary of the previous meetings.
-            2. A list of identified gaps or open questions.
-            3. A list of suggested talking points for the upcoming meeting, keeping in mind the goal for the next meeting.
-            Please format your response as a JSON object with the following keys: "summary", "gaps", "suggested_talking_points".
-            """
-            logger.info("Generating prompt for LLM.")
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt},
-                ],
+            focus_terms = [next_meeting.get('summary', '')] if next_meeting else []
+            model = self.completion_provider.model
+            fingerprint = _briefing_fingerprint(
+                client_notes, client_name, next_meeting_date, model, focus_terms,
+                BriefingPromptBuilder(model).budget, self.summarizer.chunk_size,
             )
-            logger.info("Received response from LLM.")
-            logger.info(f"LLM Response: {response.choices}")
+            previous = await _run_stage(
+                "fingerprint_lookup", get_briefing_by_fingerprint(user_id, client_name, fingerprint), timings
+            )
+            count_cache("briefing_fingerprint", "hit" if previous else "miss")
+            if previous:
+                logger.info(f"Prompt inputs unchanged since briefing {previous.id}; reusing its LLM output.")
+                summary, gaps, suggested_questions = previous.summary, previous.gaps, previous.suggested_questions
+                streamed = set()
+            else:
+                sections = await _run_stage("condense", self.summarizer.condense(user_id, client_name, client_notes), timings)
+                parser = BriefingStreamParser(emit) if emit is not None else None
+                llm_response = await _run_stage(
+                    "llm", self._summarize(client_name, next_meeting_date, sections, focus_terms, parser, timings), timings
+                )
+                summary = json.dumps(llm_response.get("summary", ""))
+                gaps = llm_response.get("gaps")
+                suggested_questions = llm_response.get("suggested_talking_points")
+                streamed = parser.sent if parser is not None else set()
 
-            llm_response = json.loads(response.choices[0].message.content)
-            logger.info("Parsed LLM response.")
+            await send("summary", {"summary": json.loads(summary)})
+            if "gaps" not in streamed:
+                await send("gaps", {"gaps": gaps})
+            if "suggested_talking_points" not in streamed:
+                await send("talking_points", {"suggested_talking_points": suggested_questions})
 
-            search_results = self.tavily_client.search(query=f"recent news about {client_name}")
+            search_results = await _optional_stage("search", search_task, {"results": []}, degraded_stages)
             logger.info("Received search results from Tavily.")
 
             briefing_data = {
@@ -110,16 +383,61 @@ class AgentService:
                 "client_name": client_name.strip(),
                 "meeting_date": meeting_date,
                 "next_meeting_date": next_meeting_date,
-                "summary": json.dumps(llm_response.get("summary", "")),
-                "gaps": llm_response.get("gaps"),
+                "summary": summary,
+                "gaps": gaps,
                 "external_research": search_results["results"],
-                "suggested_questions": llm_response.get("suggested_talking_points"),
+                "suggested_questions": suggested_questions,
+                "degraded_stages": degraded_stages,
+                "fingerprint": fingerprint,
             }
             logger.info("Compiled briefing data.")
 
             briefing_to_create = ResearchBriefingCreate(**briefing_data)
             logger.info(f"Briefing data: {briefing_to_create}")
-            await create_briefing(briefing_to_create)
+            try:
+                briefing = await _run_stage("persist", create_briefing(briefing_to_create), timings)
+            except DuplicateKeyError:
+                # Only possible when our claim lapsed and another request generated it meanwhile
+                logger.warning(f"Briefing for {client_name} on {meeting_date} was stored concurrently; keeping that one.")
+                return await get_briefing_for_meeting(user_id, client_name, meeting_date)
             logger.info("Successfully created briefing in the database.")
-        except Exception as e:
-            logger.error(f"An error occurred during briefing generation: {e}", exc_info=True)
+            return briefing
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # mark failures of abandoned stages as retrieved
+
+    async def _research(self, client_name: str) -> dict:
+        query = f"recent news about {client_name}"
+        return await self.research_cache.get_or_fetch(client_name, query, lambda: self.search_provider.search(query=query))
+
+    async def _summarize(
+        self,
+        client_name: str,
+        next_meeting_date: str,
+        sections: List[PromptSection],
+        focus_terms: List[str],
+        parser: Optional[BriefingStreamParser] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> dict:
+        """Reduces the notes, or their chunk summaries, into the briefing JSON, streaming it through `parser` if given."""
+        started = time.perf_counter()
+        builder = BriefingPromptBuilder(self.completion_provider.model)
+        prompt = builder.build(client_name, next_meeting_date, sections, focus_terms)
+        _record_stage("prompt_build", started, timings)
+        logger.info(f"Generated prompt for LLM: {prompt.token_count} tokens of a {prompt.budget} token budget.")
+
+        if parser is None:
+            content = await self.completion_provider.complete(prompt.messages)
+        else:
+            async for delta in self.completion_provider.stream(prompt.messages):
+                await parser.feed(delta)
+            content = parser.buffer
+        logger.info("Received response from LLM.")
+        logger.info(f"LLM Response: {content}")
+
+        llm_response = json.loads(content)
+        logger.info("Parsed LLM response.")
+        return llm_response
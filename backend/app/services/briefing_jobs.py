@@ -0,0 +1,178 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.models.briefing_job import BriefingJob
+from app.schemas.briefing import BriefingResult
+from app.db.briefing_job_repository import (
+    cancel_queued_job,
+    claim_queued_job,
+    count_active_jobs,
+    create_job,
+    get_job,
+    is_cancel_requested,
+    request_cancel,
+    update_job,
+)
+
+logger = logging.getLogger(__name__)
+
+# "celery" queues jobs for the Celery workers, "local" runs them as tasks of the API process
+BRIEFING_JOB_BACKEND = os.getenv("BRIEFING_JOB_BACKEND", "local")
+# Queued or running jobs a user may have at once
+MAX_ACTIVE_BRIEFING_JOBS_PER_USER = int(os.getenv("MAX_ACTIVE_BRIEFING_JOBS_PER_USER", "2"))
+# A running job that has not sent a heartbeat for this long is treated as lost, e.g. with its worker
+BRIEFING_JOB_STALE_SECONDS = int(os.getenv("BRIEFING_JOB_STALE_SECONDS", "900"))
+# How often a running job sends its heartbeat, whether or not a client has finished meanwhile
+BRIEFING_JOB_HEARTBEAT_SECONDS = int(os.getenv("BRIEFING_JOB_HEARTBEAT_SECONDS", "60"))
+
+
+class BriefingJobLimitError(Exception):
+    """The user already has MAX_ACTIVE_BRIEFING_JOBS_PER_USER jobs queued or running."""
+
+
+class BriefingJobService:
+    """
+    Runs generate_briefings_for_new_clients as a background job and records its progress.
+
+    submit() stores a queued BriefingJob and hands it to the Celery workers or to an asyncio task
+    of this process (BRIEFING_JOB_BACKEND), so the request returns at once. While the job runs,
+    every client's state, timings and errors are written to the job document for polling.
+    Cancelling a queued job is immediate; a running job stops starting new clients, and a local
+    one is also interrupted mid-generation.
+    """
+
+    def __init__(self):
+        self._local: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, user_id: str, concurrency: Optional[int] = None) -> BriefingJob:
+        heartbeat_after = datetime.utcnow() - timedelta(seconds=BRIEFING_JOB_STALE_SECONDS)
+        if await count_active_jobs(user_id, heartbeat_after) >= MAX_ACTIVE_BRIEFING_JOBS_PER_USER:
+            raise BriefingJobLimitError(
+                f"At most {MAX_ACTIVE_BRIEFING_JOBS_PER_USER} briefing jobs can run at once; wait for one to finish."
+            )
+        job = await create_job(BriefingJob(user_id=user_id, backend=BRIEFING_JOB_BACKEND, concurrency=concurrency))
+        job_id = str(job.id)
+        if job.backend == "celery":
+            from app.tasks.briefing_tasks import run_briefing_job_task
+
+            result = run_briefing_job_task.delay(job_id)
+            await update_job(job, task_id=result.id)
+        else:
+            task = asyncio.create_task(self.run(job_id))
+            self._local[job_id] = task
+            task.add_done_callback(lambda _: self._local.pop(job_id, None))
+        logger.info(f"Submitted briefing job {job_id} for user {user_id} ({job.backend}).")
+        return job
+
+    async def get(self, job_id: str) -> Optional[BriefingJob]:
+        job = await get_job(job_id)
+        # Only a running job has a runner to send heartbeats; a queued one may just wait for a worker
+        if job is not None and job.status == "running":
+            if datetime.utcnow() - job.updated_at > timedelta(seconds=BRIEFING_JOB_STALE_SECONDS):
+                await update_job(
+                    job, status="failed", error="The job stopped reporting progress.", finished_at=datetime.utcnow()
+                )
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[BriefingJob]:
+        if await cancel_queued_job(job_id):
+            job = await get_job(job_id)
+            if job is not None and job.task_id:
+                await self._revoke(job.task_id)
+            return job
+        await request_cancel(job_id)
+        task = self._local.get(job_id)
+        if task is not None:
+            task.cancel()
+        return await get_job(job_id)
+
+    @staticmethod
+    async def _revoke(task_id: str):
+        """
+        Drops a cancelled job's Celery message so no worker picks it up. Best effort: a worker
+        that still gets it finds the job cancelled and does not run it.
+        """
+        from app.tasks.worker import celery_app
+
+        try:
+            await asyncio.to_thread(celery_app.control.revoke, task_id)
+        except Exception as e:
+            logger.warning(f"Could not revoke Celery task {task_id}: {e}")
+
+    async def run(self, job_id: str):
+        if not await claim_queued_job(job_id):
+            logger.info(f"Briefing job {job_id} is no longer queued; not running it.")
+            return
+        job = await get_job(job_id)
+        from app.services.agent_service import AgentService
+
+        clients: Dict[str, BriefingResult] = {}
+        lock = asyncio.Lock()
+
+        async def on_progress(result: BriefingResult):
+            async with lock:
+                clients[result.client_name] = result
+                await update_job(job, clients=[client.model_dump() for client in clients.values()])
+
+        async def should_cancel() -> bool:
+            return await is_cancel_requested(job_id)
+
+        heartbeat = asyncio.create_task(self._heartbeat(job, lock))
+        try:
+            summary = await AgentService().generate_briefings_for_new_clients(
+                job.user_id, job.concurrency, on_progress=on_progress, should_cancel=should_cancel
+            )
+        except asyncio.CancelledError:
+            for client in clients.values():
+                if client.status in ("pending", "running"):
+                    client.status = "cancelled"
+            await update_job(
+                job,
+                status="cancelled",
+                clients=[client.model_dump() for client in clients.values()],
+                finished_at=datetime.utcnow(),
+            )
+            logger.info(f"Briefing job {job_id} was cancelled.")
+            raise
+        except Exception as e:
+            logger.error(f"Briefing job {job_id} failed: {e}", exc_info=True)
+            await update_job(job, status="failed", error=str(e), finished_at=datetime.utcnow())
+            return
+        finally:
+            heartbeat.cancel()
+
+        await update_job(
+            job,
+            status="cancelled" if summary.cancelled else "succeeded",
+            clients=[result.model_dump() for result in summary.results],
+            generated=summary.generated,
+            skipped=summary.skipped,
+            failed=summary.failed,
+            cancelled=summary.cancelled,
+            duration_ms=summary.duration_ms,
+            finished_at=datetime.utcnow(),
+        )
+
+    @staticmethod
+    async def _heartbeat(job: BriefingJob, lock: asyncio.Lock):
+        """Bumps the job's updated_at while it runs, so a single slow client does not get it marked lost."""
+        while True:
+            await asyncio.sleep(BRIEFING_JOB_HEARTBEAT_SECONDS)
+            try:
+                async with lock:
+                    await update_job(job)
+            except Exception as e:
+                logger.warning(f"Could not record the heartbeat of briefing job {job.id}: {e}")
+
+    async def shutdown(self):
+        """Cancels the jobs running in this process, recording them as cancelled."""
+        tasks = list(self._local.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+briefing_job_service = BriefingJobService()
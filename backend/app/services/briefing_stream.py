@@ -0,0 +1,142 @@
+import re
+import json
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[[str, dict], Awaitable[None]]
+
+# A comment line is sent after this many idle seconds so proxies keep the stream open
+SSE_KEEPALIVE_SECONDS = 15
+
+# Generations whose stream was closed keep running; holding them here stops them being garbage collected
+_background_generations: Set[asyncio.Task] = set()
+
+_DECODER = json.JSONDecoder()
+# Briefing JSON keys and the stream events they are sent as once complete
+LIST_FIELDS = {"gaps": "gaps", "suggested_talking_points": "talking_points"}
+
+
+def _value_start(buffer: str, key: str) -> Optional[int]:
+    match = re.search(rf'(?<!\\)"{key}"\s*:\s*', buffer)
+    if match is None or match.end() >= len(buffer):
+        return None
+    return match.end()
+
+
+def _string_prefix(buffer: str, start: int) -> Tuple[str, bool]:
+    """
+    Decodes as much of the JSON string starting at buffer[start] (its opening quote) as has
+    arrived, stopping before an incomplete escape or surrogate pair. Returns the text and whether
+    the string ended.
+    """
+    i = start + 1
+    while i < len(buffer):
+        char = buffer[i]
+        if char == '"':
+            return json.loads(buffer[start:i + 1]), True
+        if char == "\\":
+            width = 6 if buffer[i + 1:i + 2] == "u" else 2
+            if width == 6 and buffer[i + 2:i + 4].lower() in ("d8", "d9", "da", "db"):
+                width = 12  # a high surrogate; wait for its low half so the character is decoded whole
+            if i + width > len(buffer):
+                break
+            i += width
+        else:
+            i += 1
+    return json.loads(buffer[start:i] + '"'), False
+
+
+class BriefingStreamParser:
+    """
+    Picks the briefing's fields out of the LLM's JSON while it is still being streamed: the
+    summary is emitted as "summary_delta" events as its text arrives, and the gaps and talking
+    points lists as soon as each is complete.
+    """
+
+    def __init__(self, emit: Emit):
+        self.emit = emit
+        self.buffer = ""
+        self.summary_sent = 0
+        self.sent: Set[str] = set()
+
+    async def feed(self, delta: str):
+        self.buffer += delta
+        await self._summary()
+        for key, event in LIST_FIELDS.items():
+            if key in self.sent:
+                continue
+            start = _value_start(self.buffer, key)
+            if start is None:
+                continue
+            try:
+                value, _ = _DECODER.raw_decode(self.buffer, start)
+            except ValueError:
+                continue  # not complete yet
+            self.sent.add(key)
+            await self.emit(event, {key: value})
+
+    async def _summary(self):
+        if "summary" in self.sent:
+            return
+        start = _value_start(self.buffer, "summary")
+        if start is None:
+            return
+        if self.buffer[start] != '"':
+            # Not a plain string; it is sent whole once the response is parsed
+            self.sent.add("summary")
+            return
+        text, complete = _string_prefix(self.buffer, start)
+        if len(text) > self.summary_sent:
+            await self.emit("summary_delta", {"text": text[self.summary_sent:]})
+            self.summary_sent = len(text)
+        if complete:
+            self.sent.add("summary")
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_briefing(agent_service, user_id: str, client_name: str, meeting_date: datetime) -> AsyncIterator[str]:
+    """
+    Generates a briefing and yields Server-Sent Events as it progresses: notes, calendar,
+    research, summary_delta, summary, gaps and talking_points, then "briefing" with the stored
+    ResearchBriefing (or "error") and finally "done". If the client disconnects, generation
+    carries on in the background and the briefing is still stored.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit(event: str, data: dict):
+        await queue.put((event, data))
+
+    async def generate():
+        try:
+            briefing = await agent_service._generate_briefing(user_id, client_name, meeting_date, emit=emit)
+            if briefing is None:
+                await emit("error", {"detail": "There are no meeting notes to brief from."})
+            else:
+                await emit("briefing", json.loads(briefing.model_dump_json()))
+        except Exception as e:
+            logger.error(f"Streamed briefing generation failed: {e}", exc_info=True)
+            await emit("error", {"detail": str(e)})
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(generate())
+    _background_generations.add(task)
+    task.add_done_callback(_background_generations.discard)
+    yield format_sse("started", {"client_name": client_name, "meeting_date": meeting_date})
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
+            continue
+        if item is None:
+            break
+        yield format_sse(*item)
+    yield format_sse("done", {})
@@ -0,0 +1,175 @@
+import os
+import math
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.models.bulk_run import BulkRun, BulkRunItem
+from app.db.bulk_run_repository import add_items, claim_next_item, finish_item, reset_items, update_run
+
+logger = logging.getLogger(__name__)
+
+BULK_RUN_WORKERS = int(os.getenv("BULK_RUN_WORKERS", "4"))
+# Briefing generations started per minute across all workers; 0 disables the limit
+BULK_RUN_RATE_PER_MINUTE = float(os.getenv("BULK_RUN_RATE_PER_MINUTE", "30"))
+
+
+class RateLimiter:
+    """Spaces out acquisitions so at most `per_minute` start per minute, however many workers wait."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class BulkRunReport(BaseModel):
+    run_id: str
+    generated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    briefings_per_minute: float = 0.0
+    # stage (plus "total") -> {"p50": ms, "p95": ms}
+    latency_ms: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+
+
+class BulkRunner:
+    """
+    Generates briefings for many users' clients with a pool of workers.
+
+    plan() stores one BulkRunItem per (user, client) to brief; execute() has `workers` coroutines
+    claim pending items one at a time and generate them, starting at most `rate_per_minute`
+    generations a minute. Every item's outcome is written back as it finishes, so a run that is
+    interrupted resumes from its pending items (items it left running are retried). Every briefing
+    of a run is keyed by the run's meeting_date, so a retried item never duplicates a briefing.
+    """
+
+    def __init__(
+        self,
+        agent_service=None,
+        workers: int = BULK_RUN_WORKERS,
+        rate_per_minute: float = BULK_RUN_RATE_PER_MINUTE,
+    ):
+        if agent_service is None:
+            from app.services.agent_service import AgentService
+
+            agent_service = AgentService()
+        self.agent_service = agent_service
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate_per_minute)
+
+    async def eligible_clients(self, run: BulkRun) -> List[Tuple[str, str]]:
+        """(user_id, client_name) pairs the run covers: clients with notes, not briefed in the last skip_recent_hours."""
+        from app.db.repository import UserRepository
+        from app.db.client_repository import get_clients_for_user
+        from app.db.briefing_repository import get_recently_briefed_client_names
+        from app.db.meeting_note_repository import MeetingNoteRepository
+
+        user_ids = run.user_ids or await UserRepository().get_active_user_ids()
+        pairs = []
+        for user_id in user_ids:
+            clients = [client.name for client in await get_clients_for_user(user_id)]
+            with_notes = set(await MeetingNoteRepository().get_client_names_with_notes(user_id))
+            recent = set()
+            if run.skip_recent_hours:
+                recent = set(await get_recently_briefed_client_names(user_id, hours=run.skip_recent_hours))
+            for client_name in clients:
+                if run.client_names and client_name not in run.client_names:
+                    continue
+                if client_name in with_notes and client_name not in recent:
+                    pairs.append((user_id, client_name))
+        return pairs
+
+    async def plan(self, run: BulkRun) -> int:
+        """Stores the run's items. Safe to repeat: items planned before are kept as they are."""
+        pairs = await self.eligible_clients(run)
+        added = await add_items([BulkRunItem(run_id=run.run_id, user_id=user_id, client_name=name) for user_id, name in pairs])
+        await update_run(run, status="running", planned=run.planned + added)
+        logger.info(f"Bulk run {run.run_id}: planned {added} new item(s) ({len(pairs)} eligible).")
+        return added
+
+    async def execute(self, run: BulkRun, retry_failed: bool = False) -> BulkRunReport:
+        statuses = ["running", "failed"] if retry_failed else ["running"]
+        resumed = await reset_items(run.run_id, statuses)
+        if resumed:
+            logger.info(f"Bulk run {run.run_id}: retrying {resumed} item(s) from an earlier session.")
+
+        report = BulkRunReport(run_id=run.run_id)
+        stage_samples: Dict[str, List[float]] = {}
+        started = time.perf_counter()
+
+        async def worker():
+            while True:
+                await self.rate_limiter.acquire()
+                item = await claim_next_item(run.run_id)
+                if item is None:
+                    return
+                await self._process(run, item, report, stage_samples)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.workers)))
+        except asyncio.CancelledError:
+            await update_run(run, status="interrupted")
+            raise
+        await update_run(run, status="finished", finished_at=datetime.utcnow())
+
+        report.elapsed_seconds = time.perf_counter() - started
+        report.briefings_per_minute = report.generated / report.elapsed_seconds * 60 if report.elapsed_seconds else 0.0
+        report.latency_ms = {
+            stage: {"p50": percentile(samples, 50), "p95": percentile(samples, 95)}
+            for stage, samples in sorted(stage_samples.items())
+        }
+        return report
+
+    async def _process(self, run: BulkRun, item: BulkRunItem, report: BulkRunReport, stage_samples: Dict[str, List[float]]):
+        timings: Dict[str, float] = {}
+        item_started = time.perf_counter()
+        try:
+            briefing = await self.agent_service._generate_briefing(
+                item.user_id, item.client_name, run.meeting_date, timings=timings
+            )
+        except Exception as e:
+            logger.error(f"Bulk run {run.run_id}: {item.client_name} of user {item.user_id} failed: {e}")
+            status, reason, briefing_id = "failed", str(e), None
+        else:
+            if briefing is None:
+                status, reason, briefing_id = "skipped", "nothing to brief", None
+            else:
+                status, reason, briefing_id = "generated", None, str(briefing.id)
+        duration_ms = (time.perf_counter() - item_started) * 1000
+
+        await finish_item(
+            item, status=status, reason=reason, briefing_id=briefing_id, duration_ms=duration_ms, stage_timings=timings
+        )
+        setattr(report, status, getattr(report, status) + 1)
+        if status == "generated":
+            for stage, ms in timings.items():
+                stage_samples.setdefault(stage, []).append(ms)
+            stage_samples.setdefault("total", []).append(duration_ms)
+
+
+def new_run_id() -> str:
+    return datetime.utcnow().strftime("run-%Y%m%d-%H%M%S")
@@ -0,0 +1,191 @@
+import os
+import json
+import uuid
+import logging
+from typing import List, Optional, Union
+from urllib.parse import urlparse
+
+import httplib2
+import httpx
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+
+from app.core.metrics import ProviderCall, count_provider_error
+from app.services.providers import build_http_client
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+# Google caps Calendar batch requests at 50 calls
+CALENDAR_BATCH_SIZE = int(os.getenv("CALENDAR_BATCH_SIZE", "50"))
+# Partial response: only the event fields the app reads
+EVENT_FIELDS = "items(id,status,summary,start,end,updated,htmlLink,location,description,attendees(email))"
+SYNC_FIELDS = f"nextPageToken,nextSyncToken,{EVENT_FIELDS}"
+SYNC_PAGE_SIZE = 250
+
+
+class CalendarApiError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Google Calendar API error {status_code}: {message}")
+        self.status_code = status_code
+
+
+class CalendarClient:
+    """
+    Google Calendar client that does not block the event loop.
+
+    The googleapiclient service is built once, from the discovery document bundled with the
+    library, and is only used to describe requests (method, URL, headers). Requests are sent
+    with the caller's access token over a shared, pooled httpx client, either one at a time or
+    many users at once in a single HTTP batch request.
+    """
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # The httplib2 object is never used to send anything; it stops build() looking for default credentials
+        self.service = build("calendar", "v3", static_discovery=True, http=httplib2.Http())
+        self.http_client = http_client or build_http_client()
+
+    def events_list_request(self, time_min: str, max_results: int = 3, **params) -> HttpRequest:
+        return self.service.events().list(
+            calendarId="primary",
+            timeMin=time_min,
+            maxResults=max_results,
+            singleEvents=True,
+            orderBy="startTime",
+            fields=params.pop("fields", EVENT_FIELDS),
+            **params,
+        )
+
+    def events_sync_request(
+        self,
+        sync_token: Optional[str] = None,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        page_token: Optional[str] = None,
+    ) -> HttpRequest:
+        """
+        One page of an events sync. Without a sync token this is a full sync of the time window;
+        with one, Google only returns the events changed since the token was issued (the window
+        cannot be passed again, it is implied by the token).
+        """
+        params = {"calendarId": "primary", "singleEvents": True, "maxResults": SYNC_PAGE_SIZE, "fields": SYNC_FIELDS}
+        if sync_token:
+            params["syncToken"] = sync_token
+        else:
+            params.update(timeMin=time_min, timeMax=time_max)
+        if page_token:
+            params["pageToken"] = page_token
+        return self.service.events().list(**params)
+
+    async def execute(self, request: HttpRequest, token: str) -> dict:
+        with ProviderCall("google_calendar", "request"):
+            response = await self.http_client.request(
+                request.method,
+                request.uri,
+                content=request.body,
+                headers={**request.headers, "authorization": f"Bearer {token}"},
+            )
+            if response.status_code >= 400:
+                raise CalendarApiError(response.status_code, response.text)
+        return response.json()
+
+    async def list_upcoming_events(self, token: str, time_min: str, max_results: int = 3) -> List[dict]:
+        result = await self.execute(self.events_list_request(time_min, max_results), token)
+        return result.get("items", [])
+
+    async def get_primary_calendar_id(self, token: str) -> Optional[str]:
+        result = await self.execute(self.service.calendarList().get(calendarId="primary", fields="id"), token)
+        return result.get("id")
+
+    async def batch_execute(self, calls: List[tuple]) -> List[Union[dict, CalendarApiError]]:
+        """
+        Runs (request, token) pairs through Calendar batch requests of up to CALENDAR_BATCH_SIZE
+        calls each. Every call carries its own token, so one batch can cover many users. Returns
+        one parsed body or CalendarApiError per call, in order.
+        """
+        results = []
+        for start in range(0, len(calls), CALENDAR_BATCH_SIZE):
+            results.extend(await self._send_batch(calls[start:start + CALENDAR_BATCH_SIZE]))
+        return results
+
+    async def _send_batch(self, calls: List[tuple]) -> List[Union[dict, CalendarApiError]]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for index, (request, token) in enumerate(calls):
+            url = urlparse(request.uri)
+            target = f"{url.path}?{url.query}" if url.query else url.path
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item{index}>\r\n\r\n"
+                f"{request.method} {target} HTTP/1.1\r\n"
+                f"Authorization: Bearer {token}\r\n"
+                "Accept: application/json\r\n\r\n"
+            )
+        body = "".join(parts) + f"--{boundary}--\r\n"
+
+        with ProviderCall("google_calendar", "batch"):
+            response = await self.http_client.post(
+                CALENDAR_BATCH_URL,
+                content=body.encode(),
+                headers={"content-type": f"multipart/mixed; boundary={boundary}"},
+            )
+        if response.status_code >= 400:
+            count_provider_error("google_calendar", "batch")
+            error = CalendarApiError(response.status_code, response.text)
+            return [error] * len(calls)
+
+        results: List[Union[dict, CalendarApiError]] = [
+            CalendarApiError(500, "missing from batch response") for _ in calls
+        ]
+        for index, status_code, payload in _parse_batch_response(response):
+            if index is None or index >= len(calls):
+                continue
+            if status_code >= 400:
+                results[index] = CalendarApiError(status_code, payload)
+            else:
+                results[index] = json.loads(payload) if payload else {}
+        return results
+
+
+def _parse_batch_response(response: httpx.Response):
+    """Yields (call index, status code, body) for each part of a multipart/mixed batch response."""
+    content_type = response.headers.get("content-type", "")
+    boundary = content_type.split("boundary=", 1)[-1].strip('"')
+    for part in response.text.split(f"--{boundary}"):
+        part = part.strip()
+        if not part or part == "--":
+            continue
+        outer_headers, _, inner = part.partition("\r\n\r\n")
+        index = None
+        for line in outer_headers.split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-id":
+                # Google answers item<N> with response-item<N>
+                digits = value.strip().strip("<>").rsplit("item", 1)[-1]
+                index = int(digits) if digits.isdigit() else None
+        status_line, _, rest = inner.partition("\r\n")
+        _, _, body = rest.partition("\r\n\r\n")
+        try:
+            status_code = int(status_line.split(" ")[1])
+        except (IndexError, ValueError):
+            status_code = 500
+        yield index, status_code, body.strip()
+
+
+_calendar_client: Optional[CalendarClient] = None
+
+
+def get_calendar_client() -> CalendarClient:
+    """Returns the process-wide calendar client, building the API description on first use."""
+    global _calendar_client
+    if _calendar_client is None:
+        _calendar_client = CalendarClient()
+    return _calendar_client
+
+
+async def close_calendar_client():
+    global _calendar_client
+    if _calendar_client is not None:
+        await _calendar_client.http_client.aclose()
+        _calendar_client = None
@@ -1,11 +1,17 @@
 import os
 import logging
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from app.models.user import User
 from app.db.repository import UserRepository
+from app.services.calendar_token_manager import credentials_to_dict
+from app.services.calendar_sync import calendar_sync_service
+from app.db.calendar_event_repository import (
+    get_upcoming_events,
+    get_upcoming_events_for_users,
+    reset_calendar_store,
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -57,50 +63,27 @@ class GoogleCalendarService:
         flow.fetch_token(code=code)
         credentials = flow.credentials
         
-        user.google_calendar_credentials = {
-            'token': credentials.token,
-            'refresh_token': credentials.refresh_token,
-            'token_uri': credentials.token_uri,
-            'client_id': credentials.client_id,
-            'client_secret': credentials.client_secret,
-            'scopes': credentials.scopes
-        }
+        user.google_calendar_credentials = credentials_to_dict(credentials)
         
         user_repo = UserRepository()
         await user_repo.update_user(user)
+        # The new credentials may belong to another Google account
+        await reset_calendar_store(str(user.id))
 
-    async def get_upcoming_meetings(self, user: User):
+    async def get_upcoming_meetings(self, user: User, limit: Optional[int] = None, within: Optional[timedelta] = None):
+        """Upcoming events from the local store, synced first if it is out of date."""
         if not user.google_calendar_credentials:
             return []
 
-        credentials = Credentials(**user.google_calendar_credentials)
-
-        # Check if the credentials have expired and refresh them if necessary
-        if credentials.expired and credentials.refresh_token:
-            from google.auth.transport.requests import Request
-            credentials.refresh(Request())
-            
-            # Update the user's credentials in the database
-            user.google_calendar_credentials = {
-                'token': credentials.token,
-                'refresh_token': credentials.refresh_token,
-                'token_uri': credentials.token_uri,
-                'client_id': credentials.client_id,
-                'client_secret': credentials.client_secret,
-                'scopes': credentials.scopes
-            }
-            user_repo = UserRepository()
-            await user_repo.update_user(user)
+        await calendar_sync_service.ensure_fresh(user)
+        now = datetime.utcnow()
+        events = await get_upcoming_events(str(user.id), now, now + within if within else None, limit)
+        return [event.to_event() for event in events]
 
-        service = build('calendar', 'v3', credentials=credentials)
-        
-        now = datetime.utcnow().isoformat() + 'Z'  # 'Z' indicates UTC time
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=now,
-            maxResults=3,
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        return events_result.get('items', [])
\ No newline at end of file
+    async def get_upcoming_meetings_for_users(self, users: List[User], within: timedelta) -> Dict[str, list]:
+        """Events starting within the given time of many users, keyed by user id. Stale stores are synced first."""
+        users = [user for user in users if user.google_calendar_credentials]
+        await calendar_sync_service.sync_users(users)
+        now = datetime.utcnow()
+        events = await get_upcoming_events_for_users([str(user.id) for user in users], now, now + within)
+        return {user_id: [event.to_event() for event in user_events] for user_id, user_events in events.items()}
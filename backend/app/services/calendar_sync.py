@@ -0,0 +1,211 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.models.user import User
+from app.models.calendar_event import CalendarSyncState
+from app.db.calendar_event_repository import (
+    apply_event_changes,
+    delete_events,
+    get_sync_state,
+    get_sync_states,
+    save_sync_state,
+)
+from app.services.calendar_client import CalendarApiError, get_calendar_client
+from app.services.calendar_token_manager import calendar_token_manager
+
+logger = logging.getLogger(__name__)
+
+# How far ahead events are kept in the local store
+CALENDAR_SYNC_WINDOW_DAYS = int(os.getenv("CALENDAR_SYNC_WINDOW_DAYS", "30"))
+# A user's store is re-synced before it is read once it is older than this
+CALENDAR_SYNC_MAX_AGE_SECONDS = int(os.getenv("CALENDAR_SYNC_MAX_AGE_SECONDS", "300"))
+# The sync window is fixed when a full sync runs, so full syncs are repeated to move it forward
+CALENDAR_FULL_SYNC_INTERVAL_HOURS = int(os.getenv("CALENDAR_FULL_SYNC_INTERVAL_HOURS", "24"))
+# Users whose tokens are refreshed, or whose follow-up pages are fetched, at once in sync_users()
+CALENDAR_SYNC_CONCURRENCY = int(os.getenv("CALENDAR_SYNC_CONCURRENCY", "20"))
+
+
+def _to_rfc3339(value: datetime) -> str:
+    return value.isoformat() + 'Z'
+
+
+def _is_stale(state: Optional[CalendarSyncState], now: datetime, max_age: float) -> bool:
+    return state is None or now - state.last_synced_at >= timedelta(seconds=max_age)
+
+
+def _full_sync_due(state: Optional[CalendarSyncState], now: datetime) -> bool:
+    return (
+        state is None
+        or not state.sync_token
+        or now - state.last_full_sync_at >= timedelta(hours=CALENDAR_FULL_SYNC_INTERVAL_HOURS)
+    )
+
+
+def _full_sync_state(user_id: str, now: datetime) -> CalendarSyncState:
+    return CalendarSyncState(
+        user_id=user_id,
+        window_start=now,
+        window_end=now + timedelta(days=CALENDAR_SYNC_WINDOW_DAYS),
+        last_full_sync_at=now,
+    )
+
+
+class CalendarSyncService:
+    """
+    Mirrors each user's upcoming Google Calendar events into the calendar_events collection.
+
+    A full sync lists the events of the next CALENDAR_SYNC_WINDOW_DAYS and keeps the sync token
+    Google returns with the last page; later syncs send that token and only receive the events
+    that changed since, so a quiet calendar costs one small request. When Google expires the
+    token (410 Gone) the user falls back to a full sync. Responses are trimmed to the fields the
+    app reads. The first page of every user in a sync_users() call goes out in Calendar batch
+    requests; the rare follow-up pages are fetched per user.
+    """
+
+    def __init__(self):
+        self._syncs: Dict[str, asyncio.Task] = {}
+
+    async def ensure_fresh(self, user: User):
+        """Syncs the user's events first if their store is missing or older than CALENDAR_SYNC_MAX_AGE_SECONDS."""
+        if not user.google_calendar_credentials:
+            return
+        state = await get_sync_state(str(user.id))
+        if not _is_stale(state, datetime.utcnow(), CALENDAR_SYNC_MAX_AGE_SECONDS):
+            return
+        try:
+            await asyncio.shield(self._schedule_sync(user))
+        except Exception as e:
+            if state is None:
+                raise
+            # A stale store is more useful than no answer
+            logger.warning(f"Calendar sync failed for user {user.id}, serving events synced at {state.last_synced_at}: {e}")
+
+    def _schedule_sync(self, user: User) -> asyncio.Task:
+        key = str(user.id)
+        task = self._syncs.get(key)
+        if task is None:
+            task = asyncio.create_task(self._sync_one(user))
+            self._syncs[key] = task
+            task.add_done_callback(lambda finished: self._syncs.pop(key, None))
+        return task
+
+    async def _sync_one(self, user: User):
+        credentials = await calendar_token_manager.get_credentials(user)
+        if credentials is None:
+            logger.info(f"Calendar token of user {user.id} is unavailable; not syncing.")
+            return
+        state = await get_sync_state(str(user.id))
+        await self._sync(str(user.id), credentials.token, state)
+
+    async def sync_users(self, users: List[User], max_age: float = CALENDAR_SYNC_MAX_AGE_SECONDS) -> int:
+        """Syncs every user whose store is older than max_age seconds. Returns how many were synced."""
+        users = [user for user in users if user.google_calendar_credentials]
+        if not users:
+            return 0
+        now = datetime.utcnow()
+        states = {state.user_id: state for state in await get_sync_states([str(user.id) for user in users])}
+        users = [user for user in users if _is_stale(states.get(str(user.id)), now, max_age)]
+        semaphore = asyncio.Semaphore(CALENDAR_SYNC_CONCURRENCY)
+
+        async def bounded(awaitable):
+            async with semaphore:
+                return await awaitable
+
+        tokens = await asyncio.gather(
+            *(bounded(calendar_token_manager.get_credentials(user)) for user in users), return_exceptions=True
+        )
+
+        plans = []
+        for user, credentials in zip(users, tokens):
+            if isinstance(credentials, Exception):
+                logger.warning(f"Skipping calendar sync of user {user.id}: {credentials}")
+                continue
+            if credentials is None:
+                continue  # backing off after failed token refreshes
+            user_id = str(user.id)
+            plans.append((user_id, credentials.token, self._next_state(user_id, states.get(user_id), now)))
+
+        first_pages = await get_calendar_client().batch_execute(
+            [(self._request(state), token) for _, token, state in plans]
+        )
+        results = await asyncio.gather(
+            *(
+                bounded(self._sync(user_id, token, state, first_page=page, now=now))
+                for (user_id, token, state), page in zip(plans, first_pages)
+            ),
+            return_exceptions=True,
+        )
+        failed = 0
+        for (user_id, _, _), result in zip(plans, results):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.warning(f"Calendar sync failed for user {user_id}: {result}")
+        if plans:
+            logger.info(f"Calendar sync updated {len(plans) - failed} user(s), {failed} failed.")
+        return len(plans) - failed
+
+    @staticmethod
+    def _next_state(user_id: str, state: Optional[CalendarSyncState], now: datetime) -> CalendarSyncState:
+        """The stored state for an incremental sync, or a fresh window when a full sync is due."""
+        if _full_sync_due(state, now):
+            return _full_sync_state(user_id, now)
+        return state
+
+    @staticmethod
+    def _request(state: CalendarSyncState, page_token: Optional[str] = None):
+        client = get_calendar_client()
+        if state.sync_token:
+            return client.events_sync_request(sync_token=state.sync_token, page_token=page_token)
+        return client.events_sync_request(
+            time_min=_to_rfc3339(state.window_start),
+            time_max=_to_rfc3339(state.window_end),
+            page_token=page_token,
+        )
+
+    async def _fetch(self, state: CalendarSyncState, token: str, page_token: Optional[str] = None):
+        try:
+            return await get_calendar_client().execute(self._request(state, page_token), token)
+        except CalendarApiError as e:
+            return e
+
+    async def _sync(
+        self,
+        user_id: str,
+        token: str,
+        state: Optional[CalendarSyncState],
+        first_page=None,
+        now: Optional[datetime] = None,
+    ):
+        now = now or datetime.utcnow()
+        state = self._next_state(user_id, state, now)
+        page = first_page if first_page is not None else await self._fetch(state, token)
+        if isinstance(page, CalendarApiError) and page.status_code == 410 and state.sync_token:
+            logger.info(f"Calendar sync token of user {user_id} expired, running a full sync.")
+            state = _full_sync_state(user_id, now)
+            page = await self._fetch(state, token)
+
+        items = []
+        while True:
+            if isinstance(page, CalendarApiError):
+                raise page
+            items.extend(page.get('items', []))
+            if not page.get('nextPageToken'):
+                break
+            page = await self._fetch(state, token, page['nextPageToken'])
+
+        started = datetime.utcnow()
+        await apply_event_changes(user_id, items, state.window_start, state.window_end)
+        if not state.sync_token:
+            # A full sync lists every event in the window; whatever it did not touch is gone
+            await delete_events(user_id, synced_before=started)
+        await delete_events(user_id, starting_before=now)
+
+        state.sync_token = page.get('nextSyncToken')
+        state.last_synced_at = now
+        await save_sync_state(state)
+
+
+calendar_sync_service = CalendarSyncService()
@@ -0,0 +1,199 @@
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+from app.models.user import User
+from app.db.repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+# Tokens expiring within this window are refreshed ahead of time
+CALENDAR_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("CALENDAR_TOKEN_REFRESH_MARGIN_SECONDS", "600"))
+CALENDAR_TOKEN_SWEEP_INTERVAL_SECONDS = int(os.getenv("CALENDAR_TOKEN_SWEEP_INTERVAL_SECONDS", "120"))
+CALENDAR_TOKEN_SWEEP_BATCH_SIZE = int(os.getenv("CALENDAR_TOKEN_SWEEP_BATCH_SIZE", "100"))
+# After a failed refresh the sweep skips the user for this long, doubling per failure up to the max
+CALENDAR_TOKEN_REFRESH_BACKOFF_SECONDS = int(os.getenv("CALENDAR_TOKEN_REFRESH_BACKOFF_SECONDS", "300"))
+CALENDAR_TOKEN_REFRESH_MAX_BACKOFF_SECONDS = int(os.getenv("CALENDAR_TOKEN_REFRESH_MAX_BACKOFF_SECONDS", "21600"))
+# Every API process runs the sweep loop; a lock here lets one of them sweep per interval
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def credentials_to_dict(credentials: Credentials) -> dict:
+    return {
+        'token': credentials.token,
+        'refresh_token': credentials.refresh_token,
+        'token_uri': credentials.token_uri,
+        'client_id': credentials.client_id,
+        'client_secret': credentials.client_secret,
+        'scopes': credentials.scopes,
+        'expiry': credentials.expiry,  # naive UTC, as google-auth expects
+    }
+
+
+def credentials_from_dict(data: dict) -> Credentials:
+    data = dict(data)
+    expiry = data.pop('expiry', None)
+    if isinstance(expiry, str):
+        expiry = datetime.fromisoformat(expiry)
+    if expiry is not None and expiry.tzinfo is not None:
+        expiry = expiry.replace(tzinfo=None) - expiry.utcoffset()
+    return Credentials(**data, expiry=expiry)
+
+
+def _expires_within(credentials: Credentials, seconds: float) -> bool:
+    # Credentials stored before expiries were recorded are treated as expiring
+    if credentials.expiry is None:
+        return True
+    return credentials.expiry - timedelta(seconds=seconds) <= datetime.utcnow()
+
+
+def _backing_off(user: User) -> bool:
+    return user.calendar_refresh_retry_at is not None and user.calendar_refresh_retry_at > datetime.utcnow()
+
+
+def refresh_backoff(failures: int) -> timedelta:
+    """How long the sweep leaves a user alone after their `failures`-th failed refresh in a row."""
+    seconds = CALENDAR_TOKEN_REFRESH_BACKOFF_SECONDS * 2 ** max(failures - 1, 0)
+    return timedelta(seconds=min(seconds, CALENDAR_TOKEN_REFRESH_MAX_BACKOFF_SECONDS))
+
+
+class CalendarTokenManager:
+    """
+    Keeps users' Google Calendar access tokens valid off the request path.
+
+    A background sweep refreshes tokens that are about to expire. get_credentials() returns the
+    stored token when it is still valid, scheduling a background refresh when it is close to
+    expiry, and only waits when the token has already expired. It returns None when the token
+    has expired while the user is backing off after failed refreshes, rather than asking Google
+    again on every request. Refreshes are single-flight per
+    user: concurrent callers share one call to Google's token endpoint, which runs in a worker
+    thread, and the new token is persisted once.
+
+    A failed refresh backs the user off the sweep (see refresh_backoff); a refresh token Google
+    rejects with invalid_grant is revoked or expired for good, so the calendar is disconnected.
+    """
+
+    def __init__(self):
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._redis = None
+
+    async def get_credentials(self, user: User) -> Optional[Credentials]:
+        if not user.google_calendar_credentials:
+            return None
+        credentials = credentials_from_dict(user.google_calendar_credentials)
+        if not credentials.refresh_token:
+            return credentials
+        if _expires_within(credentials, 0):
+            if _backing_off(user):
+                # Recent refreshes failed; the calendar is unavailable until the backoff ends
+                return None
+            return await self.refresh(user)
+        if _expires_within(credentials, CALENDAR_TOKEN_REFRESH_MARGIN_SECONDS):
+            self._schedule_refresh(user)
+        return credentials
+
+    async def refresh(self, user: User) -> Credentials:
+        return await asyncio.shield(self._schedule_refresh(user))
+
+    def _schedule_refresh(self, user: User) -> asyncio.Task:
+        key = str(user.id)
+        task = self._refreshes.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(user))
+            self._refreshes[key] = task
+            task.add_done_callback(lambda finished: self._on_refresh_done(key, finished))
+        return task
+
+    def _on_refresh_done(self, key: str, task: asyncio.Task):
+        self._refreshes.pop(key, None)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Google Calendar token refresh failed for user {key}: {task.exception()}")
+
+    async def _refresh(self, user: User) -> Credentials:
+        previous = user.google_calendar_credentials
+        credentials = credentials_from_dict(previous)
+        logger.info(f"Refreshing Google Calendar token for user {user.id}.")
+        try:
+            await asyncio.to_thread(credentials.refresh, Request())
+        except Exception as e:
+            await self._on_refresh_failed(user, e)
+            raise
+        await UserRepository().replace_calendar_credentials(user, previous.get('token'), credentials_to_dict(credentials))
+        return credentials
+
+    async def _on_refresh_failed(self, user: User, error: Exception):
+        try:
+            if isinstance(error, RefreshError) and 'invalid_grant' in str(error):
+                logger.warning(f"Google rejected the refresh token of user {user.id}; disconnecting their calendar.")
+                await UserRepository().clear_calendar_credentials(user)
+            else:
+                retry_at = datetime.utcnow() + refresh_backoff(user.calendar_refresh_failures + 1)
+                await UserRepository().record_calendar_refresh_failure(user, retry_at)
+        except Exception as e:
+            logger.error(f"Could not record the failed token refresh of user {user.id}: {e}")
+
+    async def sweep(self):
+        """Refreshes every stored token that expires within the refresh margin."""
+        threshold = datetime.utcnow() + timedelta(seconds=CALENDAR_TOKEN_REFRESH_MARGIN_SECONDS)
+        users = await UserRepository().get_users_with_expiring_calendar_tokens(threshold, CALENDAR_TOKEN_SWEEP_BATCH_SIZE)
+        results = await asyncio.gather(
+            *(self.refresh(user) for user in users if user.google_calendar_credentials.get('refresh_token')),
+            return_exceptions=True,
+        )
+        failed = sum(isinstance(result, Exception) for result in results)
+        if results:
+            logger.info(f"Calendar token sweep refreshed {len(results) - failed} token(s), {failed} failed.")
+
+    async def _claim_sweep(self) -> bool:
+        """
+        Claims this interval's sweep with SET NX on a key named after it, so that of all the API
+        processes only the first one to get there sweeps. Sweeps anyway when Redis is unreachable.
+        """
+        slot = int(time.time() // CALENDAR_TOKEN_SWEEP_INTERVAL_SECONDS)
+        try:
+            if self._redis is None:
+                import redis.asyncio as redis
+
+                self._redis = redis.from_url(REDIS_URL)
+            return bool(await self._redis.set(
+                f"calendar-token-sweep-lock:{slot}", os.getpid(), nx=True, ex=CALENDAR_TOKEN_SWEEP_INTERVAL_SECONDS
+            ))
+        except Exception as e:
+            logger.warning(f"Could not claim the calendar token sweep, sweeping anyway: {e}")
+            return True
+
+    async def _sweep_forever(self):
+        while True:
+            try:
+                if await self._claim_sweep():
+                    await self.sweep()
+            except Exception as e:
+                logger.error(f"Calendar token sweep failed: {e}", exc_info=True)
+            await asyncio.sleep(CALENDAR_TOKEN_SWEEP_INTERVAL_SECONDS)
+
+    def start(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+calendar_token_manager = CalendarTokenManager()
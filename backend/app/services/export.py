@@ -0,0 +1,88 @@
+import os
+import json
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from bson import ObjectId
+from app.db.database import db
+from app.db.pagination import decode_cursor, encode_cursor
+from app.models.briefing import ResearchBriefing
+from app.models.meeting_note import MeetingNote
+
+# Documents fetched from MongoDB per round trip while exporting
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+# Exportable collections: model and the timestamp field the `since` filter applies to
+EXPORTS = {
+    "briefings": (ResearchBriefing, "created_at"),
+    "notes": (MeetingNote, "createdAt"),
+}
+
+
+def _json_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def to_ndjson_line(document: dict) -> str:
+    return json.dumps(document, default=_json_default) + "\n"
+
+
+def checkpoint_of(name: str, document: dict) -> str:
+    """
+    The checkpoint to resume an export after `document`: a keyset cursor over (timestamp, _id),
+    encoded like the list endpoints' cursors, which record whether the _id is an ObjectId.
+    """
+    _, timestamp_field = EXPORTS[name]
+    return encode_cursor(document[timestamp_field], document["_id"])
+
+
+def parse_checkpoint(value: str):
+    """Returns (timestamp, _id) from a checkpoint, raising ValueError if it is malformed."""
+    try:
+        return decode_cursor(value)
+    except ValueError as e:
+        raise ValueError("Invalid checkpoint") from e
+
+
+async def iter_export(
+    name: str,
+    user_id: Optional[str] = None,
+    client_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    after: Optional[str] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    """
+    Yields the raw documents of an exportable collection in (timestamp, _id) order, streaming
+    them from a Motor cursor `batch_size` at a time so memory stays flat. `after` is a checkpoint
+    (see checkpoint_of) of the last document already exported; the export resumes right after it.
+    Ordering by creation time first means documents created later always sort after it, which
+    _id alone does not guarantee for the uuid ids of notes.
+    """
+    model, timestamp_field = EXPORTS[name]
+    filters = {}
+    if user_id:
+        filters["user_id"] = user_id
+    if client_name:
+        filters["client_name"] = client_name
+    if since:
+        filters[timestamp_field] = {"$gte": since}
+    if after:
+        timestamp, doc_id = parse_checkpoint(after)
+        filters = {"$and": [filters, {"$or": [
+            {timestamp_field: {"$gt": timestamp}},
+            {timestamp_field: timestamp, "_id": {"$gt": doc_id}},
+        ]}]}
+
+    sort = [(timestamp_field, 1), ("_id", 1)]
+    cursor = db[model.get_settings().name].find(filters).sort(sort).batch_size(batch_size)
+    async for document in cursor:
+        yield document
+
+
+async def iter_ndjson(name: str, **filters) -> AsyncIterator[str]:
+    async for document in iter_export(name, **filters):
+        yield to_ndjson_line(document)
@@ -0,0 +1,188 @@
+import os
+import re
+import math
+import logging
+from functools import lru_cache
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+
+try:
+    import tiktoken
+except ImportError:  # fall back to the character heuristic below
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the briefing prompt changes so stored LLM output is not reused for the new prompt
+PROMPT_TEMPLATE_VERSION = "2"
+
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 8192
+# Tokens kept free for the completion
+PROMPT_COMPLETION_RESERVE_TOKENS = int(os.getenv("PROMPT_COMPLETION_RESERVE_TOKENS", "1500"))
+# Optional hard cap below the model's context window, e.g. to bound cost
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "0")) or None
+# A note is truncated to fit only if at least this many tokens of it would remain
+MIN_SECTION_TOKENS = 64
+# Weight of relevance relative to recency when ranking sections
+RELEVANCE_WEIGHT = 0.5
+
+SYSTEM_MESSAGE = "You are a helpful assistant."
+TRUNCATION_MARKER = " [...]"
+_TERM_RE = re.compile(r"[a-z0-9]{4,}")
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when it is available, else with a ~4 characters per token estimate."""
+
+    def __init__(self, model: str):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except Exception:
+                try:
+                    self.encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    logger.warning(f"Could not load a tiktoken encoding, estimating token counts instead: {e}")
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return math.ceil(len(text) / 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self.encoding is not None:
+            return self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        return text[:max_tokens * 4]
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model: str) -> TokenCounter:
+    """Returns a counter per model; loading an encoding is slow, so it is done once per process."""
+    return TokenCounter(model)
+
+
+class PromptSection(BaseModel):
+    """A note, or a summary of several notes, offered to the prompt."""
+    identifier: str
+    text: str
+    timestamp: datetime
+
+
+class BuiltPrompt(BaseModel):
+    messages: List[dict]
+    token_count: int
+    budget: int
+    included: List[str] = Field(default_factory=list)
+    truncated: List[str] = Field(default_factory=list)
+    dropped: List[str] = Field(default_factory=list)
+
+
+def _terms(text: str) -> set:
+    return set(_TERM_RE.findall(text.lower()))
+
+
+class BriefingPromptBuilder:
+    """
+    Renders the briefing prompt within a per-model token budget.
+
+    Sections are ranked by recency and by how many focus terms (e.g. words from the upcoming
+    meeting's title) they mention, ties broken by timestamp then identifier, so the same input
+    always yields the same prompt. The highest ranked sections are kept whole, the first one that
+    does not fit is truncated if enough room is left, and the rest are dropped. Kept sections are
+    rendered oldest first.
+    """
+
+    def __init__(self, model: str, budget: Optional[int] = None, counter: Optional[TokenCounter] = None):
+        self.model = model
+        context = MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+        self.budget = budget or min(PROMPT_TOKEN_BUDGET or context, context - PROMPT_COMPLETION_RESERVE_TOKENS)
+        self.counter = counter or get_token_counter(model)
+
+    def render(self, client_name: str, next_meeting_date: str, notes: List[str]) -> str:
+        return f"""
+        You are an AI assistant for a consultant. Your task is to generate a research briefing for an upcoming meeting.
+        The next meeting with {client_name} is scheduled for {next_meeting_date}.
+        Here are the notes, or summaries of the notes, from previous meetings with this client, oldest first:
+        ---
+        {chr(10).join(notes)}
+        ---
+        Based on these notes, please provide the following:
+        1. A summary of the previous meetings.
+        2. A list of identified gaps or open questions.
+        3. A list of suggested talking points for the upcoming meeting, keeping in mind the goal for the next meeting.
+        Please format your response as a JSON object with the following keys: "summary", "gaps", "suggested_talking_points".
+        """
+
+    def rank(self, sections: List[PromptSection], focus_terms: Iterable[str] = ()) -> List[PromptSection]:
+        terms = set()
+        for term in focus_terms:
+            terms |= _terms(term)
+        by_age = sorted(sections, key=lambda section: (section.timestamp, section.identifier))
+        last = max(len(by_age) - 1, 1)
+
+        def score(position: int, section: PromptSection) -> float:
+            recency = position / last
+            relevance = len(terms & _terms(section.text)) / len(terms) if terms else 0.0
+            return recency + RELEVANCE_WEIGHT * relevance
+
+        scored = [(score(position, section), section) for position, section in enumerate(by_age)]
+        scored.sort(key=lambda item: (-item[0], -item[1].timestamp.timestamp(), item[1].identifier))
+        return [section for _, section in scored]
+
+    def build(
+        self,
+        client_name: str,
+        next_meeting_date: str,
+        sections: List[PromptSection],
+        focus_terms: Iterable[str] = (),
+    ) -> BuiltPrompt:
+        overhead = self.counter.count(SYSTEM_MESSAGE) + self.counter.count(self.render(client_name, next_meeting_date, []))
+        remaining = self.budget - overhead
+        kept, truncated, dropped = [], [], []
+
+        for section in self.rank(sections, focus_terms):
+            # Each section also costs the newline that joins it to the previous one
+            cost = self.counter.count(section.text) + 1
+            if cost <= remaining:
+                kept.append(section)
+                remaining -= cost
+            elif not truncated and remaining - 1 >= MIN_SECTION_TOKENS:
+                marker_tokens = self.counter.count(TRUNCATION_MARKER)
+                text = self.counter.truncate(section.text, remaining - 1 - marker_tokens) + TRUNCATION_MARKER
+                kept.append(section.model_copy(update={"text": text}))
+                truncated.append(section.identifier)
+                remaining -= self.counter.count(text) + 1
+            else:
+                dropped.append(section.identifier)
+
+        kept.sort(key=lambda section: (section.timestamp, section.identifier))
+        prompt = self.render(client_name, next_meeting_date, [section.text for section in kept])
+        messages = [
+            {"role": "system", "content": SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt},
+        ]
+        token_count = self.counter.count(SYSTEM_MESSAGE) + self.counter.count(prompt)
+        if dropped or truncated:
+            logger.info(
+                f"Prompt for {client_name} hit the {self.budget} token budget: "
+                f"{len(truncated)} section(s) truncated, {len(dropped)} dropped."
+            )
+        return BuiltPrompt(
+            messages=messages,
+            token_count=token_count,
+            budget=self.budget,
+            included=[section.identifier for section in kept],
+            truncated=truncated,
+            dropped=dropped,
+        )
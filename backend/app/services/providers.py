@@ -0,0 +1,120 @@
+import os
+import logging
+from typing import AsyncIterator, List, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.metrics import ProviderCall, count_tokens
+
+logger = logging.getLogger(__name__)
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Connection pool shared by every provider call made from this process
+PROVIDER_MAX_CONNECTIONS = int(os.getenv("PROVIDER_MAX_CONNECTIONS", "100"))
+PROVIDER_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PROVIDER_MAX_KEEPALIVE_CONNECTIONS", "20"))
+PROVIDER_TIMEOUT_SECONDS = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "120"))
+
+
+class CompletionProvider:
+    """Async chat completions backed by a long-lived, pooled OpenAI client."""
+
+    def __init__(self, client: AsyncOpenAI, model: str = OPENAI_MODEL):
+        self.client = client
+        self.model = model
+
+    async def complete(self, messages: List[dict], model: Optional[str] = None) -> str:
+        with ProviderCall("openai", "complete"):
+            response = await self.client.chat.completions.create(
+                model=model or self.model,
+                messages=messages,
+            )
+        count_tokens(model or self.model, response.usage)
+        return response.choices[0].message.content
+
+    async def stream(self, messages: List[dict], model: Optional[str] = None) -> AsyncIterator[str]:
+        """Yields the completion's content as the model produces it."""
+        with ProviderCall("openai", "stream"):
+            response = await self.client.chat.completions.create(
+                model=model or self.model,
+                messages=messages,
+                stream=True,
+                # The last chunk then carries the token usage, with no choices
+                stream_options={"include_usage": True},
+            )
+            async for chunk in response:
+                if chunk.usage is not None:
+                    count_tokens(model or self.model, chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def aclose(self):
+        await self.client.close()
+
+
+class SearchProvider:
+    """Async Tavily web search over a shared, pooled HTTP client."""
+
+    def __init__(self, http_client: httpx.AsyncClient, api_key: Optional[str]):
+        self.http_client = http_client
+        self.api_key = api_key
+
+    async def search(self, query: str, **params) -> dict:
+        with ProviderCall("tavily", "search"):
+            response = await self.http_client.post(
+                TAVILY_SEARCH_URL,
+                json={"query": query, **params},
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+            response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self.http_client.aclose()
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """A pooled HTTP client sized by the PROVIDER_* settings."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=PROVIDER_MAX_CONNECTIONS,
+            max_keepalive_connections=PROVIDER_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(PROVIDER_TIMEOUT_SECONDS),
+    )
+
+
+_completion_provider: Optional[CompletionProvider] = None
+_search_provider: Optional[SearchProvider] = None
+
+
+def get_completion_provider() -> CompletionProvider:
+    """Returns the process-wide completion provider, creating it on first use."""
+    global _completion_provider
+    if _completion_provider is None:
+        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=build_http_client())
+        _completion_provider = CompletionProvider(client)
+        logger.info("Created shared OpenAI completion provider.")
+    return _completion_provider
+
+
+def get_search_provider() -> SearchProvider:
+    """Returns the process-wide search provider, creating it on first use."""
+    global _search_provider
+    if _search_provider is None:
+        _search_provider = SearchProvider(build_http_client(), os.getenv("TAVILY_API_KEY"))
+        logger.info("Created shared Tavily search provider.")
+    return _search_provider
+
+
+async def close_providers():
+    """Closes the shared provider clients and their connection pools."""
+    global _completion_provider, _search_provider
+    if _completion_provider is not None:
+        await _completion_provider.aclose()
+        _completion_provider = None
+    if _search_provider is not None:
+        await _search_provider.aclose()
+        _search_provider = None
@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.metrics import count_cache
+
+logger = logging.getLogger(__name__)
+
+RESEARCH_CACHE_BACKEND = os.getenv("RESEARCH_CACHE_BACKEND", "memory")  # "memory" or "redis"
+RESEARCH_CACHE_TTL_SECONDS = int(os.getenv("RESEARCH_CACHE_TTL_SECONDS", "21600"))
+RESEARCH_CACHE_MAX_ENTRIES = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "1000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def research_cache_key(client_name: str, query: str) -> str:
+    return f"{_normalize(client_name)}|{_normalize(query)}"
+
+
+class InMemoryResearchBackend:
+    """Process-local LRU store whose entries expire after the TTL."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisResearchBackend:
+    """Redis store shared by every API and worker process.
+
+    Entries expire through Redis TTLs; a sorted set of insertion times keeps the
+    number of entries under `max_entries` by evicting the oldest ones.
+    """
+
+    PREFIX = "research_cache:"
+    INDEX_KEY = "research_cache:index"
+
+    def __init__(self, redis_url: str, ttl_seconds: int, max_entries: int):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(redis_url)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self.redis.get(self.PREFIX + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict):
+        now = time.time()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(self.PREFIX + key, json.dumps(value), ex=self.ttl_seconds)
+            pipe.zadd(self.INDEX_KEY, {key: now})
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", now - self.ttl_seconds)
+            pipe.zcard(self.INDEX_KEY)
+            *_, size = await pipe.execute()
+
+        excess = size - self.max_entries
+        if excess > 0:
+            evicted = await self.redis.zrange(self.INDEX_KEY, 0, excess - 1)
+            if evicted:
+                await self.redis.delete(*[self.PREFIX + k.decode() for k in evicted])
+                await self.redis.zrem(self.INDEX_KEY, *evicted)
+
+    async def size(self) -> int:
+        return await self.redis.zcard(self.INDEX_KEY)
+
+
+class ResearchCache:
+    """
+    Caches external research results keyed by normalized client name and query.
+    Concurrent misses for the same key share a single fetch. Backend errors are
+    logged and treated as misses so the cache never fails a briefing.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def get_or_fetch(self, client_name: str, query: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        key = research_cache_key(client_name, query)
+        try:
+            cached = await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            count_cache("research", "error")
+            logger.warning(f"Research cache read failed for '{key}': {e}")
+            cached = None
+        if cached is not None:
+            self.hits += 1
+            count_cache("research", "hit")
+            return cached
+
+        self.misses += 1
+        count_cache("research", "miss")
+        while key in self._in_flight:
+            in_flight = self._in_flight[key]
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise  # this waiter itself was cancelled
+                # The fetch's owner was cancelled; fetch again (or wait for whoever now does)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            # Waiters see the cancelled future and fetch themselves instead of hanging
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; don't warn if there are none
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._in_flight[key]
+
+        try:
+            await self.backend.set(key, result)
+        except Exception as e:
+            self.errors += 1
+            count_cache("research", "error")
+            logger.warning(f"Research cache write failed for '{key}': {e}")
+        return result
+
+    async def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        try:
+            size = await self.backend.size()
+        except Exception:
+            size = None
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+        }
+
+
+_research_cache: Optional[ResearchCache] = None
+
+
+def get_research_cache() -> ResearchCache:
+    """Returns the process-wide research cache, using the backend selected by RESEARCH_CACHE_BACKEND."""
+    global _research_cache
+    if _research_cache is None:
+        if RESEARCH_CACHE_BACKEND == "redis":
+            backend = RedisResearchBackend(REDIS_URL, RESEARCH_CACHE_TTL_SECONDS, RESEARCH_CACHE_MAX_ENTRIES)
+        else:
+            backend = InMemoryResearchBackend(RESEARCH_CACHE_TTL_SECONDS, RESEARCH_CACHE_MAX_ENTRIES)
+        _research_cache = ResearchCache(backend)
+    return _research_cache
@@ -0,0 +1,132 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.db.note_summary_repository import get_chunk_summaries, save_chunk_summary
+from app.schemas.meeting_note import MeetingNoteContent
+from app.models.note_summary import NoteChunkSummary
+from app.services.prompt_builder import PromptSection
+from app.services.providers import CompletionProvider
+from app.core.metrics import count_cache
+
+logger = logging.getLogger(__name__)
+
+# Number of notes (or summaries, at higher levels) condensed into one summary
+NOTE_CHUNK_SIZE = int(os.getenv("NOTE_CHUNK_SIZE", "8"))
+# Maximum number of chunk summaries requested from the LLM at the same time
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+# Bump whenever the chunk prompt changes so stored summaries are regenerated
+CHUNK_SUMMARY_VERSION = "1"
+
+
+def _chunks(items: list, size: int) -> List[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _chunk_key(level: int, parts: list, model: str) -> str:
+    payload = {"level": level, "parts": parts, "model": model, "version": CHUNK_SUMMARY_VERSION}
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+class HierarchicalSummarizer:
+    """
+    Condenses a long note history into a few summaries for the final briefing prompt.
+
+    Notes are ordered oldest first and split into fixed-size chunks, so new notes only ever
+    change the last chunk. Each chunk is summarized once and stored under a key derived from
+    the notes it covers; when there are still too many summaries, they are chunked and
+    summarized again one level up. Only chunks without a stored summary reach the LLM.
+    """
+
+    def __init__(self, completion_provider: CompletionProvider, chunk_size: Optional[int] = None):
+        self.completion_provider = completion_provider
+        self.chunk_size = chunk_size or NOTE_CHUNK_SIZE
+        self._semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    async def condense(self, user_id: str, client_name: str, notes: List[MeetingNoteContent]) -> List[PromptSection]:
+        """Returns the sections the final prompt should embed: the notes themselves when they fit, else summaries."""
+        notes = sorted(notes, key=lambda note: (note.meeting_date, note.createdAt, str(note.id)))
+        if len(notes) <= self.chunk_size:
+            return [
+                PromptSection(identifier=str(note.id), text=note.content, timestamp=note.meeting_date)
+                for note in notes
+            ]
+
+        model = self.completion_provider.model
+        # Items are (identity, text, ids of the notes covered, latest meeting date covered); a note's
+        # identity is its id and version, a summary's identity is its chunk key
+        items: List[Tuple[object, str, List[str], datetime]] = [
+            (
+                [str(note.id), note.updatedAt.isoformat()],
+                f"[{note.meeting_date.date().isoformat()}] {note.content}",
+                [str(note.id)],
+                note.meeting_date,
+            )
+            for note in notes
+        ]
+        level = 0
+        while len(items) > self.chunk_size:
+            chunks = _chunks(items, self.chunk_size)
+            keys = [_chunk_key(level, [identity for identity, _, _, _ in chunk], model) for chunk in chunks]
+            items = await self._summarize_level(user_id, client_name, level, keys, chunks)
+            level += 1
+        return [
+            PromptSection(identifier=str(identity), text=text, timestamp=latest)
+            for identity, text, _, latest in items
+        ]
+
+    async def _summarize_level(
+        self, user_id: str, client_name: str, level: int, keys: List[str], chunks: List[list]
+    ) -> List[Tuple[object, str, List[str], datetime]]:
+        stored = await get_chunk_summaries(keys)
+        missing = [i for i, key in enumerate(keys) if key not in stored]
+        count_cache("chunk_summary", "hit", len(keys) - len(missing))
+        count_cache("chunk_summary", "miss", len(missing))
+        logger.info(
+            f"Level {level} for {client_name}: {len(keys) - len(missing)} chunk summaries reused, {len(missing)} to generate."
+        )
+
+        async def summarize(i: int):
+            note_ids = [note_id for _, _, ids, _ in chunks[i] for note_id in ids]
+            text = await self._summarize_chunk(client_name, level, [text for _, text, _, _ in chunks[i]])
+            await save_chunk_summary(NoteChunkSummary(
+                key=keys[i],
+                user_id=user_id,
+                client_name=client_name,
+                level=level,
+                note_ids=note_ids,
+                summary=text,
+                model=self.completion_provider.model,
+            ))
+            stored[keys[i]] = text
+
+        await asyncio.gather(*(summarize(i) for i in missing))
+        return [
+            (
+                key,
+                stored[key],
+                [note_id for _, _, ids, _ in chunk for note_id in ids],
+                max(latest for _, _, _, latest in chunk),
+            )
+            for key, chunk in zip(keys, chunks)
+        ]
+
+    async def _summarize_chunk(self, client_name: str, level: int, texts: List[str]) -> str:
+        source = "meeting notes" if level == 0 else "summaries of earlier meetings"
+        prompt = f"""
+        Condense the following {source} with {client_name} into one summary of at most 200 words.
+        Keep decisions, commitments, open questions, dates and names; drop small talk.
+        ---
+        {chr(10).join(texts)}
+        ---
+        Respond with the summary text only.
+        """
+        async with self._semaphore:
+            return await self.completion_provider.complete([
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt},
+            ])
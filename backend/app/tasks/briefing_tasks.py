@@ -1,9 +1,55 @@
+import os
+import asyncio
+import logging
+from typing import List, Optional
 from app.tasks.worker import celery_app
+from app.tasks.runtime import run_coroutine
 from app.services.agent_service import AgentService
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Briefings generated at once by one generate_briefings_batch_task
+WORKER_BRIEFING_CONCURRENCY = int(os.getenv("WORKER_BRIEFING_CONCURRENCY", "8"))
+
+def _briefing_id(briefing) -> Optional[str]:
+    return str(briefing.id) if briefing else None
+
 @celery_app.task(name="generate_briefing_task")
 def generate_briefing_task(user_id: str, client_name: str, meeting_date: str):
     agent_service = AgentService()
     meeting_datetime = datetime.fromisoformat(meeting_date)
-    agent_service.generate_briefing(user_id, client_name, meeting_datetime)
\ No newline at end of file
+    briefing = run_coroutine(agent_service.generate_briefing(user_id, client_name, meeting_datetime))
+    return _briefing_id(briefing)
+
+@celery_app.task(name="generate_briefings_batch_task")
+def generate_briefings_batch_task(meetings: List[dict]):
+    """
+    Generates the briefings for several meetings, each a dict with user_id, client_name and
+    meeting_date, WORKER_BRIEFING_CONCURRENCY at a time within this one task. Queued by the
+    meeting sweep (app/tasks/scheduler.py). A failed meeting is logged and does not stop the others.
+    """
+    return run_coroutine(_generate_briefings(meetings), timeout=None)
+
+async def _generate_briefings(meetings: List[dict]) -> List[Optional[str]]:
+    agent_service = AgentService()
+    semaphore = asyncio.Semaphore(WORKER_BRIEFING_CONCURRENCY)
+
+    async def generate(meeting: dict):
+        async with semaphore:
+            try:
+                briefing = await agent_service.generate_briefing(
+                    meeting["user_id"], meeting["client_name"], datetime.fromisoformat(meeting["meeting_date"])
+                )
+            except Exception as e:
+                logger.error(f"Briefing for {meeting['client_name']} of user {meeting['user_id']} failed: {e}", exc_info=True)
+                return None
+            return _briefing_id(briefing)
+
+    return await asyncio.gather(*(generate(meeting) for meeting in meetings))
+
+@celery_app.task(name="run_briefing_job_task")
+def run_briefing_job_task(job_id: str):
+    from app.services.briefing_jobs import briefing_job_service
+
+    run_coroutine(briefing_job_service.run(job_id), timeout=None)
@@ -0,0 +1,116 @@
+import os
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+# Seconds a task waits for its coroutine before giving up on it
+WORKER_TASK_TIMEOUT_SECONDS = float(os.getenv("WORKER_TASK_TIMEOUT_SECONDS", "900"))
+
+
+class WorkerRuntime:
+    """
+    The asyncio side of a Celery worker process.
+
+    Celery tasks are synchronous, while the app's data and provider layers are async and bound to
+    the event loop they first run on. Each worker process therefore keeps one event loop running
+    in a background thread for its whole life: MongoDB/Beanie and the LLM, search and calendar
+    clients are initialized on it once at boot, and every task submits its coroutine to it with
+    run(). Because the loop is shared, tasks executed by a thread pool (celery worker -P threads)
+    run their coroutines concurrently on the same connection pools, so one process can have many
+    LLM calls in flight.
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        # Held through startup so no task runs before the database is initialized
+        with self._lock:
+            if self.loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="worker-event-loop", daemon=True)
+            thread.start()
+            asyncio.run_coroutine_threadsafe(self._startup(), loop).result()
+            self.loop, self._thread = loop, thread
+        logger.info(f"Worker runtime started in process {os.getpid()}.")
+
+    async def _startup(self):
+        from app.db.database import connect_to_mongo
+        from app.services.providers import get_completion_provider, get_search_provider
+        from app.services.calendar_client import get_calendar_client
+
+        await connect_to_mongo()
+        for create_client in (get_completion_provider, get_search_provider, get_calendar_client):
+            try:
+                create_client()
+            except Exception as e:
+                # The client is created again on first use; the task that needs it reports the error
+                logger.warning(f"Could not create a client at worker startup: {e}")
+
+    async def _shutdown(self):
+        from app.db.database import close_mongo_connection
+        from app.services.providers import close_providers
+        from app.services.calendar_client import close_calendar_client
+
+        await close_providers()
+        await close_calendar_client()
+        await close_mongo_connection()
+
+    def run(self, awaitable: Awaitable, timeout: Optional[float] = WORKER_TASK_TIMEOUT_SECONDS) -> Any:
+        """Runs a coroutine on the process's event loop, starting the runtime on first use, and returns its result."""
+        loop = self.loop
+        if loop is None:
+            self.start()
+            loop = self.loop
+        # The loop thread does not see this thread's context, so the task's query stats are passed in
+        from celery import current_task
+        from app.db.monitoring import with_query_stats
+
+        stats = getattr(current_task.request, "query_stats", None) if current_task else None
+        if stats is not None:
+            awaitable = with_query_stats(awaitable, stats)
+        future = asyncio.run_coroutine_threadsafe(awaitable, loop)
+        try:
+            return future.result(timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    def stop(self):
+        with self._lock:
+            loop, thread = self.loop, self._thread
+            self.loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(30)
+        except Exception as e:
+            logger.warning(f"Worker runtime shutdown failed: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+runtime = WorkerRuntime()
+
+
+def run_coroutine(awaitable: Awaitable, timeout: Optional[float] = WORKER_TASK_TIMEOUT_SECONDS) -> Any:
+    return runtime.run(awaitable, timeout)
+
+
+@worker_process_init.connect
+def _start_runtime(**kwargs):
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _stop_runtime(**kwargs):
+    runtime.stop()
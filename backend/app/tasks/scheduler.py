@@ -1,38 +1,154 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from typing import List
+
 from celery.schedules import crontab
-from app.tasks.worker import celery_app
+from app.tasks.worker import celery_app, REDIS_URL
+from app.tasks.runtime import run_coroutine
 from app.services.calendar_service import GoogleCalendarService
 from app.db.repository import UserRepository
-from app.tasks.briefing_tasks import generate_briefing_task
+from app.db.calendar_event_repository import parse_event_start
+from app.tasks.briefing_tasks import generate_briefings_batch_task
 from app.db.briefing_repository import get_briefing_for_meeting
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
+# Users per shard task
+MEETING_SWEEP_SHARD_SIZE = int(os.getenv("MEETING_SWEEP_SHARD_SIZE", "200"))
+# Users whose meetings are checked at once within a shard
+MEETING_SWEEP_CONCURRENCY = int(os.getenv("MEETING_SWEEP_CONCURRENCY", "20"))
+# Briefings a shard hands to one generate_briefings_batch_task, which runs them concurrently
+MEETING_SWEEP_BRIEFING_BATCH_SIZE = int(os.getenv("MEETING_SWEEP_BRIEFING_BATCH_SIZE", "16"))
+MEETING_SWEEP_LOOKAHEAD = timedelta(hours=1)
+# Run stats are kept in Redis for a week
+MEETING_SWEEP_STATS_TTL_SECONDS = 7 * 24 * 3600
+
+_redis = None
+
+def _get_redis():
+    """Created on first use, so processes that only import the tasks (e.g. the API) open no connection."""
+    global _redis
+    if _redis is None:
+        import redis
+
+        _redis = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+    return _redis
+
 @celery_app.on_after_configure.connect
 def setup_periodic_tasks(sender, **kwargs):
     sender.add_periodic_task(
-        crontab(hour='*'),  # Run every hour
+        crontab(minute=0),  # Run every hour
         check_for_upcoming_meetings.s(),
     )
 
-@celery_app.task
-async def check_for_upcoming_meetings():
-    user_repo = UserRepository()
-    users = await user_repo.get_all_users()
-    calendar_service = GoogleCalendarService()
-
-    for user in users:
-        if user.google_calendar_credentials:
-            upcoming_meetings = await calendar_service.get_upcoming_meetings(user)
-            for meeting in upcoming_meetings:
-                meeting_start = datetime.fromisoformat(meeting['start']['dateTime'])
-                if datetime.utcnow() < meeting_start < datetime.utcnow() + timedelta(hours=1):
-                    existing_briefing = await get_briefing_for_meeting(
-                        user_id=str(user.id),
-                        client_name=meeting['summary'],
-                        meeting_date=meeting['start']['dateTime']
-                    )
-                    if not existing_briefing:
-                        generate_briefing_task.delay(
-                            user_id=str(user.id),
-                            client_name=meeting['summary'],
-                            meeting_date=meeting['start']['dateTime']
-                        )
\ No newline at end of file
+def _stats_key(run_id: str) -> str:
+    return f"meeting-sweep:{run_id}"
+
+@celery_app.task(name="check_for_upcoming_meetings")
+def check_for_upcoming_meetings():
+    """
+    Starts the hourly meeting sweep: splits the users with a connected calendar into shards of
+    MEETING_SWEEP_SHARD_SIZE and queues one sweep_meeting_shard task per shard. The sweep of an
+    hour is claimed with SET NX on a key named after the hour, so when several beat instances
+    fire, only the first one sweeps.
+    """
+    slot = datetime.utcnow().strftime("%Y%m%d%H")
+    run_id = f"{slot}-{uuid.uuid4().hex[:8]}"
+    if not _get_redis().set(f"meeting-sweep-lock:{slot}", run_id, nx=True, ex=2 * 3600):
+        logger.info(f"Meeting sweep for {slot} was already started by another scheduler, skipping.")
+        return None
+
+    user_ids = run_coroutine(UserRepository().get_calendar_user_ids())
+    shards = [user_ids[i:i + MEETING_SWEEP_SHARD_SIZE] for i in range(0, len(user_ids), MEETING_SWEEP_SHARD_SIZE)]
+    key = _stats_key(run_id)
+    _get_redis().hset(key, mapping={"users": len(user_ids), "shards": len(shards), "started_at": time.time()})
+    _get_redis().expire(key, MEETING_SWEEP_STATS_TTL_SECONDS)
+    for shard in shards:
+        sweep_meeting_shard.delay(run_id, shard)
+    logger.info(f"Meeting sweep {run_id} queued {len(shards)} shard(s) for {len(user_ids)} user(s).")
+    return run_id
+
+@celery_app.task(name="sweep_meeting_shard")
+def sweep_meeting_shard(run_id: str, user_ids: List[str]):
+    started = time.monotonic()
+    counts = run_coroutine(_sweep_users(user_ids))
+    _record_shard(run_id, counts, time.monotonic() - started)
+    return counts
+
+async def _sweep_users(user_ids: List[str]) -> dict:
+    """
+    Queues a briefing for each meeting starting within the hour that does not have one yet, in
+    batches of MEETING_SWEEP_BRIEFING_BATCH_SIZE per generate_briefings_batch_task.
+    """
+    counts = {"users_done": 0, "meetings": 0, "briefings_queued": 0, "failures": 0}
+    pending: List[dict] = []
+    users = await UserRepository().get_users_by_ids(user_ids)
+    meetings_by_user = await GoogleCalendarService().get_upcoming_meetings_for_users(
+        users, within=MEETING_SWEEP_LOOKAHEAD
+    )
+    semaphore = asyncio.Semaphore(MEETING_SWEEP_CONCURRENCY)
+
+    async def sweep_user(user_id: str, meetings: list):
+        async with semaphore:
+            for meeting in meetings:
+                # All-day events have no start time to brief ahead of
+                if 'dateTime' not in meeting['start']:
+                    continue
+                counts["meetings"] += 1
+                # Naive UTC, the way briefings store meeting_date
+                meeting_date = parse_event_start(meeting['start'])
+                client_name = meeting.get('summary', '').strip()
+                existing_briefing = await get_briefing_for_meeting(
+                    user_id=user_id,
+                    client_name=client_name,
+                    meeting_date=meeting_date,
+                )
+                if not existing_briefing:
+                    pending.append({
+                        "user_id": user_id,
+                        "client_name": client_name,
+                        "meeting_date": meeting_date.isoformat(),
+                    })
+
+    results = await asyncio.gather(
+        *(sweep_user(str(user.id), meetings_by_user.get(str(user.id), [])) for user in users),
+        return_exceptions=True,
+    )
+    for user, result in zip(users, results):
+        if isinstance(result, Exception):
+            counts["failures"] += 1
+            logger.error(f"Meeting sweep failed for user {user.id}: {result}")
+    for i in range(0, len(pending), MEETING_SWEEP_BRIEFING_BATCH_SIZE):
+        generate_briefings_batch_task.delay(pending[i:i + MEETING_SWEEP_BRIEFING_BATCH_SIZE])
+    counts["briefings_queued"] = len(pending)
+    counts["users_done"] = len(users) - counts["failures"]
+    return counts
+
+def _record_shard(run_id: str, counts: dict, seconds: float):
+    """Adds a shard's counts to its run's stats, and logs the run's throughput once its last shard is done."""
+    key = _stats_key(run_id)
+    pipeline = _get_redis().pipeline()
+    for field, value in counts.items():
+        pipeline.hincrby(key, field, value)
+    pipeline.hincrbyfloat(key, "shard_seconds", seconds)
+    pipeline.hincrby(key, "shards_done", 1)
+    pipeline.hgetall(key)
+    stats = pipeline.execute()[-1]
+    if int(stats.get("shards_done", 0)) < int(stats.get("shards", 0)):
+        return
+    elapsed = time.time() - float(stats["started_at"])
+    _get_redis().hset(key, "finished_at", time.time())
+    users = int(stats.get("users_done", 0))
+    logger.info(
+        f"Meeting sweep {run_id} finished in {elapsed:.1f}s: {users} user(s) ({users / max(elapsed, 1e-6):.1f}/s), "
+        f"{stats.get('meetings', 0)} meeting(s), {stats.get('briefings_queued', 0)} briefing(s) queued, "
+        f"{stats.get('failures', 0)} failure(s)."
+    )
+
+def get_sweep_stats(run_id: str) -> dict:
+    """The counts recorded for a sweep run: users, shards, shards_done, meetings, briefings_queued, failures, timings."""
+    return _get_redis().hgetall(_stats_key(run_id))
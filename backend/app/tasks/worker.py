@@ -1,11 +1,59 @@
+import os
+import time
+import logging
+from typing import Dict
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown
+from app.core.metrics import CELERY_TASK_SECONDS, mark_process_dead, serve_metrics
+from app.db.monitoring import QueryStats, record_scope
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Port the worker serves its metrics on, behind the METRICS_TOKEN bearer check; unset when the
+# API's /metrics reads the workers' multiprocess files
+CELERY_METRICS_PORT = os.getenv("CELERY_METRICS_PORT")
 
 celery_app = Celery(
     "tasks",
-    broker="redis://localhost:6379/0",
-    backend="redis://localhost:6379/0",
+    broker=REDIS_URL,
+    backend=REDIS_URL,
     include=["app.tasks.briefing_tasks", "app.tasks.scheduler"],
 )
 
+_task_started: Dict[str, float] = {}
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    # The coroutines the task runs count their MongoDB commands here (see WorkerRuntime.run)
+    task.request.query_stats = QueryStats(f"task {task.name}")
+
+
+@task_postrun.connect
+def _observe_task(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_SECONDS.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+    stats = getattr(task.request, "query_stats", None)
+    if stats is not None:
+        record_scope(stats)
+
+
+@worker_init.connect
+def _serve_metrics(**kwargs):
+    if not CELERY_METRICS_PORT:
+        return
+    # Runs in the main worker process; with PROMETHEUS_MULTIPROC_DIR set it aggregates the pool processes
+    serve_metrics(int(CELERY_METRICS_PORT))
+    logger.info(f"Serving worker metrics on port {CELERY_METRICS_PORT}.")
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_dead(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+
 if __name__ == "__main__":
-    celery_app.start()
\ No newline at end of file
+    celery_app.start()
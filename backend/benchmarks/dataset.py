@@ -0,0 +1,96 @@
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, Field
+
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.models.client import Client
+from app.models.meeting_note import MeetingNote
+
+SEED_BATCH_SIZE = 1000
+BENCHMARK_PASSWORD = "benchmark-password"
+
+_TOPICS = [
+    "pricing", "renewal", "onboarding", "integration", "security review", "roadmap", "budget",
+    "procurement", "pilot", "migration", "support", "hiring", "expansion", "compliance", "training",
+]
+_WORDS = (
+    "the team agreed to follow up on the proposal and share numbers before the next review while "
+    "finance wants a clearer breakdown of costs and timelines for the rollout across regions"
+).split()
+
+
+class Dataset(BaseModel):
+    """What seed_dataset stored: the users and, per notes-per-client tier, the (user id, client name) pairs."""
+    user_ids: List[str] = Field(default_factory=list)
+    emails: List[str] = Field(default_factory=list)
+    tiers: Dict[int, List[Tuple[str, str]]] = Field(default_factory=dict)
+
+    def clients_by_user(self) -> Dict[str, List[str]]:
+        clients: Dict[str, List[str]] = {}
+        for pairs in self.tiers.values():
+            for user_id, client_name in pairs:
+                clients.setdefault(user_id, []).append(client_name)
+        return clients
+
+    def email_of(self, user_id: str) -> str:
+        return self.emails[self.user_ids.index(user_id)]
+
+
+def _note_text(rng: random.Random, client_name: str, meeting_date: datetime) -> str:
+    topic = rng.choice(_TOPICS)
+    body = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(80, 220)))
+    text = f"Meeting with {client_name} on {meeting_date:%b %d, %Y} about {topic}. {body}."
+    if rng.random() < 0.2:
+        text += f" Next meeting on {meeting_date + timedelta(days=14):%b %d, %Y}."
+    return text
+
+
+async def _insert(model, documents: list):
+    for i in range(0, len(documents), SEED_BATCH_SIZE):
+        await model.insert_many(documents[i:i + SEED_BATCH_SIZE])
+
+
+async def seed_dataset(users: int, clients_per_tier: int, notes_per_client: List[int], seed: int = 42) -> Dataset:
+    """
+    Stores `users` users and, for every notes-per-client tier, `clients_per_tier` clients with
+    that many notes each, one day apart and ending today. Clients are spread round robin over
+    the users. The same arguments always produce the same names and note texts.
+    """
+    rng = random.Random(seed)
+    hashed_password = await get_password_hash(BENCHMARK_PASSWORD)
+    user_docs = [
+        User(email=f"bench-user-{i}@example.com", name=f"Benchmark User {i}", hashed_password=hashed_password)
+        for i in range(users)
+    ]
+    for user in user_docs:
+        await user.insert()  # one by one, as insert_many does not set the ids on the documents
+    dataset = Dataset(user_ids=[str(user.id) for user in user_docs], emails=[user.email for user in user_docs])
+
+    today = datetime.utcnow().replace(hour=10, minute=0, second=0, microsecond=0)
+    clients, notes = [], []
+    slot = 0
+    for tier in notes_per_client:
+        pairs = []
+        for i in range(clients_per_tier):
+            user_id = dataset.user_ids[slot % users]
+            slot += 1
+            client_name = f"Client {tier}-{i}"
+            clients.append(Client(name=client_name, description=f"{tier} notes", created_by=user_id, members=[user_id]))
+            for n in range(tier):
+                meeting_date = today - timedelta(days=tier - n)
+                notes.append(MeetingNote(
+                    user_id=user_id,
+                    client_name=client_name,
+                    meeting_date=meeting_date,
+                    content=_note_text(rng, client_name, meeting_date),
+                    createdAt=meeting_date,
+                    updatedAt=meeting_date,
+                ))
+            pairs.append((user_id, client_name))
+        dataset.tiers[tier] = pairs
+    await _insert(Client, clients)
+    await _insert(MeetingNote, notes)
+    return dataset
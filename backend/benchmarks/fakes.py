@@ -0,0 +1,135 @@
+import json
+import random
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.models.user import User
+from app.services.providers import CompletionProvider, SearchProvider
+
+
+class Latency:
+    """A deterministic latency: `mean_ms` give or take up to `jitter_ms`, drawn from a seeded generator."""
+
+    def __init__(self, mean_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+
+    async def wait(self):
+        delay_ms = self.mean_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        # sleep(0) still yields to the loop, as a real network call would
+        await asyncio.sleep(max(delay_ms, 0.0) / 1000)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()[:8]
+
+
+class FakeCompletionProvider(CompletionProvider):
+    """
+    Stands in for the OpenAI provider. Chunk summaries are answered with plain text and briefing
+    prompts with the briefing JSON, both derived from a hash of the prompt, after `latency`.
+    Streams are sent in `stream_chunk_chars` pieces, `token_latency` apart.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[Latency] = None,
+        token_latency: Optional[Latency] = None,
+        model: str = "benchmark-model",
+        stream_chunk_chars: int = 16,
+    ):
+        super().__init__(client=None, model=model)
+        self.latency = latency or Latency()
+        self.token_latency = token_latency or Latency()
+        self.stream_chunk_chars = stream_chunk_chars
+        self.calls = 0
+
+    def _answer(self, messages: List[dict]) -> str:
+        prompt = messages[-1]["content"]
+        digest = _digest(prompt)
+        if "Respond with the summary text only" in prompt:
+            return f"Summary {digest}: decisions, commitments and open questions of these meetings. " * 4
+        return json.dumps({
+            "summary": f"Briefing {digest}. The client is expanding and wants a proposal before the next meeting. " * 3,
+            "gaps": [f"Gap {i} ({digest})" for i in range(3)],
+            "suggested_talking_points": [f"Talking point {i} ({digest})" for i in range(5)],
+        })
+
+    async def complete(self, messages: List[dict], model: Optional[str] = None) -> str:
+        self.calls += 1
+        await self.latency.wait()
+        return self._answer(messages)
+
+    async def stream(self, messages: List[dict], model: Optional[str] = None) -> AsyncIterator[str]:
+        self.calls += 1
+        await self.latency.wait()
+        content = self._answer(messages)
+        for i in range(0, len(content), self.stream_chunk_chars):
+            await self.token_latency.wait()
+            yield content[i:i + self.stream_chunk_chars]
+
+    async def aclose(self):
+        pass
+
+
+class FakeSearchProvider(SearchProvider):
+    """Stands in for Tavily: `results` deterministic results per query after `latency`."""
+
+    def __init__(self, latency: Optional[Latency] = None, results: int = 5):
+        super().__init__(http_client=None, api_key=None)
+        self.latency = latency or Latency()
+        self.results = results
+        self.calls = 0
+
+    async def search(self, query: str, **params) -> dict:
+        self.calls += 1
+        await self.latency.wait()
+        digest = _digest(query)
+        return {
+            "query": query,
+            "results": [
+                {
+                    "title": f"Result {i} for {query}",
+                    "url": f"https://example.com/{digest}/{i}",
+                    "content": f"News item {i} ({digest}) about the company's latest quarter and hiring plans. " * 5,
+                    "score": 1.0 - i / 10,
+                }
+                for i in range(self.results)
+            ],
+        }
+
+    async def aclose(self):
+        pass
+
+
+class FakeCalendarService:
+    """
+    Stands in for GoogleCalendarService in AgentService: every user has one meeting a day with
+    each of their clients, returned after `latency`.
+    """
+
+    def __init__(self, clients_by_user: Dict[str, List[str]], latency: Optional[Latency] = None):
+        self.clients_by_user = clients_by_user
+        self.latency = latency or Latency()
+        self.calls = 0
+
+    async def get_upcoming_meetings(self, user: User, limit: Optional[int] = None, within: Optional[timedelta] = None):
+        self.calls += 1
+        await self.latency.wait()
+        start = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        events = []
+        for i, client_name in enumerate(self.clients_by_user.get(str(user.id), [])):
+            event_start = start + timedelta(days=i)
+            if within is not None and event_start > datetime.utcnow() + within:
+                break
+            events.append({
+                "id": f"event-{_digest(str(user.id) + client_name)}",
+                "status": "confirmed",
+                "summary": f"Meeting with {client_name}",
+                "start": {"dateTime": event_start.isoformat() + "Z"},
+                "end": {"dateTime": (event_start + timedelta(hours=1)).isoformat() + "Z"},
+            })
+        return events[:limit] if limit else events
@@ -0,0 +1,128 @@
+import json
+import time
+import asyncio
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.services.bulk_runner import percentile
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# A call returns the stage timings (ms) it recorded, or None
+Call = Callable[[int], Awaitable[Optional[Dict[str, float]]]]
+Setup = Callable[[int], Awaitable[None]]
+
+
+class Measurement(BaseModel):
+    name: str
+    iterations: int
+    concurrency: int
+    throughput_per_second: float
+    latency_ms: Dict[str, float]  # p50, p95, p99, mean and max
+    peak_memory_kb: float  # traced Python allocations during one extra call
+    stages_ms: Dict[str, Dict[str, float]] = Field(default_factory=dict)  # stage -> p50 and p95
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "max": max(samples, default=0.0),
+    }
+
+
+async def measure(name: str, call: Call, iterations: int, concurrency: int = 1, setup: Optional[Setup] = None) -> Measurement:
+    """
+    Runs call(0) .. call(iterations - 1) on `concurrency` workers and reports throughput, latency
+    percentiles and the percentiles of the stage timings the calls return. `setup(i)` runs before
+    call(i) and is not timed. Memory is measured on one more call, since tracing allocations
+    would slow down the timed ones.
+    """
+    latencies: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    next_index = iter(range(iterations))
+
+    async def worker():
+        for i in next_index:
+            if setup is not None:
+                await setup(i)
+            started = time.perf_counter()
+            timings = await call(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            for stage, ms in (timings or {}).items():
+                stages.setdefault(stage, []).append(ms)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if setup is not None:
+        await setup(iterations)
+    tracemalloc.start()
+    try:
+        await call(iterations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        name=name,
+        iterations=iterations,
+        concurrency=concurrency,
+        throughput_per_second=iterations / elapsed if elapsed else 0.0,
+        latency_ms=_summarize(latencies),
+        peak_memory_kb=peak / 1024,
+        stages_ms={stage: {"p50": percentile(v, 50), "p95": percentile(v, 95)} for stage, v in sorted(stages.items())},
+    )
+
+
+def save_baseline(label: str, measurements: List[Measurement], settings: dict) -> Path:
+    BASELINE_DIR.mkdir(exist_ok=True)
+    path = BASELINE_DIR / f"{label}.json"
+    with open(path, "w") as f:
+        json.dump({"settings": settings, "measurements": [m.model_dump() for m in measurements]}, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(label: str) -> Optional[dict]:
+    path = BASELINE_DIR / f"{label}.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_regressions(measurements: List[Measurement], baseline: dict, tolerance: float) -> List[str]:
+    """Benchmarks whose p95 latency or peak memory grew, or whose throughput fell, by more than `tolerance`."""
+    previous = {m["name"]: m for m in baseline["measurements"]}
+    regressions = []
+    for m in measurements:
+        before = previous.get(m.name)
+        if before is None:
+            continue
+        checks = [
+            ("p95 latency", before["latency_ms"]["p95"], m.latency_ms["p95"], 1),
+            ("peak memory", before["peak_memory_kb"], m.peak_memory_kb, 1),
+            ("throughput", before["throughput_per_second"], m.throughput_per_second, -1),
+        ]
+        for metric, old, new, direction in checks:
+            if old and direction * (new - old) / old > tolerance:
+                regressions.append(f"{m.name}: {metric} {old:.1f} -> {new:.1f}")
+    return regressions
+
+
+def format_table(measurements: List[Measurement]) -> str:
+    lines = [f"{'benchmark':<44} {'ops/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KB':>10}"]
+    for m in measurements:
+        lines.append(
+            f"{m.name:<44} {m.throughput_per_second:>9.1f} {m.latency_ms['p50']:>9.1f} "
+            f"{m.latency_ms['p95']:>9.1f} {m.latency_ms['p99']:>9.1f} {m.peak_memory_kb:>10.0f}"
+        )
+        for stage, latency in m.stages_ms.items():
+            lines.append(f"  {stage:<42} {'':>9} {latency['p50']:>9.1f} {latency['p95']:>9.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import asyncio
+import argparse
+import logging
+
+# Usage (from backend/): python -m benchmarks.run --scale small --llm-latency-ms 800 --save-baseline main
+# Later runs with --compare main exit 1 when a benchmark regressed by more than --tolerance.
+# Needs a local mongod (--mongo-uri) or, with --mongo-uri memory, the mongomock-motor package.
+# Nothing leaves the machine: the LLM, search and calendar are deterministic fakes.
+
+SCALES = {
+    "small": {"users": 2, "clients_per_tier": 2, "notes_per_client": [10, 100]},
+    "medium": {"users": 5, "clients_per_tier": 3, "notes_per_client": [10, 100, 1000]},
+    "large": {"users": 10, "clients_per_tier": 3, "notes_per_client": [10, 100, 1000, 10000]},
+}
+SUITES = ["pipeline", "repositories", "api", "login"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the briefing pipeline, repositories and API against local fakes.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--notes-per-client", type=lambda s: [int(n) for n in s.split(",")],
+                        help="Comma-separated note counts, overriding the scale's tiers")
+    parser.add_argument("--suite", action="append", choices=SUITES, help="Suite to run (repeatable; default: all)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-token-latency-ms", type=float, default=0.0, help="Delay between streamed chunks")
+    parser.add_argument("--search-latency-ms", type=float, default=0.0)
+    parser.add_argument("--calendar-latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.1, help="Latency jitter as a fraction of each latency")
+    parser.add_argument("--bcrypt-rounds", type=int, help="bcrypt cost of the seeded users (default: BCRYPT_ROUNDS)")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017", help='A local mongod, or "memory"')
+    parser.add_argument("--database", default="briefing_benchmark", help="Dropped and reseeded on every run")
+    parser.add_argument("--save-baseline", metavar="LABEL", help="Store the results as benchmarks/baselines/LABEL.json")
+    parser.add_argument("--compare", metavar="LABEL", help="Compare with a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative change before a regression is reported")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's INFO logs (they slow the pipeline down)")
+    args = parser.parse_args()
+    if "bench" not in args.database:
+        parser.error("--database must contain 'bench'; it is dropped on every run")
+    return args
+
+
+def configure_environment(args):
+    # Set before the app is imported, so its settings point at the benchmark database and never at Atlas
+    os.environ["DATABASE_URL"] = "mongodb://localhost:27017" if args.mongo_uri == "memory" else args.mongo_uri
+    os.environ["MONGO_DATABASE"] = args.database
+    os.environ["MONGO_TLS"] = "false"
+    os.environ["RESEARCH_CACHE_BACKEND"] = "memory"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    if args.bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+
+
+async def connect(args):
+    from beanie import init_beanie
+    from app.db import database
+
+    if args.mongo_uri == "memory":
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("--mongo-uri memory needs the mongomock-motor package (pip install mongomock-motor).")
+        database.client = AsyncMongoMockClient()
+        database.db = database.client.get_database(args.database)
+    await database.client.drop_database(args.database)
+    await init_beanie(database=database.db, document_models=database.DOCUMENT_MODELS, skip_indexes=True)
+    await database.ensure_indexes()
+    return database
+
+
+async def main():
+    args = parse_args()
+    configure_environment(args)
+    logging.basicConfig(level=logging.INFO)
+    if not args.verbose:
+        logging.getLogger("app").setLevel(logging.WARNING)
+
+    from app.services.agent_service import AgentService
+    from app.services.research_cache import ResearchCache, InMemoryResearchBackend
+    from benchmarks.dataset import seed_dataset
+    from benchmarks.fakes import FakeCalendarService, FakeCompletionProvider, FakeSearchProvider, Latency
+    from benchmarks.harness import find_regressions, format_table, load_baseline, save_baseline
+    from app.core.security import BCRYPT_ROUNDS
+    from benchmarks.suites import api_suite, login_suite, pipeline_suite, repository_suite
+
+    def latency(ms: float, seed: int) -> Latency:
+        return Latency(ms, ms * args.jitter, seed)
+
+    database = await connect(args)
+    scale = dict(SCALES[args.scale])
+    if args.notes_per_client:
+        scale["notes_per_client"] = args.notes_per_client
+    settings = {
+        **scale,
+        "scale": args.scale,
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "llm_latency_ms": args.llm_latency_ms,
+        "llm_token_latency_ms": args.llm_token_latency_ms,
+        "search_latency_ms": args.search_latency_ms,
+        "calendar_latency_ms": args.calendar_latency_ms,
+        "bcrypt_rounds": BCRYPT_ROUNDS,
+        "mongo": "memory" if args.mongo_uri == "memory" else "mongod",
+    }
+
+    print(f"Seeding {scale['users']} users and {scale['clients_per_tier']} clients per tier of {scale['notes_per_client']} notes...")
+    dataset = await seed_dataset(scale["users"], scale["clients_per_tier"], scale["notes_per_client"])
+
+    agent_service = AgentService(
+        completion_provider=FakeCompletionProvider(latency(args.llm_latency_ms, 1), latency(args.llm_token_latency_ms, 2)),
+        search_provider=FakeSearchProvider(latency(args.search_latency_ms, 3)),
+        research_cache=ResearchCache(InMemoryResearchBackend(ttl_seconds=3600, max_entries=1000)),
+        calendar_service=FakeCalendarService(dataset.clients_by_user(), latency(args.calendar_latency_ms, 4)),
+    )
+
+    measurements = []
+    suites = args.suite or SUITES
+    try:
+        if "pipeline" in suites:
+            measurements += await pipeline_suite(dataset, agent_service, args.iterations, args.concurrency)
+        if "repositories" in suites:
+            measurements += await repository_suite(dataset, args.iterations, args.concurrency)
+        if "api" in suites:
+            measurements += await api_suite(dataset, args.iterations, args.concurrency)
+        if "login" in suites:
+            measurements += await login_suite(dataset, args.iterations, args.concurrency)
+    finally:
+        await database.client.drop_database(args.database)
+        database.client.close()
+
+    print(format_table(measurements))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"settings": settings, "measurements": [m.model_dump() for m in measurements]}, f, indent=2)
+    if args.save_baseline:
+        print(f"Saved baseline {save_baseline(args.save_baseline, measurements, settings)}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            print(f"No baseline named {args.compare}.", file=sys.stderr)
+            return 1
+        if baseline["settings"] != settings:
+            print("Warning: the baseline was recorded with different settings; the comparison may not be meaningful.")
+        regressions = find_regressions(measurements, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
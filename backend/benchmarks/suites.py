@@ -0,0 +1,132 @@
+import time
+import asyncio
+from datetime import datetime
+from typing import List
+
+import httpx
+
+from app.core.security import create_access_token
+from app.db.repository import UserRepository
+from app.db.client_repository import get_clients_for_user
+from app.db.briefing_repository import get_briefings_for_user, get_recently_briefed_client_names
+from app.db.meeting_note_repository import MeetingNoteRepository
+from app.models.briefing import ResearchBriefing
+from app.schemas.meeting_note import MeetingNoteContent
+from app.services.agent_service import AgentService
+from app.services.bulk_runner import percentile
+from benchmarks.dataset import BENCHMARK_PASSWORD, Dataset
+from benchmarks.harness import Measurement, measure
+
+
+async def pipeline_suite(dataset: Dataset, agent_service: AgentService, iterations: int, concurrency: int) -> List[Measurement]:
+    """
+    AgentService briefing generation per notes-per-client tier, with each stage's timings. The
+    client's briefings are deleted (untimed) first, so every call runs the LLM stages instead
+    of returning the stored briefing or reusing its output; chunk summaries stay cached.
+    """
+    meeting_date = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    results = []
+    for tier, pairs in dataset.tiers.items():
+        async def setup(i: int, pairs=pairs):
+            user_id, client_name = pairs[i % len(pairs)]
+            await ResearchBriefing.find({"user_id": user_id, "client_name": client_name}).delete()
+
+        async def call(i: int, pairs=pairs):
+            user_id, client_name = pairs[i % len(pairs)]
+            timings = {}
+            await agent_service._generate_briefing(user_id, client_name, meeting_date, timings=timings)
+            return timings
+
+        # Concurrent calls for one client would wait on each other's claim
+        results.append(await measure(
+            f"pipeline.generate_briefing[notes={tier}]", call, iterations, min(concurrency, len(pairs)), setup
+        ))
+    return results
+
+
+async def repository_suite(dataset: Dataset, iterations: int, concurrency: int) -> List[Measurement]:
+    notes = MeetingNoteRepository()
+    users = UserRepository()
+    user_id = dataset.user_ids[0]
+    email = dataset.email_of(user_id)
+
+    async def run(name, make_call):
+        async def call(i: int):
+            await make_call()
+        return await measure(name, call, iterations, concurrency)
+
+    results = []
+    for tier, pairs in dataset.tiers.items():
+        tier_user, client_name = pairs[0]
+        results.append(await run(
+            f"notes.get_for_client[notes={tier}]",
+            lambda: notes.get_for_client(tier_user, client_name, projection_model=MeetingNoteContent),
+        ))
+        results.append(await run(f"notes.get_page[notes={tier}]", lambda: notes.get_page(tier_user, client_name=client_name)))
+    results.append(await run("notes.get_client_names_with_notes", lambda: notes.get_client_names_with_notes(user_id)))
+    results.append(await run("clients.get_clients_for_user", lambda: get_clients_for_user(user_id)))
+    results.append(await run("briefings.get_briefings_for_user", lambda: get_briefings_for_user(user_id)))
+    results.append(await run("briefings.get_recently_briefed_client_names", lambda: get_recently_briefed_client_names(user_id)))
+    results.append(await run("users.get_user_by_email", lambda: users.get_user_by_email(email)))
+    return results
+
+
+async def api_suite(dataset: Dataset, iterations: int, concurrency: int) -> List[Measurement]:
+    """Authenticated GETs through the full FastAPI stack, in process (no sockets)."""
+    from main import app
+
+    user_id = dataset.user_ids[0]
+    token = create_access_token({"sub": dataset.email_of(user_id)})
+    _, client_name = next(pair for pairs in dataset.tiers.values() for pair in pairs if pair[0] == user_id)
+    endpoints = {
+        "api.GET /clients/": "/api/v1/clients/",
+        "api.GET /notes/": "/api/v1/notes/",
+        "api.GET /notes/?client_name": f"/api/v1/notes/?client_name={client_name}",
+        "api.GET /briefings/": "/api/v1/briefings/",
+    }
+    results = []
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as http:
+        for name, path in endpoints.items():
+            async def call(i: int, path=path):
+                response = await http.get(path)
+                response.raise_for_status()
+
+            results.append(await measure(name, call, iterations, concurrency))
+    return results
+
+
+async def login_suite(dataset: Dataset, iterations: int, concurrency: int) -> List[Measurement]:
+    """
+    POST /auth/login bursts through the FastAPI app. Alongside, a probe sleeps 5 ms at a time
+    and records how late it wakes up: the event loop lag every other request would see while
+    the logins are hashing. It is reported as the "event_loop_lag" stage.
+    """
+    from main import app
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+
+    async def probe():
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(max((time.perf_counter() - started) * 1000 - 5, 0.0))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as http:
+        async def call(i: int):
+            email = dataset.emails[i % len(dataset.emails)]
+            response = await http.post("/api/v1/auth/login", data={"username": email, "password": BENCHMARK_PASSWORD})
+            response.raise_for_status()
+
+        probe_task = asyncio.create_task(probe())
+        try:
+            result = await measure(f"auth.login[concurrency={concurrency}]", call, iterations, concurrency)
+        finally:
+            stop.set()
+            await probe_task
+    result.stages_ms["event_loop_lag"] = {"p50": percentile(lags, 50), "p95": percentile(lags, 95)}
+    return [result]
@@ -0,0 +1,72 @@
+import os
+import sys
+import asyncio
+import argparse
+from datetime import datetime
+from beanie import init_beanie
+from app.db.database import DOCUMENT_MODELS, db, close_mongo_connection
+from app.services.export import EXPORTS, EXPORT_BATCH_SIZE, checkpoint_of, iter_export, to_ndjson_line
+
+# Usage: python export_data.py briefings --output briefings.ndjson --checkpoint briefings.checkpoint
+# Re-running with the same --checkpoint appends only the documents exported since the last run.
+
+
+def read_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return f.read().strip() or None
+    return None
+
+
+def write_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(checkpoint)
+    os.replace(tmp_path, path)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Export briefings or meeting notes as newline-delimited JSON.")
+    parser.add_argument("collection", choices=sorted(EXPORTS))
+    parser.add_argument("--user-id")
+    parser.add_argument("--client")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only documents created at or after this ISO timestamp")
+    parser.add_argument("--output", help="File to append to (default: stdout)")
+    parser.add_argument("--checkpoint", help="File holding the last exported document's checkpoint, read on start and updated as batches are written")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    after = read_checkpoint(args.checkpoint)
+    out = open(args.output, "a") if args.output else sys.stdout
+    exported = 0
+    checkpoint = None
+    try:
+        # The models' collection names are needed; their indexes are the API's concern
+        await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+        async for document in iter_export(
+            args.collection,
+            user_id=args.user_id,
+            client_name=args.client,
+            since=args.since,
+            after=after,
+            batch_size=args.batch_size,
+        ):
+            out.write(to_ndjson_line(document))
+            exported += 1
+            checkpoint = checkpoint_of(args.collection, document)
+            if args.checkpoint and exported % args.batch_size == 0:
+                # Only checkpoint what has actually reached the output
+                out.flush()
+                write_checkpoint(args.checkpoint, checkpoint)
+    finally:
+        out.flush()
+        if args.checkpoint and checkpoint:
+            write_checkpoint(args.checkpoint, checkpoint)
+        if out is not sys.stdout:
+            out.close()
+        await close_mongo_connection()
+    print(f"Exported {exported} {args.collection}.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
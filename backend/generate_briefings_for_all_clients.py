@@ -1,30 +1,84 @@
+import sys
 import asyncio
-from app.db.client_repository import get_clients_for_user
-from app.services.agent_service import AgentService
+import argparse
+from datetime import datetime
 from app.db.database import connect_to_mongo, close_mongo_connection
-from app.models.user import User
 from app.db.repository import UserRepository
+from app.db.briefing_repository import utc_day
+from app.db.bulk_run_repository import create_run, get_run, count_items_by_status
+from app.models.bulk_run import BulkRun
+from app.services.bulk_runner import BULK_RUN_WORKERS, BULK_RUN_RATE_PER_MINUTE, BulkRunner, new_run_id
+from app.services.providers import close_providers
+
+# Usage: python generate_briefings_for_all_clients.py --workers 8 --rate 60
+# Prints the run id first; an interrupted run continues with --run-id <id> (add --retry-failed to retry its failures).
+
+
+def print_report(report, counts):
+    print(
+        f"Run {report.run_id}: {report.generated} generated, {report.skipped} skipped, {report.failed} failed "
+        f"in {report.elapsed_seconds:.1f} s ({report.briefings_per_minute:.1f} briefings/min)"
+    )
+    for stage, latency in report.latency_ms.items():
+        print(f"  {stage:<20} p50 {latency['p50']:>9.0f} ms   p95 {latency['p95']:>9.0f} ms")
+    print("Items by status: " + ", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+
 
 async def main():
-    await connect_to_mongo()
-    user_repo = UserRepository()
-    user = await user_repo.get_user_by_email("test@example.com")
-    if not user:
-        print("User not found.")
-        return
+    parser = argparse.ArgumentParser(description="Generate briefings for every client of every active user.")
+    parser.add_argument("--run-id", help="Resume this run instead of starting a new one")
+    parser.add_argument("--user-id", action="append", default=[], help="Only this user (repeatable)")
+    parser.add_argument("--email", action="append", default=[], help="Only the user with this email (repeatable)")
+    parser.add_argument("--client", action="append", default=[], help="Only this client (repeatable)")
+    parser.add_argument("--meeting-date", type=lambda s: datetime.fromisoformat(s.replace("Z", "+00:00")),
+                        help="Meeting date the briefings are keyed by (default: today, 00:00 UTC)")
+    parser.add_argument("--skip-recent-hours", type=int, default=0, help="Skip clients briefed within this many hours")
+    parser.add_argument("--workers", type=int, default=BULK_RUN_WORKERS)
+    parser.add_argument("--rate", type=float, default=BULK_RUN_RATE_PER_MINUTE, help="Max generations started per minute (0: unlimited)")
+    parser.add_argument("--retry-failed", action="store_true", help="When resuming, also retry the run's failed items")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would be generated")
+    args = parser.parse_args()
 
-    clients = await get_clients_for_user(str(user.id))
-    agent_service = AgentService()
+    await connect_to_mongo()
+    try:
+        runner = BulkRunner(workers=args.workers, rate_per_minute=args.rate)
+        if args.run_id:
+            run = await get_run(args.run_id)
+            if run is None:
+                print(f"Run {args.run_id} not found.", file=sys.stderr)
+                return 1
+        else:
+            user_ids = list(args.user_id)
+            if args.email:
+                user_ids += await UserRepository().get_active_user_ids(emails=args.email)
+                if not user_ids:
+                    print("No active user found with the given email(s).", file=sys.stderr)
+                    return 1
+            run = BulkRun(
+                run_id=new_run_id(),
+                meeting_date=args.meeting_date or utc_day(),
+                user_ids=user_ids,
+                client_names=args.client,
+                skip_recent_hours=args.skip_recent_hours,
+            )
 
-    for client in clients:
-        print(f"Generating briefing for client: {client.name}")
-        await agent_service.generate_briefing(
-            user_id=str(user.id),
-            client_name=client.name,
-            meeting_date="2025-08-21T10:00:00"
-        )
+        if args.dry_run:
+            pairs = await runner.eligible_clients(run)
+            print(f"Would generate {len(pairs)} briefing(s) for {len({user_id for user_id, _ in pairs})} user(s).")
+            for user_id, client_name in pairs:
+                print(f"  {user_id}  {client_name}")
+            return 0
 
-    await close_mongo_connection()
+        if not args.run_id:
+            await create_run(run)
+            print(f"Started run {run.run_id}")
+            await runner.plan(run)
+        report = await runner.execute(run, retry_failed=args.retry_failed)
+        print_report(report, await count_items_by_status(run.run_id))
+        return 0
+    finally:
+        await close_providers()
+        await close_mongo_connection()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
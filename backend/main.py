@@ -1,8 +1,17 @@
-from fastapi import FastAPI
+from typing import Optional
+from fastapi import FastAPI, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from app.api.v1.api import api_router
 from app.db.database import connect_to_mongo, close_mongo_connection
+from app.services.providers import close_providers
+from app.services.calendar_token_manager import calendar_token_manager
+from app.services.calendar_client import close_calendar_client
+from app.services.briefing_jobs import briefing_job_service
+from app.core.metrics import check_metrics_token, metrics_middleware, render_metrics
+from app.core.security import password_hasher
+from app.db.monitoring import query_stats_middleware
 
 app = FastAPI()
 
@@ -19,6 +28,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Mongo-Query-Count", "X-Mongo-Query-Time-Ms"],
 )
 
 # Add SessionMiddleware
@@ -30,14 +40,30 @@ app.add_middleware(
     same_site="lax"  # Allow cookies in cross-site navigation (OAuth redirects)
 )
 
+app.middleware("http")(query_stats_middleware)
+app.middleware("http")(metrics_middleware)
+
 
 @app.on_event("startup")
 async def startup_event():
     await connect_to_mongo()
+    calendar_token_manager.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await calendar_token_manager.stop()
+    await briefing_job_service.shutdown()
+    await close_providers()
+    await close_calendar_client()
     await close_mongo_connection()
+    password_hasher.shutdown()
+
+
+app.include_router(api_router, prefix="/api/v1")
 
 
-app.include_router(api_router, prefix="/api/v1")
\ No newline at end of file
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus metrics of the API and, in multiprocess mode, of the Celery workers too."""
+    check_metrics_token(authorization)
+    return await run_in_threadpool(render_metrics)
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+
+# Importing app.db.database creates the Motor client, which needs a database name; no server is contacted
+os.environ.setdefault("MONGO_DATABASE", "briefing_test")
+os.environ.setdefault("SECRET_KEY", "test-secret")
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+from app.schemas.meeting_note import MeetingNoteContent
+from app.services.agent_service import _briefing_fingerprint
+
+NOTES = [
+    MeetingNoteContent(
+        _id=f"note-{i}", meeting_date=datetime(2024, 5, i + 1), content="...",
+        createdAt=datetime(2024, 5, i + 1), updatedAt=datetime(2024, 5, i + 1),
+    )
+    for i in range(3)
+]
+INPUTS = {
+    "notes": NOTES,
+    "client_name": "Acme",
+    "next_meeting_date": "2024-06-01T10:00:00Z",
+    "model": "gpt-4o",
+    "focus_terms": ["Acme renewal"],
+    "prompt_budget": 6000,
+    "chunk_size": 8,
+}
+
+
+def test_fingerprint_ignores_note_order_and_client_name_padding():
+    reordered = {**INPUTS, "notes": list(reversed(NOTES)), "client_name": " Acme "}
+    assert _briefing_fingerprint(**reordered) == _briefing_fingerprint(**INPUTS)
+
+
+@pytest.mark.parametrize("change", [
+    {"next_meeting_date": "2024-06-02T10:00:00Z"},
+    {"model": "gpt-4o-mini"},
+    {"focus_terms": ["Acme pilot"]},
+    {"prompt_budget": 4000},
+    {"chunk_size": 16},
+    {"notes": NOTES[:2]},
+    {"notes": [NOTES[0].model_copy(update={"updatedAt": datetime(2024, 7, 1)}), *NOTES[1:]]},
+])
+def test_fingerprint_changes_with_every_prompt_input(change):
+    assert _briefing_fingerprint(**{**INPUTS, **change}) != _briefing_fingerprint(**INPUTS)
@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models.briefing_job import BriefingJob
+from app.services import briefing_jobs as module
+from app.services.briefing_jobs import BriefingJobService
+
+
+def make_job(status: str, idle_seconds: float) -> BriefingJob:
+    # model_construct, as validating a Document needs an initialized Beanie
+    return BriefingJob.model_construct(
+        user_id="user", status=status, backend="celery", updated_at=datetime.utcnow() - timedelta(seconds=idle_seconds)
+    )
+
+
+def poll(monkeypatch, job: BriefingJob) -> list:
+    updates = []
+
+    async def get_job(job_id):
+        return job
+
+    async def update_job(job, **fields):
+        updates.append(fields)
+        return job
+
+    monkeypatch.setattr(module, "get_job", get_job)
+    monkeypatch.setattr(module, "update_job", update_job)
+    asyncio.run(BriefingJobService().get("job"))
+    return updates
+
+
+def test_a_long_queued_job_is_not_marked_lost(monkeypatch):
+    assert poll(monkeypatch, make_job("queued", module.BRIEFING_JOB_STALE_SECONDS * 4)) == []
+
+
+def test_a_running_job_without_heartbeats_is_marked_lost(monkeypatch):
+    updates = poll(monkeypatch, make_job("running", module.BRIEFING_JOB_STALE_SECONDS + 1))
+    assert [fields["status"] for fields in updates] == ["failed"]
+
+
+def test_running_jobs_send_heartbeats_between_progress_events(monkeypatch):
+    beats = []
+
+    async def update_job(job, **fields):
+        beats.append(fields)
+        return job
+
+    monkeypatch.setattr(module, "update_job", update_job)
+    monkeypatch.setattr(module, "BRIEFING_JOB_HEARTBEAT_SECONDS", 0.01)
+
+    async def scenario():
+        heartbeat = asyncio.create_task(BriefingJobService._heartbeat(make_job("running", 0), asyncio.Lock()))
+        await asyncio.sleep(0.055)
+        heartbeat.cancel()
+
+    asyncio.run(scenario())
+    assert len(beats) >= 3 and all(fields == {} for fields in beats)
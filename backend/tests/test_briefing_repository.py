@@ -0,0 +1,177 @@
+import os
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+
+from app.db import briefing_repository
+
+from app.db.briefing_repository import claim_briefing, normalize_meeting_date, release_briefing_claim, utc_day
+from app.models.briefing import BriefingClaim
+
+# claim_briefing relies on a unique index; it is also tested against a real mongod when one is reachable
+MONGO_TEST_URL = os.getenv("MONGO_TEST_URL", "mongodb://localhost:27017")
+
+
+def test_normalize_meeting_date_truncates_to_the_minute():
+    assert normalize_meeting_date(datetime(2024, 5, 1, 9, 30, 45, 123456)) == datetime(2024, 5, 1, 9, 30)
+
+
+def test_normalize_meeting_date_converts_to_naive_utc():
+    aware = datetime(2024, 5, 1, 11, 30, tzinfo=timezone(timedelta(hours=2)))
+    assert normalize_meeting_date(aware) == datetime(2024, 5, 1, 9, 30)
+
+
+@pytest.mark.parametrize("value", ["2024-05-01T09:30:59Z", "2024-05-01T11:30:00+02:00", "2024-05-01T09:30:00.5"])
+def test_normalize_meeting_date_parses_iso_strings(value):
+    assert normalize_meeting_date(value) == datetime(2024, 5, 1, 9, 30)
+
+
+def test_utc_day_keys_runs_of_the_same_day_alike():
+    assert utc_day(datetime(2024, 5, 1, 0, 1)) == utc_day(datetime(2024, 5, 1, 23, 59)) == datetime(2024, 5, 1)
+
+
+_KEY = ("user_id", "client_name", "meeting_date")
+
+
+class FakeClaimQuery:
+    def __init__(self, store: dict, query: dict):
+        self.store = store
+        self.query = query
+
+    def _matches(self, claim: dict) -> bool:
+        for field, condition in self.query.items():
+            if isinstance(condition, dict):
+                if not claim[field] <= condition["$lte"]:
+                    return False
+            elif claim[field] != condition:
+                return False
+        return True
+
+    def _find(self):
+        return next((key for key, claim in self.store.items() if self._matches(claim)), None)
+
+    async def update(self, update: dict):
+        key = self._find()
+        if key is not None:
+            self.store[key].update(update["$set"])
+        return SimpleNamespace(modified_count=int(key is not None))
+
+    async def delete(self):
+        key = self._find()
+        if key is not None:
+            del self.store[key]
+
+
+def fake_claims(monkeypatch) -> dict:
+    """
+    Replaces BriefingClaim in the repository with an in-memory collection whose insert enforces
+    the unique (user_id, client_name, meeting_date) index. Returns the stored claims by key.
+    """
+    store = {}
+
+    class FakeBriefingClaim:
+        def __init__(self, **fields):
+            self.fields = fields
+
+        async def insert(self):
+            await asyncio.sleep(0)  # let concurrent claims interleave, as round trips would
+            key = tuple(self.fields[field] for field in _KEY)
+            if key in store:
+                raise DuplicateKeyError("E11000 duplicate key error")
+            store[key] = dict(self.fields)
+
+        @staticmethod
+        def find_one(query: dict):
+            return FakeClaimQuery(store, query)
+
+    monkeypatch.setattr(briefing_repository, "BriefingClaim", FakeBriefingClaim)
+    return store
+
+
+def test_only_one_concurrent_claim_wins_without_mongo(monkeypatch):
+    store = fake_claims(monkeypatch)
+
+    async def scenario():
+        meeting = datetime(2024, 5, 1, 9, 30)
+        owners = await asyncio.gather(*(claim_briefing("user", "Acme", meeting, ttl_seconds=60) for _ in range(5)))
+        winners = [owner for owner in owners if owner]
+        assert len(winners) == 1
+        assert await claim_briefing("user", "Acme", "2024-05-01T11:30:20+02:00", ttl_seconds=60) is None
+        # Another client or meeting is a separate claim
+        assert await claim_briefing("user", "Other", meeting, ttl_seconds=60) is not None
+
+        await release_briefing_claim("user", "Acme", meeting, winners[0])
+        assert ("user", "Acme", meeting) not in store
+        assert await claim_briefing("user", "Acme", meeting, ttl_seconds=60) is not None
+
+    asyncio.run(scenario())
+
+
+def test_an_expired_claim_is_taken_over_without_mongo(monkeypatch):
+    store = fake_claims(monkeypatch)
+
+    async def scenario():
+        meeting = datetime(2024, 5, 1, 9, 30)
+        first = await claim_briefing("user", "Acme", meeting, ttl_seconds=-1)
+        second = await claim_briefing("user", "Acme", meeting, ttl_seconds=60)
+        assert first and second and first != second
+        assert store[("user", "Acme", meeting)]["owner"] == second
+        # The first owner's release no longer removes the claim it lost
+        await release_briefing_claim("user", "Acme", meeting, first)
+        assert store[("user", "Acme", meeting)]["owner"] == second
+        assert await claim_briefing("user", "Acme", meeting, ttl_seconds=60) is None
+
+    asyncio.run(scenario())
+
+
+def run_with_mongo(scenario):
+    async def main():
+        client = AsyncIOMotorClient(MONGO_TEST_URL, serverSelectionTimeoutMS=500)
+        try:
+            await client.admin.command("ping")
+        except Exception:
+            client.close()
+            pytest.skip(f"No mongod at {MONGO_TEST_URL}")
+        database = client.get_database("briefing_repository_test")
+        try:
+            await client.drop_database(database.name)
+            await init_beanie(database=database, document_models=[BriefingClaim])
+            await scenario()
+        finally:
+            await client.drop_database(database.name)
+            client.close()
+
+    asyncio.run(main())
+
+
+def test_only_one_concurrent_claim_wins():
+    async def scenario():
+        meeting = datetime(2024, 5, 1, 9, 30)
+        owners = await asyncio.gather(*(claim_briefing("user", "Acme", meeting, ttl_seconds=60) for _ in range(5)))
+        winners = [owner for owner in owners if owner]
+        assert len(winners) == 1
+        # The same meeting named with seconds or a time zone is the same claim
+        assert await claim_briefing("user", "Acme", "2024-05-01T11:30:20+02:00", ttl_seconds=60) is None
+
+        await release_briefing_claim("user", "Acme", meeting, winners[0])
+        assert await claim_briefing("user", "Acme", meeting, ttl_seconds=60) is not None
+
+    run_with_mongo(scenario)
+
+
+def test_an_expired_claim_is_taken_over():
+    async def scenario():
+        meeting = datetime(2024, 5, 1, 9, 30)
+        first = await claim_briefing("user", "Acme", meeting, ttl_seconds=-1)
+        second = await claim_briefing("user", "Acme", meeting, ttl_seconds=60)
+        assert first and second and first != second
+        # The first owner's release no longer removes the claim it lost
+        await release_briefing_claim("user", "Acme", meeting, first)
+        assert await claim_briefing("user", "Acme", meeting, ttl_seconds=60) is None
+
+    run_with_mongo(scenario)
@@ -0,0 +1,52 @@
+import json
+import asyncio
+
+from app.services.briefing_stream import BriefingStreamParser
+
+RESPONSE = {
+    "summary": 'Discussed the "Q3" renewal — pricing\\terms and café \U0001F600 budget.',
+    "gaps": ["Who signs off?", "Timeline for the pilot"],
+    "suggested_talking_points": ["Confirm budget", "Agree on pilot scope"],
+}
+
+
+def parse(chunks) -> list:
+    events = []
+
+    async def emit(event: str, data: dict):
+        events.append((event, data))
+
+    async def scenario():
+        parser = BriefingStreamParser(emit)
+        for chunk in chunks:
+            await parser.feed(chunk)
+
+    asyncio.run(scenario())
+    return events
+
+
+def test_fields_are_emitted_while_streaming_one_character_at_a_time():
+    text = json.dumps(RESPONSE, ensure_ascii=True)
+    events = parse(text)
+
+    deltas = [data["text"] for event, data in events if event == "summary_delta"]
+    assert len(deltas) > 1
+    assert "".join(deltas) == RESPONSE["summary"]
+    assert ("gaps", {"gaps": RESPONSE["gaps"]}) in events
+    assert ("talking_points", {"suggested_talking_points": RESPONSE["suggested_talking_points"]}) in events
+    assert [event for event, _ in events if event != "summary_delta"] == ["gaps", "talking_points"]
+
+
+def test_lists_are_emitted_once_even_when_fed_in_one_chunk():
+    events = parse([json.dumps(RESPONSE)])
+    assert [event for event, _ in events] == ["summary_delta", "gaps", "talking_points"]
+
+
+def test_a_non_string_summary_is_left_to_the_final_parse():
+    events = parse(['{"summary": {"text": "x"}, ', '"gaps": []}'])
+    assert events == [("gaps", {"gaps": []})]
+
+
+def test_incomplete_lists_are_not_emitted():
+    events = parse(['{"summary": "", "gaps": ["one", "tw'])
+    assert [event for event, _ in events] == []
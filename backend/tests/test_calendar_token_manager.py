@@ -0,0 +1,86 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from google.auth.exceptions import RefreshError
+
+from app.db.repository import UserRepository
+from app.models.user import User
+from app.services import calendar_token_manager as module
+from app.services.calendar_token_manager import CalendarTokenManager, refresh_backoff
+
+
+def make_user() -> User:
+    # model_construct, as validating a Document needs an initialized Beanie
+    return User.model_construct(
+        email="user@example.com",
+        hashed_password="x",
+        calendar_refresh_failures=0,
+        google_calendar_credentials={
+            "token": "old", "refresh_token": "refresh", "token_uri": "https://oauth2.googleapis.com/token",
+            "client_id": "id", "client_secret": "secret", "scopes": [], "expiry": datetime.utcnow() - timedelta(minutes=1),
+        },
+    )
+
+
+def test_backoff_doubles_up_to_the_max(monkeypatch):
+    monkeypatch.setattr(module, "CALENDAR_TOKEN_REFRESH_BACKOFF_SECONDS", 300)
+    monkeypatch.setattr(module, "CALENDAR_TOKEN_REFRESH_MAX_BACKOFF_SECONDS", 3600)
+    assert [refresh_backoff(n).total_seconds() for n in (1, 2, 3, 4, 5)] == [300, 600, 1200, 2400, 3600]
+
+
+def refresh_failing_with(monkeypatch, error: Exception) -> list:
+    """Refreshes a user's token with Google failing with `error`; returns what was recorded."""
+    calls = []
+
+    async def record(self, user, retry_at):
+        calls.append(("backoff", retry_at))
+
+    async def clear(self, user):
+        calls.append(("clear", None))
+
+    def refresh(self, request):
+        raise error
+
+    monkeypatch.setattr(UserRepository, "record_calendar_refresh_failure", record)
+    monkeypatch.setattr(UserRepository, "clear_calendar_credentials", clear)
+    monkeypatch.setattr(module.Credentials, "refresh", refresh)
+
+    async def scenario():
+        with pytest.raises(RefreshError):
+            await CalendarTokenManager().refresh(make_user())
+
+    asyncio.run(scenario())
+    return calls
+
+
+def test_failed_refresh_is_backed_off(monkeypatch):
+    calls = refresh_failing_with(monkeypatch, RefreshError("temporarily_unavailable"))
+    assert [kind for kind, _ in calls] == ["backoff"]
+    assert calls[0][1] > datetime.utcnow()
+
+
+def test_revoked_refresh_token_disconnects_the_calendar(monkeypatch):
+    error = RefreshError("invalid_grant: Token has been expired or revoked.", {"error": "invalid_grant"})
+    assert refresh_failing_with(monkeypatch, error) == [("clear", None)]
+
+
+def test_expired_token_is_not_refreshed_while_backing_off(monkeypatch):
+    def refresh(self, request):
+        raise AssertionError("Google was asked for a token during the backoff")
+
+    monkeypatch.setattr(module.Credentials, "refresh", refresh)
+    user = make_user()
+    user.calendar_refresh_retry_at = datetime.utcnow() + timedelta(minutes=5)
+    assert asyncio.run(CalendarTokenManager().get_credentials(user)) is None
+
+
+def test_expired_token_is_refreshed_once_the_backoff_is_over(monkeypatch):
+    calls = refresh_failing_with(monkeypatch, RefreshError("temporarily_unavailable"))
+    assert [kind for kind, _ in calls] == ["backoff"]
+
+    user = make_user()
+    user.calendar_refresh_retry_at = datetime.utcnow() - timedelta(seconds=1)
+    with pytest.raises(RefreshError):
+        asyncio.run(CalendarTokenManager().get_credentials(user))
+    assert len(calls) == 2
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.services.export import checkpoint_of, parse_checkpoint
+
+
+def test_checkpoint_round_trips_uuid_ids():
+    note = {"_id": "6f1c2a9e-0c1d-4a57-9d3e-2b8f4c7a1e55", "createdAt": datetime(2024, 5, 1, 9, 30, 15, 120000)}
+    assert parse_checkpoint(checkpoint_of("notes", note)) == (note["createdAt"], note["_id"])
+
+
+def test_checkpoint_keeps_hex_string_ids_as_strings():
+    # A string _id that happens to look like an ObjectId must not be resumed as one
+    note = {"_id": "6650a0c2f1d2a3b4c5d6e7f8", "createdAt": datetime(2024, 5, 1, 9, 30)}
+    timestamp, doc_id = parse_checkpoint(checkpoint_of("notes", note))
+    assert isinstance(doc_id, str) and doc_id == note["_id"]
+
+
+def test_checkpoint_round_trips_object_ids():
+    briefing = {"_id": ObjectId(), "created_at": datetime(2024, 5, 1, 9, 30)}
+    timestamp, doc_id = parse_checkpoint(checkpoint_of("briefings", briefing))
+    assert timestamp == briefing["created_at"]
+    assert isinstance(doc_id, ObjectId) and doc_id == briefing["_id"]
+
+
+@pytest.mark.parametrize("value", ["6650a0c2f1d2a3b4c5d6e7f8", "2024-05-01T09:30:00|abc", ""])
+def test_malformed_checkpoints_are_rejected(value):
+    with pytest.raises(ValueError):
+        parse_checkpoint(value)
@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from main import app
+
+client = TestClient(app)
+
+
+def test_metrics_are_disabled_without_a_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 403
+
+
+def test_metrics_need_the_bearer_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert "http_request_duration_seconds" in response.text
+
+
+def test_cache_stats_need_the_metrics_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/api/v1/health/caches").status_code == 401
+
+    response = client.get("/api/v1/health/caches", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert "hit_rate" in response.json()["principal"]
+
+
+def test_worker_metrics_server_needs_the_bearer_token(monkeypatch):
+    import urllib.error
+    import urllib.request
+
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-token")
+    server = metrics.serve_metrics(0, addr="127.0.0.1")
+    url = f"http://127.0.0.1:{server.server_port}/metrics"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(url, timeout=5)
+        assert error.value.code == 401
+
+        request = urllib.request.Request(url, headers={"Authorization": "Bearer scrape-token"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert b"celery_task_duration_seconds" in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
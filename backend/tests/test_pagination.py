@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.api.v1.pagination import PageParams
+from app.db.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_object_ids():
+    sort_value, doc_id = datetime(2024, 5, 1, 9, 30, 15, 250000), ObjectId()
+    decoded_value, decoded_id = decode_cursor(encode_cursor(sort_value, doc_id))
+    assert decoded_value == sort_value
+    assert isinstance(decoded_id, ObjectId) and decoded_id == doc_id
+
+
+def test_cursor_round_trips_string_ids():
+    # uuid4 note ids stay strings, even when they happen to look like an ObjectId
+    for doc_id in (str(uuid.uuid4()), "6650a0c2f1d2a3b4c5d6e7f8"):
+        assert decode_cursor(encode_cursor(datetime(2024, 5, 1), doc_id)) == (datetime(2024, 5, 1), doc_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "eyJ2IjogMX0=", encode_cursor(datetime(2024, 5, 1), "x")[:-4]])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_page_params_answer_malformed_cursors_with_400():
+    with pytest.raises(HTTPException) as error:
+        PageParams(cursor="garbage", limit=10, order="desc", include_total=False)
+    assert error.value.status_code == 400
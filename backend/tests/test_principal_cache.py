@@ -0,0 +1,43 @@
+from app.core.principal_cache import PrincipalCache
+from app.models.user import User
+
+
+def make_user() -> User:
+    # model_construct, as validating a Document needs an initialized Beanie
+    return User.model_construct(email="user@example.com", hashed_password="x", is_active=True, google_calendar_credentials={"token": "t"})
+
+
+def test_cached_users_are_private_copies():
+    cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+    user = make_user()
+    cache.set(user.email, user)
+    user.is_active = False
+
+    first = cache.get(user.email)
+    first.google_calendar_credentials["token"] = "changed"
+    second = cache.get(user.email)
+
+    assert first is not second
+    assert second.is_active is True
+    assert second.google_calendar_credentials == {"token": "t"}
+
+
+def test_invalidate_and_expiry_miss():
+    cache = PrincipalCache(ttl_seconds=60, max_entries=10)
+    cache.set("user@example.com", make_user())
+    cache.invalidate("user@example.com")
+    assert cache.get("user@example.com") is None
+
+    expired = PrincipalCache(ttl_seconds=0, max_entries=10)
+    expired.set("user@example.com", make_user())
+    assert expired.get("user@example.com") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    for email in ("a@example.com", "b@example.com"):
+        cache.set(email, make_user())
+    cache.get("a@example.com")
+    cache.set("c@example.com", make_user())
+    assert cache.get("b@example.com") is None
+    assert cache.get("a@example.com") is not None
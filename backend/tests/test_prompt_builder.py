@@ -0,0 +1,77 @@
+import random
+from datetime import datetime, timedelta
+
+from app.services.prompt_builder import (
+    SYSTEM_MESSAGE,
+    TRUNCATION_MARKER,
+    BriefingPromptBuilder,
+    PromptSection,
+    TokenCounter,
+)
+
+
+class CharCounter(TokenCounter):
+    """The ~4 characters per token estimate, so the tests do not depend on a tiktoken encoding."""
+
+    def __init__(self):
+        self.encoding = None
+
+
+def make_sections(count: int, tokens: int = 100) -> list:
+    start = datetime(2024, 1, 1)
+    return [
+        PromptSection(identifier=f"note-{i}", text=f"{i:04d}" * tokens, timestamp=start + timedelta(days=i))
+        for i in range(count)
+    ]
+
+
+def make_builder(extra_tokens: int) -> BriefingPromptBuilder:
+    """A builder whose budget leaves `extra_tokens` for sections once the prompt's own text is counted."""
+    counter = CharCounter()
+    probe = BriefingPromptBuilder("gpt-4o", budget=1, counter=counter)
+    overhead = counter.count(SYSTEM_MESSAGE) + counter.count(probe.render("Acme", "tomorrow", []))
+    return BriefingPromptBuilder("gpt-4o", budget=overhead + extra_tokens, counter=counter)
+
+
+def test_everything_fits_and_is_rendered_oldest_first():
+    sections = make_sections(3)
+    built = make_builder(1000).build("Acme", "tomorrow", list(reversed(sections)))
+    assert built.included == ["note-0", "note-1", "note-2"]
+    assert built.truncated == [] and built.dropped == []
+    prompt = built.messages[1]["content"]
+    assert prompt.index(sections[0].text) < prompt.index(sections[1].text) < prompt.index(sections[2].text)
+    assert built.token_count <= built.budget
+
+
+def test_newest_sections_are_kept_then_one_truncated_then_the_rest_dropped():
+    # Room for two whole sections (100 tokens plus a newline each) and 80 tokens of a third
+    built = make_builder(2 * 101 + 80).build("Acme", "tomorrow", make_sections(5))
+    assert built.included == ["note-2", "note-3", "note-4"]
+    assert built.truncated == ["note-2"]
+    assert built.dropped == ["note-1", "note-0"]
+    assert TRUNCATION_MARKER in built.messages[1]["content"]
+    assert built.token_count <= built.budget
+
+
+def test_a_section_is_not_truncated_below_the_minimum():
+    built = make_builder(101 + 30).build("Acme", "tomorrow", make_sections(3))
+    assert built.included == ["note-2"]
+    assert built.truncated == []
+    assert built.dropped == ["note-1", "note-0"]
+
+
+def test_focus_terms_promote_relevant_sections():
+    sections = make_sections(5)
+    sections[3] = sections[3].model_copy(update={"text": "renewal pricing " + sections[3].text})
+    built = make_builder(110).build("Acme", "tomorrow", sections, focus_terms=["Renewal pricing call"])
+    assert built.included == ["note-3"]
+
+
+def test_the_same_input_always_builds_the_same_prompt():
+    sections = make_sections(8)
+    builder = make_builder(3 * 101 + 70)
+    expected = builder.build("Acme", "tomorrow", sections, focus_terms=["0005"])
+    for seed in range(5):
+        shuffled = list(sections)
+        random.Random(seed).shuffle(shuffled)
+        assert builder.build("Acme", "tomorrow", shuffled, focus_terms=["0005"]) == expected
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.services.research_cache import InMemoryResearchBackend, ResearchCache
+
+
+def make_cache() -> ResearchCache:
+    return ResearchCache(InMemoryResearchBackend(ttl_seconds=60, max_entries=10))
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def scenario():
+        cache = make_cache()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"results": [calls]}
+
+        results = await asyncio.gather(*(cache.get_or_fetch("Acme", "news", fetch) for _ in range(5)))
+        assert calls == 1
+        assert results == [{"results": [1]}] * 5
+        assert await cache.get_or_fetch("Acme", "news", fetch) == {"results": [1]}
+        assert cache.hits == 1
+
+    asyncio.run(scenario())
+
+
+def test_fetch_error_reaches_waiters_and_is_not_cached():
+    async def scenario():
+        cache = make_cache()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("search down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch("Acme", "news", failing) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def working():
+            return {"results": []}
+
+        assert await cache.get_or_fetch("Acme", "news", working) == {"results": []}
+
+    asyncio.run(scenario())
+
+
+def test_waiter_fetches_itself_when_owner_is_cancelled():
+    async def scenario():
+        cache = make_cache()
+        started = asyncio.Event()
+
+        async def slow_fetch():
+            started.set()
+            await asyncio.sleep(10)
+            return {"results": ["owner"]}
+
+        async def fast_fetch():
+            return {"results": ["waiter"]}
+
+        owner = asyncio.create_task(cache.get_or_fetch("Acme", "news", slow_fetch))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_fetch("Acme", "news", fast_fetch))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert await asyncio.wait_for(waiter, 1) == {"results": ["waiter"]}
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_the_fetch():
+    async def scenario():
+        cache = make_cache()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return {"results": ["done"]}
+
+        owner = asyncio.create_task(cache.get_or_fetch("Acme", "news", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_fetch("Acme", "news", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        assert await owner == {"results": ["done"]}
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
@@ -39,7 +39,15 @@ export default function BriefingsPage() {
 
   const handleUpdateBriefings = async () => {
     try {
-      await api.post('/briefings/update', {});
+      // Generation runs as a background job; poll it until it is done, then refresh the list
+      let job = await api.post('/briefings/update', {});
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 2000));
+        job = await api.get(`/briefings/jobs/${job._id}`);
+      }
+      if (job.status === 'failed') {
+        setError('Failed to update briefings.');
+      }
       fetchBriefings(); // Refresh the list
     } catch (err) {
       setError('Failed to update briefings.');
@@ -50,8 +58,7 @@ export default function BriefingsPage() {
   const fetchBriefings = async () => {
     try {
       setLoading(true);
-      const response = await api.get('/briefings');
-      const data = response || [];
+      const data = await api.getAll<Briefing>('/briefings/');
       setBriefings(data);
       setFilteredBriefings(data);
     } catch (err) {
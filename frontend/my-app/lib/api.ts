@@ -33,6 +33,9 @@ const refreshToken = async () => {
   }
 };
 
+// Page size the list endpoints are asked for (their maximum)
+const PAGE_SIZE = 200;
+
 const api = {
   get: async (path: string) => {
     console.log(`GET request to: ${path}`);
@@ -55,6 +58,30 @@ const api = {
     }
     return response.json();
   },
+  // The list endpoints return one page at a time; follows X-Next-Cursor until the last page
+  getAll: async <T = unknown>(path: string): Promise<T[]> => {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+      const separator = path.includes('?') ? '&' : '?';
+      const pagePath = `${path}${separator}limit=${PAGE_SIZE}${cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''}`;
+      let response = await fetch(`${API_URL}/api/v1${pagePath}`, {
+        headers: getAuthHeaders(),
+      });
+      if (response.status === 401) {
+        await refreshToken();
+        response = await fetch(`${API_URL}/api/v1${pagePath}`, {
+          headers: getAuthHeaders(),
+        });
+      }
+      if (!response.ok) {
+        throw new Error(`Failed to fetch ${path}`);
+      }
+      items.push(...(await response.json()));
+      cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+  },
   post: async (path: string, data: unknown) => {
     let response = await fetch(`${API_URL}/api/v1${path}`, {
       method: 'POST',
@@ -143,13 +170,7 @@ export interface Note {
 }
 
 export async function getNotes(): Promise<Note[]> {
-  const response = await fetch(`${API_URL}/api/v1/notes`, {
-    headers: getAuthHeaders(),
-  });
-  if (!response.ok) {
-    throw new Error("Failed to fetch notes");
-  }
-  return response.json();
+  return api.getAll<Note>("/notes/");
 }
 
 export async function getNoteById(id: number): Promise<Note> {
@@ -224,14 +245,8 @@ export interface Client {
 }
 
 export async function getClients(): Promise<Client[]> {
-  const response = await fetch(`${API_URL}/api/v1/clients/`, {
-    headers: getAuthHeaders(),
-  });
-  if (!response.ok) {
-    throw new Error("Failed to fetch clients");
-  }
-  const data = await response.json();
-  return data.map((client: Record<string, unknown>) => ({
+  const data = await api.getAll<Client & { _id: string }>("/clients/");
+  return data.map((client) => ({
     ...client,
     id: client._id,
   }));